@@ -0,0 +1,206 @@
+import concurrent.futures
+import glob
+import json
+import logging
+import os
+import shutil
+import time
+from argparse import Namespace
+from config import TMP_DIR
+from modules import Chronometer, batch_execution_args, remove_workspace
+from process_input import create_run_workspace, prepare_transcription_audio, process_input, resolve_cleaning_mode
+from generate_output import generate_output, open_srt_writer
+
+BATCH_JOB_DIR_TEMPLATE = "batch_job_{}"
+MANIFEST_OVERRIDE_KEYS = ("output", "language", "segments", "checkpoints")
+
+def collect_input_paths(inputs):
+    """
+    Return the files matched by a directory or a glob pattern, sorted by path.
+
+    :param inputs: str, a directory (all files directly inside it) or a glob pattern.
+    :return: list of file paths.
+    """
+    pattern = os.path.join(inputs, "*") if os.path.isdir(inputs) else inputs
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+def load_manifest(manifest_path):
+    """
+    Read a JSONL manifest with one JSON object per line. Blank lines are ignored.
+
+    :return: list of dict entries, each with at least an "input" key.
+    """
+    entries = []
+    with open(manifest_path, 'r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Manifest line {line_number} is not valid JSON. Original error: {e}") from e
+
+            if not isinstance(entry, dict) or not entry.get("input"):
+                raise ValueError(f"Manifest line {line_number} must be a JSON object with an \"input\" path.")
+            entries.append(entry)
+    return entries
+
+def default_output_path(input_path, output_dir=None):
+    """Return <output_dir or the input's directory>/<input name>.srt."""
+    output_dir = output_dir or os.path.dirname(input_path) or "."
+    return os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + ".srt")
+
+def build_job_args(batch_args, entry):
+    """
+    Build the per-input arguments read by process_input and generate_output.
+
+    Manifest entries override the batch-wide language, segments and checkpoints. Inputs without an explicit output
+    are written next to the input, or into --output-dir, as <input name>.srt.
+    """
+    input_path = entry["input"]
+    output_path = entry.get("output") or default_output_path(input_path, batch_args.output_dir)
+
+    job_args = Namespace(
+        input=input_path,
+        output=output_path,
+        checkpoints=batch_args.checkpoints,
+        auto_checkpoints=batch_args.auto_checkpoints,
+        segments=batch_args.segments,
+        skip_silence=batch_args.skip_silence,
+        long_form=batch_args.long_form,
+        language=batch_args.language,
+        model=batch_args.model,
+        device=batch_args.device,
+        cleaning_mode=batch_args.cleaning_mode,
+        save_cleaning_mode=False,
+        no_transcription_cache=batch_args.no_transcription_cache,
+        workers=batch_args.workers,
+        merge=False,
+    )
+    for key in MANIFEST_OVERRIDE_KEYS:
+        if entry.get(key) is not None:
+            setattr(job_args, key, entry[key])
+
+    # Explicit segments or checkpoints in the manifest replace a batch-wide automatic segmentation.
+    if entry.get("segments") or entry.get("checkpoints"):
+        job_args.auto_checkpoints = None
+    return job_args
+
+def build_batch_jobs(batch_args):
+    if batch_args.output_dir:
+        os.makedirs(batch_args.output_dir, exist_ok=True)
+
+    if batch_args.manifest:
+        entries = load_manifest(batch_args.manifest)
+    else:
+        entries = [{"input": input_path} for input_path in collect_input_paths(batch_args.inputs)]
+    return [build_job_args(batch_args, entry) for entry in entries]
+
+def run_batch_job(job_args, ingestion, work_dir):
+    """
+    Transcribe one input whose audio preparation was started ahead of time and write its SRT file.
+
+    Failures are logged and reported in the returned status instead of stopping the batch.
+
+    :param ingestion: concurrent.futures.Future resolving to the prepared (path, audio) pair.
+    :param work_dir: str, the input's own directory, holding its prepared audio and segment results.
+    :return: dict, the status of the input for the batch summary.
+    """
+    start_time = time.perf_counter()
+    status = {"input": job_args.input, "output": job_args.output, "status": "succeeded", "error": None}
+    srt_writer = None
+
+    try:
+        prepared_audio = ingestion.result()
+        srt_writer = open_srt_writer(job_args)
+        process_input(job_args, prepared_audio=prepared_audio, work_dir=work_dir, on_segment_result=srt_writer.add_segment_result)
+        generate_output(job_args, srt_writer=srt_writer)
+    except (Exception, SystemExit) as e:
+        logging.error(f"Could not generate subtitles for {job_args.input}: {str(e)}", exc_info=True)
+        status["status"] = "failed"
+        status["error"] = str(e) or type(e).__name__
+    finally:
+        if srt_writer is not None:
+            srt_writer.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    status["seconds"] = round(time.perf_counter() - start_time, 3)
+    return status
+
+def run_batch(jobs, cleaning_mode=None, work_dir=None):
+    """
+    Process the inputs in order in this process, so the speech recognition model is loaded only once.
+
+    The audio of the next input is decoded, extracted and cleaned on a background thread while the current one is
+    being transcribed.
+
+    :param work_dir: str, the batch's workspace; every input gets its own directory inside it. Defaults to TMP_DIR.
+    :return: list of per-input status dicts, in input order.
+    """
+    resolved_cleaning_mode = resolve_cleaning_mode(cleaning_mode)
+    work_dir = work_dir or TMP_DIR
+    os.makedirs(work_dir, exist_ok=True)
+    results = []
+
+    def start_ingestion(executor, job_index):
+        job_work_dir = os.path.join(work_dir, BATCH_JOB_DIR_TEMPLATE.format(job_index))
+        future = executor.submit(
+            prepare_transcription_audio,
+            jobs[job_index].input,
+            resolved_cleaning_mode,
+            already_resolved=True,
+            work_dir=job_work_dir,
+        )
+        return future, job_work_dir
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="batch-ingestion") as executor:
+        next_ingestion = start_ingestion(executor, 0) if jobs else None
+
+        for job_index, job_args in enumerate(jobs):
+            ingestion, job_work_dir = next_ingestion
+            next_ingestion = start_ingestion(executor, job_index + 1) if job_index + 1 < len(jobs) else None
+
+            logging.info(f"Batch input {job_index + 1}/{len(jobs)}: {job_args.input}")
+            results.append(run_batch_job(job_args, ingestion, job_work_dir))
+
+    return results
+
+def write_batch_summary(results, summary_path):
+    succeeded = sum(1 for result in results if result["status"] == "succeeded")
+    summary = {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "files": results,
+    }
+
+    with open(summary_path, 'w', encoding='utf-8') as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+
+    logging.info(f"Batch finished: {succeeded} of {len(results)} input(s) succeeded. Summary written to {summary_path}")
+    for result in results:
+        if result["status"] != "succeeded":
+            logging.info(f"  failed: {result['input']} ({result['error']})")
+    return summary
+
+if __name__ == "__main__":
+    chrono = Chronometer()
+    chrono.start()
+    logging.basicConfig(level=logging.INFO)
+    batch_work_dir = None
+
+    try:
+        batch_args = batch_execution_args()
+        batch_jobs = build_batch_jobs(batch_args)
+        logging.info(f"Found {len(batch_jobs)} input(s) to process.")
+        batch_work_dir = create_run_workspace(batch_args.workspace_root)
+        write_batch_summary(run_batch(batch_jobs, batch_args.cleaning_mode, batch_work_dir), batch_args.summary)
+    except Exception as e:
+        logging.error(f"An error occurred while running the batch: {str(e)}", exc_info=True)
+    finally:
+        remove_workspace(batch_work_dir)
+
+        logging.info("Clean exit.")
+        chrono.stop()
+        chrono.print_duration()
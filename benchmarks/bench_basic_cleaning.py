@@ -0,0 +1,76 @@
+"""
+Compare the Pydub basic cleaning chain with the vectorized NumPy/SciPy backend on synthetic working audio.
+
+The synthetic audio alternates loud and quiet tone bursts over low-level noise, written as a 16 kHz mono working
+WAV in a temporary directory. The Pydub path requires the real pydub package; it is skipped with --skip-pydub,
+which is worth doing for long durations because its filters and compressor run sample by sample in Python.
+
+Usage: python benchmarks/bench_basic_cleaning.py [--seconds 30 300] [--repeat 3] [--skip-pydub]
+"""
+import argparse
+import logging
+import os
+import tempfile
+
+from bench_utils import time_call
+
+import numpy as np
+
+import process_input
+
+STRATEGY_SETTINGS = {
+    "high_pass_cutoff_hz": 120,
+    "low_pass_cutoff_hz": 7600,
+    "apply_dynamic_range_compression": True,
+    "apply_normalization": True,
+}
+
+
+def generate_synthetic_working_audio(output_path, seconds):
+    sample_rate = process_input.TRANSCRIPTION_SAMPLE_RATE
+    time_axis = np.arange(int(sample_rate * seconds)) / sample_rate
+    envelope = np.where((time_axis % 0.25) < 0.12, 0.7, 0.05)
+    noise = 0.02 * np.random.default_rng(0).standard_normal(time_axis.shape)
+    signal = envelope * np.sin(2 * np.pi * 440 * time_axis) + noise
+    samples = np.clip(np.round(signal * 32767), -32768, 32767).astype(np.int16)
+    process_input.write_working_audio_samples(samples, output_path, sample_rate)
+
+
+def run_pydub_cleaning(working_audio, output_path):
+    process_input.apply_basic_audio_cleaning(
+        working_audio.to_audio_segment(), output_path, strategy_settings=STRATEGY_SETTINGS
+    )
+
+
+def run_vectorized_cleaning(working_audio, output_path):
+    process_input.apply_vectorized_basic_audio_cleaning(working_audio, output_path, STRATEGY_SETTINGS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, nargs="+", default=[30, 300], help="Durations of the synthetic audio.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per backend.")
+    parser.add_argument("--skip-pydub", action="store_true", help="Only time the vectorized backend.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    backends = [("numpy/scipy", run_vectorized_cleaning)]
+    if not args.skip_pydub:
+        backends.insert(0, ("pydub", run_pydub_cleaning))
+
+    print("Basic cleaning (median wall time, realtime factor)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for seconds in args.seconds:
+            working_audio_path = os.path.join(tmp_dir, f"synthetic_{seconds}s.wav")
+            generate_synthetic_working_audio(working_audio_path, seconds)
+            working_audio = process_input.open_working_audio(working_audio_path)
+            print(f"  {seconds} s of audio")
+
+            for label, backend in backends:
+                output_path = os.path.join(tmp_dir, "cleaned.wav")
+                duration = time_call(lambda: backend(working_audio, output_path), repeat=args.repeat)
+                print(f"    {label.ljust(12)}  {duration * 1000:10.1f} ms  {seconds / duration:8.1f}x realtime")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark the startup cost of main.py for --version and a rejected argument, with a budget for CI.
+
+Each case runs main.py in a fresh interpreter under `python -X importtime`, sums the self time of every module it
+imports and checks that none of the heavy dependencies (torch, Whisper, pydub, libmagic, MoviePy, SpeechBrain) was
+loaded. The script exits with status 1 when a case imports one of them or exceeds the import-time budget.
+
+Usage: python benchmarks/bench_import_time.py [--repeat 5] [--budget-ms 150]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_utils import REPO_ROOT
+
+MAIN_SCRIPT = os.path.join(REPO_ROOT, "main.py")
+HEAVY_MODULES = ("torch", "whisper", "whisper_timestamped", "pydub", "magic", "moviepy", "speechbrain")
+STARTUP_CASES = [
+    ("--version", ["--version"]),
+    ("unknown argument", ["--no-such-option"]),
+]
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_import_times(stderr):
+    """
+    Parse `-X importtime` output.
+
+    :return: dict mapping each imported module name to its self import time in microseconds.
+    """
+    import_times = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            import_times[match.group(4)] = int(match.group(1))
+    return import_times
+
+
+def run_startup_case(arguments):
+    start_time = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN_SCRIPT, *arguments],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    return time.perf_counter() - start_time, parse_import_times(completed.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs per case; the median is reported.")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Maximum total import time of a case, in milliseconds.")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest imports to list per case.")
+    args = parser.parse_args()
+
+    failures = []
+    for label, arguments in STARTUP_CASES:
+        runs = [run_startup_case(arguments) for _ in range(args.repeat)]
+        wall_ms = statistics.median(wall_seconds for wall_seconds, _import_times in runs) * 1000
+        import_ms = statistics.median(sum(import_times.values()) for _wall_seconds, import_times in runs) / 1000
+        import_times = runs[-1][1]
+
+        print(f"main.py {' '.join(arguments)} ({label})")
+        print(f"  wall time     {wall_ms:10.3f} ms")
+        print(f"  import time   {import_ms:10.3f} ms  (budget {args.budget_ms:.0f} ms, {len(import_times)} modules)")
+        for name, self_us in sorted(import_times.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+            print(f"    {name.ljust(32)}  {self_us / 1000:8.3f} ms")
+
+        heavy_imports = sorted(name for name in import_times if name.split(".")[0] in HEAVY_MODULES)
+        if heavy_imports:
+            failures.append(f"{label}: imported {', '.join(heavy_imports)}")
+        if import_ms > args.budget_ms:
+            failures.append(f"{label}: import time {import_ms:.1f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print(f"FAILED {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
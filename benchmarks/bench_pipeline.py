@@ -0,0 +1,278 @@
+"""
+Offline benchmark suite for the whole pipeline, on synthetic audio and subtitles, with baselines to compare commits.
+
+Packages that are not installed (whisper_timestamped, pydub, magic, moviepy) are replaced by the same stand-ins the
+test suite uses, so the suite runs without network access, FFmpeg or a speech recognition model. Whisper is always
+stubbed unless --real-model is given; the stub returns one subtitle per five seconds of audio.
+
+Timed operations, per synthetic audio duration or SRT size:
+  parse_segments and generate_segments_from_checkpoints on 30 s patterns,
+  create_srt_content_from_results,
+  parse_srt and merge_srt_content with 10% of the cues regenerated,
+  the vectorized basic cleaning backend, plus the Pydub and SpeechBrain backends when those packages are installed,
+  and process_input with --auto-checkpoints streaming into the SRT writer (audio preparation excluded).
+
+Save a baseline on one commit and compare another commit against it:
+  python benchmarks/bench_pipeline.py --save-baseline pipeline-baseline.json
+  python benchmarks/bench_pipeline.py --baseline pipeline-baseline.json --fail-on-regression
+
+Usage: python benchmarks/bench_pipeline.py [--audio-minutes 1 60 360] [--srt-cues 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import wave
+from types import SimpleNamespace
+
+from bench_utils import REPO_ROOT, compare_with_baseline, print_results, time_call, write_baseline
+
+import numpy as np
+
+TESTS_DIR = os.path.join(REPO_ROOT, "tests")
+SAMPLE_RATE = 16000
+SEGMENT_PATTERN = "30s"
+STUB_SUBTITLE_SECONDS = 5
+CUE_MS = 1500
+
+
+def install_media_stubs(real_model=False):
+    """Import the real media packages where they are installed and fill in the rest with the test stubs."""
+    optional_packages = ["magic", "moviepy", "pydub", "pydub.exceptions"]
+    if real_model:
+        optional_packages.append("whisper_timestamped")
+    available = []
+    for package in optional_packages:
+        try:
+            importlib.import_module(package)
+            available.append(package)
+        except ImportError:
+            pass
+
+    if TESTS_DIR not in sys.path:
+        sys.path.insert(0, TESTS_DIR)
+    from media_stubs import install_stub_modules
+
+    install_stub_modules()
+    return available
+
+
+def stub_transcribe(model, audio, language=None, **_decode_options):
+    duration_seconds = len(audio) / SAMPLE_RATE
+    segments = []
+    start = 0.0
+    while start < duration_seconds:
+        end = min(start + STUB_SUBTITLE_SECONDS, duration_seconds)
+        segments.append({"start": round(start, 3), "end": round(end, 3), "text": f"Line at {start:.0f}s"})
+        start = end
+    return {"segments": segments}
+
+
+def write_synthetic_working_audio(output_path, minutes, chunk_seconds=60):
+    """
+    Write a 16 kHz mono working WAV of the given length, one minute at a time.
+
+    The signal alternates three seconds of tone bursts with a second of low noise, so voice activity detection
+    finds speech and pauses to place segment boundaries in.
+    """
+    rng = np.random.default_rng(0)
+    chunk_samples = chunk_seconds * SAMPLE_RATE
+    time_axis = np.arange(chunk_samples) / SAMPLE_RATE
+    speech = (time_axis % 4) < 3
+    tone = np.sin(2 * np.pi * 220 * time_axis) * (0.3 + 0.2 * np.sin(2 * np.pi * 3 * time_axis))
+    with wave.open(output_path, "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(SAMPLE_RATE)
+        for _ in range(minutes * 60 // chunk_seconds):
+            signal = np.where(speech, tone, 0.0) + 0.003 * rng.standard_normal(chunk_samples)
+            output_file.writeframesraw(np.clip(np.round(signal * 32767), -32768, 32767).astype("<i2").tobytes())
+    return output_path
+
+
+def build_segment_results(total_ms, segment_ms=30000):
+    segment_results = []
+    for start_ms in range(0, total_ms, segment_ms):
+        end_ms = min(start_ms + segment_ms, total_ms)
+        audio = range((end_ms - start_ms) * SAMPLE_RATE // 1000)
+        segment_results.append({"start_ms": start_ms, "end_ms": end_ms, "result": stub_transcribe(None, audio)})
+    return segment_results
+
+
+def build_synthetic_srt(cue_count, text="Existing line"):
+    import generate_output
+
+    return "".join(
+        generate_output.build_subtitle_entry(index, (index - 1) * CUE_MS, index * CUE_MS, f"{text} {index}")
+        for index in range(1, cue_count + 1)
+    )
+
+
+def build_regenerated_srt(cue_count, replaced_percent=10):
+    import generate_output
+
+    # Evenly spread runs of 30 cues of 1.2 s, overlapping the existing 1.5 s cues.
+    run_cues = 30
+    runs = max(1, cue_count * replaced_percent // 100 // run_cues)
+    block_ms = cue_count * CUE_MS // runs
+    entries = []
+    for run in range(runs):
+        for cue in range(run_cues):
+            start_ms = run * block_ms + cue * 1200
+            entries.append(generate_output.build_subtitle_entry(len(entries) + 1, start_ms, start_ms + 1200, f"New line {cue}"))
+    return "".join(entries)
+
+
+def build_run_args(input_path, output_path):
+    return SimpleNamespace(
+        input=input_path,
+        output=output_path,
+        merge=False,
+        checkpoints=None,
+        segments=None,
+        auto_checkpoints="5m",
+        skip_silence=False,
+        language="en",
+        model=None,
+        device="cpu",
+        cleaning_mode="off",
+        save_cleaning_mode=False,
+        segment_results_dir=None,
+        no_transcription_cache=True,
+        workers=1,
+        resume=False,
+    )
+
+
+def run_orchestration(args, audio_path, work_dir):
+    import generate_output
+    import process_input
+    from working_audio import WorkingAudio
+
+    srt_writer = generate_output.open_srt_writer(args)
+    try:
+        process_input.process_input(
+            args,
+            prepared_audio=(audio_path, WorkingAudio(audio_path)),
+            work_dir=work_dir,
+            on_segment_result=srt_writer.add_segment_result,
+        )
+        generate_output.generate_output(args, srt_writer=srt_writer)
+    finally:
+        srt_writer.close()
+
+
+def benchmark_audio(minutes, repeat, available_packages, tmp_dir):
+    import generate_output
+    import process_input
+    from working_audio import WorkingAudio
+
+    audio_path = write_synthetic_working_audio(os.path.join(tmp_dir, f"synthetic_{minutes}min.wav"), minutes)
+    total_ms = minutes * 60 * 1000
+    label = f"{minutes}min"
+    results = {}
+
+    results[f"parse_segments[{label}]"] = time_call(lambda: process_input.parse_segments(SEGMENT_PATTERN, total_ms), repeat=repeat)
+    results[f"generate_segments_from_checkpoints[{label}]"] = time_call(
+        lambda: process_input.generate_segments_from_checkpoints(SEGMENT_PATTERN, total_ms), repeat=repeat
+    )
+
+    segment_results = build_segment_results(total_ms)
+    results[f"create_srt_content_from_results[{label}]"] = time_call(
+        lambda: generate_output.create_srt_content_from_results(segment_results), repeat=repeat
+    )
+
+    working_audio = WorkingAudio(audio_path)
+    cleaned_path = os.path.join(tmp_dir, "cleaned.wav")
+    basic_settings = process_input.get_cleaning_strategy_settings("basic")
+    results[f"basic_cleaning_vectorized[{label}]"] = time_call(
+        lambda: process_input.apply_vectorized_basic_audio_cleaning(working_audio, cleaned_path, basic_settings), repeat=repeat
+    )
+    if "pydub" in available_packages:
+        results[f"basic_cleaning_pydub[{label}]"] = time_call(
+            lambda: process_input.apply_basic_audio_cleaning(working_audio.to_audio_segment(), cleaned_path, strategy_settings=basic_settings),
+            repeat=1,
+        )
+    try:
+        importlib.import_module("speechbrain")
+    except ImportError:
+        pass
+    else:
+        results[f"speechbrain_cleaning[{label}]"] = time_call(
+            lambda: process_input.apply_speechbrain_audio_cleaning(audio_path, cleaned_path, working_audio), repeat=1
+        )
+
+    work_dir = os.path.join(tmp_dir, f"run_{minutes}min")
+    os.makedirs(work_dir)
+    args = build_run_args(audio_path, os.path.join(tmp_dir, f"synthetic_{minutes}min.srt"))
+    results[f"orchestration_auto_checkpoints[{label}]"] = time_call(lambda: run_orchestration(args, audio_path, work_dir), repeat=repeat)
+
+    os.remove(audio_path)
+    return results
+
+
+def benchmark_srt(cue_count, repeat):
+    import generate_output
+
+    existing_srt = build_synthetic_srt(cue_count)
+    regenerated_srt = build_regenerated_srt(cue_count)
+    return {
+        f"parse_srt[{cue_count}cues]": time_call(lambda: generate_output.parse_srt(existing_srt), repeat=repeat),
+        f"merge_srt_content[{cue_count}cues]": time_call(lambda: generate_output.merge_srt_content(existing_srt, regenerated_srt), repeat=repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--audio-minutes", type=int, nargs="*", default=[1, 60, 360], help="Durations of the synthetic audio, in minutes.")
+    parser.add_argument("--srt-cues", type=int, nargs="*", default=[1000, 10000, 100000], help="Numbers of cues in the synthetic SRT files.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per operation; the median is reported.")
+    parser.add_argument("--real-model", action="store_true", help="Transcribe with the installed whisper_timestamped and the configured model instead of the stub.")
+    parser.add_argument("--save-baseline", type=str, metavar="PATH", help="Store the results as a baseline JSON file.")
+    parser.add_argument("--baseline", type=str, metavar="PATH", help="Compare the results with a baseline JSON file.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown against the baseline, as a fraction (0.2 is 20%%).")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Exit with status 1 when a result is slower than the baseline allows.")
+    args = parser.parse_args()
+
+    available_packages = install_media_stubs(args.real_model)
+
+    import process_input
+
+    # The pipeline modules configure INFO logging on import; keep the per-segment progress out of the results.
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if not args.real_model:
+        process_input.whisper.transcribe = stub_transcribe
+        process_input.whisper.load_model = lambda model_name, device=None: {"name": model_name, "device": device}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for minutes in args.audio_minutes:
+            audio_results = benchmark_audio(minutes, args.repeat, available_packages, tmp_dir)
+            print_results(f"Synthetic audio of {minutes} minute(s)", list(audio_results.items()))
+            results.update(audio_results)
+    for cue_count in args.srt_cues:
+        srt_results = benchmark_srt(cue_count, args.repeat)
+        print_results(f"Synthetic SRT of {cue_count} cues", list(srt_results.items()))
+        results.update(srt_results)
+
+    if args.save_baseline:
+        write_baseline(
+            args.save_baseline,
+            results,
+            {"audio_minutes": args.audio_minutes, "srt_cues": args.srt_cues, "repeat": args.repeat, "real_model": args.real_model},
+        )
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
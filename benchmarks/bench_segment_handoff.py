@@ -0,0 +1,63 @@
+"""
+Compare the per-segment audio handoff cost between the temporary WAV round-trip and the in-memory sample buffer.
+
+Requires the real pydub and whisper_timestamped packages plus FFmpeg, because the fallback path exports each
+segment and decodes it again through whisper.load_audio.
+
+Usage: python benchmarks/bench_segment_handoff.py [--minutes 10] [--segment-seconds 30]
+"""
+import argparse
+import logging
+import os
+import tempfile
+
+from bench_utils import print_results, time_call
+
+import process_input
+from pydub.generators import Sine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, default=10, help="Duration of the synthetic working audio.")
+    parser.add_argument("--segment-seconds", type=int, default=30, help="Duration of each transcription segment.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per handoff path.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    duration_ms = args.minutes * 60 * 1000
+    segment_ms = args.segment_seconds * 1000
+    working_audio = Sine(440).to_audio_segment(duration=duration_ms).set_frame_rate(process_input.TRANSCRIPTION_SAMPLE_RATE).set_channels(1)
+    segments = [(start, min(start + segment_ms, duration_ms)) for start in range(0, duration_ms, segment_ms)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        temp_audio_file = os.path.join(tmp_dir, "temp_segment.wav")
+
+        def run_temp_file_handoff():
+            for segment_start, segment_end in segments:
+                process_input.load_segment_audio_from_temp_file(working_audio, segment_start, segment_end, temp_audio_file)
+
+        temp_file_duration = time_call(run_temp_file_handoff, repeat=args.repeat)
+
+    decode_duration = time_call(lambda: process_input.load_transcription_samples(working_audio), repeat=args.repeat)
+    samples = process_input.load_transcription_samples(working_audio)
+
+    def run_in_memory_handoff():
+        for segment_start, segment_end in segments:
+            process_input.slice_transcription_samples(samples, segment_start, segment_end)
+
+    in_memory_duration = time_call(run_in_memory_handoff, repeat=args.repeat)
+
+    segment_count = len(segments)
+    print_results(
+        f"Segment handoff for {args.minutes} min of audio in {segment_count} segments of {args.segment_seconds} s",
+        [
+            ("temp WAV export + whisper.load_audio (per segment)", temp_file_duration / segment_count),
+            ("in-memory view (per segment)", in_memory_duration / segment_count),
+            ("one-off buffer decode (whole file)", decode_duration),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
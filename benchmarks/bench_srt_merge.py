@@ -0,0 +1,75 @@
+"""
+Time --merge on a large synthetic SRT file, with the original per-subtitle merge for comparison.
+
+The existing file holds back-to-back cues of 1.5 seconds; the regenerated subtitles replace evenly spread runs of
+them with cues of a different length, so every replacement overlaps existing cues. The original merge re-filters
+and re-sorts the whole list once per new subtitle, so it is only run up to --legacy-max-cues existing cues.
+
+Usage: python benchmarks/bench_srt_merge.py [--cues 10000 50000] [--replaced-percent 10] [--repeat 3]
+"""
+import argparse
+import logging
+
+from bench_utils import print_results, time_call
+
+import generate_output
+
+CUE_MS = 1500
+
+
+def legacy_merge_srt_content(srt1_content, srt2_content):
+    merged_subtitles = generate_output.parse_srt(srt1_content)
+    for sub2 in generate_output.parse_srt(srt2_content):
+        merged_subtitles = [sub for sub in merged_subtitles if not (sub.start < sub2.end and sub2.start < sub.end)]
+        merged_subtitles = sorted(merged_subtitles + [sub2], key=lambda sub: sub.start)
+        for i, sub in enumerate(merged_subtitles, start=1):
+            sub.index = i
+    return "\n\n".join(sub.to_srt_block() for sub in merged_subtitles)
+
+
+def build_existing_srt(cue_count):
+    return "".join(
+        generate_output.build_subtitle_entry(index, (index - 1) * CUE_MS, index * CUE_MS, f"Existing line {index}")
+        for index in range(1, cue_count + 1)
+    )
+
+
+def build_regenerated_srt(cue_count, replaced_percent):
+    # One regenerated run of 30 cues for every block of existing cues, with cues 1.2 s long.
+    run_cues = 30
+    runs = max(1, cue_count * replaced_percent // 100 // run_cues)
+    block_ms = cue_count * CUE_MS // runs
+    entries = []
+    for run in range(runs):
+        for cue in range(run_cues):
+            start_ms = run * block_ms + cue * 1200
+            entries.append(generate_output.build_subtitle_entry(len(entries) + 1, start_ms, start_ms + 1200, f"New line {cue}"))
+    return "".join(entries), len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cues", type=int, nargs="+", default=[10000, 50000], help="Numbers of cues in the existing SRT file.")
+    parser.add_argument("--replaced-percent", type=int, default=10, help="Share of the existing cues covered by regenerated subtitles.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per merge.")
+    parser.add_argument("--legacy-max-cues", type=int, default=10000, help="Largest existing file the original merge is run on.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for cue_count in args.cues:
+        existing_srt = build_existing_srt(cue_count)
+        regenerated_srt, regenerated_count = build_regenerated_srt(cue_count, args.replaced_percent)
+
+        rows = [
+            ("parse existing + regenerated", time_call(lambda: (generate_output.parse_srt(existing_srt), generate_output.parse_srt(regenerated_srt)), repeat=args.repeat)),
+            ("merge_srt_content (parse + merge + format)", time_call(lambda: generate_output.merge_srt_content(existing_srt, regenerated_srt), repeat=args.repeat)),
+        ]
+        if cue_count <= args.legacy_max_cues:
+            assert legacy_merge_srt_content(existing_srt, regenerated_srt) == generate_output.merge_srt_content(existing_srt, regenerated_srt)
+            rows.append(("original merge (parse + merge + format)", time_call(lambda: legacy_merge_srt_content(existing_srt, regenerated_srt), repeat=1)))
+
+        print_results(f"Merging {regenerated_count} regenerated cues into {cue_count} existing cues", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compare SRT timestamp parsing and formatting with the original datetime-based code on synthetic cues.
+
+The original path parses both timestamps of a cue with datetime.strptime into datetime.time values and formats
+them back with strftime; the current one reads and writes integer milliseconds by hand. Only the Python standard
+library is needed.
+
+Usage: python benchmarks/bench_srt_parse.py [--cues 50000] [--repeat 5]
+"""
+import argparse
+import datetime
+import logging
+
+from bench_utils import print_results, time_call
+
+import generate_output
+
+CUE_MS = 1500
+
+
+def legacy_parse_srt(srt_content):
+    subtitles = []
+    for block in srt_content.split("\n\n"):
+        if not block.strip():
+            continue
+        lines = block.strip().split("\n")
+        start_str, end_str = lines[1].split(" --> ")
+        start = datetime.datetime.strptime(start_str.strip(), '%H:%M:%S,%f').time()
+        end = datetime.datetime.strptime(end_str.strip(), '%H:%M:%S,%f').time()
+        subtitles.append((lines[0], start, end, "\n".join(lines[2:]).strip()))
+    return subtitles
+
+
+def legacy_format_srt(subtitles):
+    return "\n\n".join(
+        f"{index}\n{start.strftime('%H:%M:%S,%f')[:-3]} --> {end.strftime('%H:%M:%S,%f')[:-3]}\n{text}\n"
+        for index, start, end, text in subtitles
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cues", type=int, default=50000, help="Number of cues in the synthetic SRT content.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per operation.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    # The original parser cannot read hours past 23, so cues wrap around within one day.
+    day_ms = 24 * 3600 * 1000
+    srt_content = "".join(
+        generate_output.build_subtitle_entry(
+            index, (index - 1) * CUE_MS % (day_ms - CUE_MS), (index - 1) * CUE_MS % (day_ms - CUE_MS) + CUE_MS, f"Line {index}"
+        )
+        for index in range(1, args.cues + 1)
+    )
+    legacy_subtitles = legacy_parse_srt(srt_content)
+    subtitles = generate_output.parse_srt(srt_content)
+    assert legacy_format_srt(legacy_subtitles) == generate_output.format_srt(subtitles)
+
+    print_results(
+        f"Parsing and formatting {args.cues} SRT cues",
+        [
+            ("original parse (strptime)", time_call(lambda: legacy_parse_srt(srt_content), repeat=args.repeat)),
+            ("parse_srt (integer ms)", time_call(lambda: generate_output.parse_srt(srt_content), repeat=args.repeat)),
+            ("original format (strftime)", time_call(lambda: legacy_format_srt(legacy_subtitles), repeat=args.repeat)),
+            ("format_srt (integer ms)", time_call(lambda: generate_output.format_srt(subtitles), repeat=args.repeat)),
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES_DIR = os.path.join(REPO_ROOT, "modules")
+
+for path in (REPO_ROOT, MODULES_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def time_call(function, repeat=5):
+    """
+    Run a callable several times and return the median wall time in seconds.
+
+    :param function: callable without arguments.
+    :param repeat: int, number of timed runs.
+    :return: float, median duration in seconds.
+    """
+    durations = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start_time)
+    return statistics.median(durations)
+
+
+def print_results(title, rows):
+    print(title)
+    label_width = max(len(label) for label, _duration in rows)
+    for label, duration in rows:
+        print(f"  {label.ljust(label_width)}  {duration * 1000:10.3f} ms")
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_baseline(path, results, settings=None):
+    """
+    Store benchmark results as a baseline JSON file, along with where and when they were measured.
+
+    :param results: dict mapping benchmark names to median durations in seconds.
+    :param settings: dict with the options the benchmarks ran with.
+    """
+    baseline = {
+        "commit": get_git_commit(),
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings or {},
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+
+
+def compare_with_baseline(results, baseline_path, tolerance):
+    """
+    Print every result next to its baseline and return the names of the benchmarks that got slower.
+
+    :param tolerance: float, allowed slowdown as a fraction of the baseline (0.2 allows 20% slower).
+    :return: list of benchmark names slower than the baseline by more than the tolerance.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    print(f"Compared with baseline {baseline_path} (commit {baseline.get('commit') or 'unknown'})")
+    regressions = []
+    label_width = max(len(name) for name in results)
+    for name, duration in results.items():
+        baseline_duration = baseline["results"].get(name)
+        if baseline_duration is None:
+            print(f"  {name.ljust(label_width)}  {duration * 1000:10.3f} ms  (not in baseline)")
+            continue
+        ratio = duration / baseline_duration if baseline_duration else float("inf")
+        marker = ""
+        if ratio > 1 + tolerance:
+            regressions.append(name)
+            marker = "  REGRESSION"
+        print(f"  {name.ljust(label_width)}  {duration * 1000:10.3f} ms  vs {baseline_duration * 1000:10.3f} ms  ({ratio:5.2f}x){marker}")
+    return regressions
@@ -0,0 +1,88 @@
+"""
+Compare video audio extraction through MoviePy with the direct FFmpeg extractor on synthetic videos.
+
+The synthetic videos are generated with FFmpeg's lavfi sources (a test pattern plus a sine tone) in a temporary
+directory, so FFmpeg must be on PATH. The MoviePy path also requires the real moviepy and pydub packages; it is
+skipped with --skip-moviepy or when MoviePy is not installed.
+
+Usage: python benchmarks/bench_video_extraction.py [--minutes 1 5] [--container mp4 avi] [--repeat 3]
+"""
+import argparse
+import logging
+import os
+import subprocess
+import tempfile
+
+from bench_utils import time_call
+
+import process_input
+
+
+def generate_synthetic_video(ffmpeg_path, output_path, minutes):
+    duration_seconds = str(minutes * 60)
+    subprocess.run(
+        [
+            ffmpeg_path, "-nostdin", "-v", "error", "-y",
+            "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=25:duration={duration_seconds}",
+            "-f", "lavfi", "-i", f"sine=frequency=440:sample_rate=48000:duration={duration_seconds}",
+            "-ac", "2",
+            "-shortest",
+            output_path,
+        ],
+        check=True,
+    )
+
+
+def run_moviepy_extraction(video_path, tmp_dir):
+    working_audio_path = os.path.join(tmp_dir, "moviepy_working.wav")
+    process_input.extract_audio(video_path, working_audio_path)
+    process_input.validate_audio_file(working_audio_path)
+
+
+def run_direct_extraction(video_path, tmp_dir):
+    process_input.extract_video_audio(video_path, os.path.join(tmp_dir, "direct_working.wav"))
+
+
+def format_rate(byte_count, seconds):
+    return f"{byte_count / seconds / (1024 * 1024):8.1f} MiB/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=int, nargs="+", default=[1, 5], help="Durations of the synthetic videos.")
+    parser.add_argument("--container", nargs="+", default=["mp4", "avi"], help="Containers of the synthetic videos.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs per extractor.")
+    parser.add_argument("--skip-moviepy", action="store_true", help="Only time the direct FFmpeg extractor.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    ffmpeg_path = process_input.find_ffmpeg()
+    if ffmpeg_path is None:
+        raise SystemExit("FFmpeg must be on PATH to generate the synthetic videos.")
+
+    extractors = [("direct ffmpeg", run_direct_extraction)]
+    if not args.skip_moviepy:
+        try:
+            process_input.get_moviepy_audio_file_clip()
+            extractors.insert(0, ("moviepy", run_moviepy_extraction))
+        except RuntimeError as e:
+            print(f"Skipping MoviePy extraction: {e}")
+
+    print("Video audio extraction (median wall time, input throughput)")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for container in args.container:
+            for minutes in args.minutes:
+                video_path = os.path.join(tmp_dir, f"synthetic_{minutes}m.{container}")
+                generate_synthetic_video(ffmpeg_path, video_path, minutes)
+                video_size = os.path.getsize(video_path)
+                print(f"  {os.path.basename(video_path)} ({video_size / (1024 * 1024):.1f} MiB)")
+
+                for label, extractor in extractors:
+                    duration = time_call(lambda: extractor(video_path, tmp_dir), repeat=args.repeat)
+                    print(f"    {label.ljust(14)}  {duration * 1000:10.1f} ms  {format_rate(video_size, duration)}")
+
+                os.remove(video_path)
+
+
+if __name__ == "__main__":
+    main()
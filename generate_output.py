@@ -1,15 +1,25 @@
 import logging
-import datetime
-import json
 import os
 import re
 
-from config import TMP_DIR
+from modules import find_kept_intervals, stage
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 
+# Output is written next to its final path under this suffix and renamed into place once it is complete.
+PARTIAL_OUTPUT_SUFFIX = ".partial"
+
+# Matches the usual "hh:mm:ss,mmm --> hh:mm:ss,mmm" line in one step; other layouts go through parse_srt_time.
+CANONICAL_TIME_RANGE_PATTERN = re.compile(
+    r"[ \t]*(\d{2}):(\d{2}):(\d{2}),(\d{3}) --> (\d{2}):(\d{2}):(\d{2}),(\d{3})(?:[ \t]|$)", re.ASCII
+)
+
 class Subtitle:
+    """One SRT cue, with start and end in integer milliseconds."""
+
+    __slots__ = ("index", "start", "end", "text")
+
     def __init__(self, index, start, end, text):
         self.index = index
         self.start = start
@@ -18,28 +28,95 @@ class Subtitle:
 
     @classmethod
     def from_srt_block(cls, block):
-        lines = block.strip().split("\n")
-        index = lines[0]
-        start, end = cls.parse_time_range(lines[1])
-        text = "\n".join(lines[2:]).strip()
+        return cls.from_srt_lines(block.strip().splitlines())
+
+    @classmethod
+    def from_srt_lines(cls, lines, position=None):
+        """
+        Build a cue from its non-blank lines: the index, the time range and the text.
+
+        Cues whose index line is missing are numbered by their position in the file.
+        """
+        if lines and "-->" in lines[0]:
+            index, time_range, text_lines = str(position), lines[0], lines[1:]
+        elif len(lines) >= 2:
+            index, time_range, text_lines = lines[0].strip(), lines[1], lines[2:]
+        else:
+            raise ValueError(f"Invalid SRT cue without a time range: {lines!r}")
+
+        start, end = cls.parse_time_range(time_range)
+        text = "\n".join(text_lines).strip()
         return cls(index, start, end, text)
 
     @staticmethod
     def parse_time_range(time_range):
-        time_format = '%H:%M:%S,%f'
-        start_str, end_str = time_range.split(" --> ")
-        start = datetime.datetime.strptime(start_str.strip(), time_format).time()
-        end = datetime.datetime.strptime(end_str.strip(), time_format).time()
-        return start, end
+        match = CANONICAL_TIME_RANGE_PATTERN.match(time_range)
+        if match:
+            h1, m1, s1, ms1, h2, m2, s2, ms2 = map(int, match.groups())
+            return ((h1 * 60 + m1) * 60 + s1) * 1000 + ms1, ((h2 * 60 + m2) * 60 + s2) * 1000 + ms2
+
+        start_str, separator, end_str = time_range.partition("-->")
+        if not separator:
+            raise ValueError(f"Invalid SRT time range '{time_range}'.")
+        # Anything after the end time, such as position settings, is ignored.
+        end_fields = end_str.split()
+        if not end_fields:
+            raise ValueError(f"Invalid SRT time range '{time_range}'.")
+        return parse_srt_time(start_str), parse_srt_time(end_fields[0])
 
     @staticmethod
     def time_to_str(time):
-        return time.strftime('%H:%M:%S,%f')[:-3]  # remove last three digits (micro -> milliseconds)
+        return format_srt_time(time)
 
     def to_srt_block(self):
-        start_str = self.time_to_str(self.start)
-        end_str = self.time_to_str(self.end)
-        return f"{self.index}\n{start_str} --> {end_str}\n{self.text}\n"
+        return f"{self.index}\n{format_srt_time(self.start)} --> {format_srt_time(self.end)}\n{self.text}\n"
+
+def parse_srt_time(timestamp):
+    """
+    Parse an SRT timestamp such as 01:02:03,456 into integer milliseconds.
+
+    Hours may exceed 23 and take more than two digits, a period is accepted in place of the comma, and short
+    millisecond fields are read as fractions (1,5 is 1500 ms).
+    """
+    timestamp = timestamp.strip()
+    fields = timestamp.replace(".", ",").replace(",", ":", 1).split(":")
+    if len(fields) not in (3, 4) or not all(field.isascii() and field.isdigit() for field in fields):
+        raise ValueError(f"Invalid SRT timestamp '{timestamp}'.")
+
+    hours, minutes, seconds = (int(field) for field in fields[:3])
+    milliseconds = int(fields[3].ljust(3, "0")[:3]) if len(fields) == 4 else 0
+    return (hours * 3600 + minutes * 60 + seconds) * 1000 + milliseconds
+
+def iter_srt_cues(lines):
+    """
+    Yield a Subtitle for every cue in an iterable of SRT lines, such as an open file, without reading it all first.
+
+    LF and CRLF line endings, a UTF-8 byte order mark and any number of blank or whitespace-only lines between
+    cues are accepted.
+    """
+    block = []
+    position = 0
+    for line_number, line in enumerate(lines):
+        line = line.rstrip("\r\n")
+        if line_number == 0:
+            line = line.lstrip("\ufeff")
+        if line.strip():
+            block.append(line)
+        elif block:
+            position += 1
+            yield Subtitle.from_srt_lines(block, position)
+            block = []
+
+    if block:
+        yield Subtitle.from_srt_lines(block, position + 1)
+
+def read_srt_file(path):
+    """Parse an SRT file into a list of Subtitle cues, streaming it line by line."""
+    with open(path, 'r', encoding='utf-8') as file:
+        return list(iter_srt_cues(file))
+
+def format_srt(subtitles):
+    return "\n\n".join(sub.to_srt_block() for sub in subtitles)
 
 def validate_output(path):
     """
@@ -78,136 +155,273 @@ def validate_output(path):
 
         return path
 
+def seconds_to_ms(time_in_seconds):
+    """Round a Whisper timestamp in float seconds to integer milliseconds."""
+    return int(round(time_in_seconds * 1000))
+
+def format_srt_time(milliseconds):
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%02d:%02d:%02d,%03d" % (hours, minutes, seconds, milliseconds)
+
 def convert_to_srt_time(time_in_seconds):
-    formatted_time = datetime.timedelta(seconds=time_in_seconds)
-    hours, remainder = divmod(formatted_time.seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    hours += formatted_time.days * 24  # add days to hours if there are any
-    milliseconds = formatted_time.microseconds // 1000
-    return "{:02}:{:02}:{:02},{:03}".format(hours, minutes, seconds, milliseconds)
+    return format_srt_time(seconds_to_ms(time_in_seconds))
 
 def generate_subtitle_entry(index, start_time, end_time, text):
     """Generate a subtitle entry."""
-    start_srt = convert_to_srt_time(start_time)
-    end_srt = convert_to_srt_time(end_time)
-    return f"{index}\n{start_srt} --> {end_srt}\n{text}\n\n"
+    return build_subtitle_entry(index, seconds_to_ms(start_time), seconds_to_ms(end_time), text)
+
+def build_subtitle_entry(index, start_ms, end_ms, text):
+    """Generate a subtitle entry from integer millisecond times."""
+    return f"{index}\n{format_srt_time(start_ms)} --> {format_srt_time(end_ms)}\n{text}\n\n"
+
+def offset_segments(segments, offset_ms):
+    """
+    Place a segment result's Whisper segments on the input timeline.
+
+    Times are converted to integer milliseconds before the offset is added, so long inputs with thousands of
+    segments do not accumulate float error.
+
+    :return: list of dicts with "text", "start_ms" and "end_ms".
+    """
+    return [
+        {
+            "text": segment["text"],
+            "start_ms": offset_ms + seconds_to_ms(segment["start"]),
+            "end_ms": offset_ms + seconds_to_ms(segment["end"]),
+        }
+        for segment in segments
+    ]
+
+def create_srt_content_from_results(segment_results):
+    """
+    Build the SRT content from the segment results returned by process_input, without touching the disk.
+
+    Results are ordered by their start on the input timeline. When the same range was transcribed more than once,
+    the last result wins, like a rewritten checkpoint file would.
+
+    :param segment_results: list of dicts with "start_ms", "end_ms" and the segment's Whisper "result".
+    """
+    results_by_range = {}
+    for segment_result in segment_results:
+        results_by_range[(segment_result["start_ms"], segment_result["end_ms"])] = segment_result
 
-def create_srt_content(json_files):
     segments = []
-    for json_file in json_files:
-        with open(f"{TMP_DIR}{json_file}", 'r', encoding='utf-8') as file:
-            data = json.load(file)
-            offset = extract_time_from_filename(json_file)
-            if offset is not None:
-                for segment in data['segments']:
-                    segment['start'] += offset
-                    segment['end'] += offset
-            segments.extend(data['segments'])
+    for (start_ms, _end_ms), segment_result in sorted(results_by_range.items()):
+        segments.extend(offset_segments(segment_result["result"]["segments"], start_ms))
+
+    return build_srt_content(segments)
 
+def build_srt_content(segments):
+    """
+    Join consecutive segments with the same text into one subtitle entry each.
+
+    :param segments: list of dicts with "text", "start_ms" and "end_ms", as built by offset_segments.
+    """
     index = 1
     current_text = None
-    start_time = None
-    end_time = None
+    start_ms = None
+    end_ms = None
     entries = []
 
     for segment in segments:
         if current_text is not None and current_text != segment['text']:
-            entries.append(generate_subtitle_entry(index, start_time, end_time, current_text))
+            entries.append(build_subtitle_entry(index, start_ms, end_ms, current_text))
             index += 1
             current_text = segment['text']
-            start_time = segment['start']
-            end_time = segment['end']
+            start_ms = segment['start_ms']
+            end_ms = segment['end_ms']
         else:
             if current_text is None:
                 current_text = segment['text']
-                start_time = segment['start']
-            end_time = segment['end']
+                start_ms = segment['start_ms']
+            end_ms = segment['end_ms']
 
     if current_text is not None:
-        entries.append(generate_subtitle_entry(index, start_time, end_time, current_text))
+        entries.append(build_subtitle_entry(index, start_ms, end_ms, current_text))
 
     return ''.join(entries)
 
 def parse_srt(srt_content):
-    blocks = srt_content.split("\n\n")
-    return [Subtitle.from_srt_block(block) for block in blocks if block.strip()]
+    return list(iter_srt_cues(srt_content.splitlines()))
 
 def merge_srt_content(srt1_content, srt2_content):
-    subtitles1 = parse_srt(srt1_content)
-    subtitles2 = parse_srt(srt2_content)
-
-    # Logic for replacing the content from srt1 with srt2 based on the time range.
-    merged_subtitles = subtitles1
-    for sub2 in subtitles2:
-        # Remove any overlapping subtitles from srt1
-        merged_subtitles = [sub for sub in merged_subtitles if not (sub.start < sub2.end and sub2.start < sub.end)]
-        # Merge the subtitles list while maintaining the order
-        merged_subtitles = sorted(merged_subtitles + [sub2], key=lambda sub: sub.start)
-        # Re-index the subtitles
-        i = 1  # subtitle index for the new merged content
-        for sub in merged_subtitles:
-            sub.index = i
-            i += 1
-
-    # Convert the merged subtitles back to SRT format
-    merged_srt_content = "\n\n".join(sub.to_srt_block() for sub in merged_subtitles)
-    return merged_srt_content
-
-def extract_time_from_filename(filename):
-    """
-    Extract the time information from the file name and convert it to seconds.
-
-    :param filename: str, the file name which contains the time information
-    :return: time_in_seconds, the float time in seconds format or None if there is a format mismatch
-    """
-    
-    # Use regex to find the time pattern in the filename.
-    match = re.search(r'(\d{6})_(\d{6})\.json$', filename)
-    
-    if match:
-        # If a matching segment is found, isolate the required time segment (the second group in this case).
-        time_segment = match.group(1)  # e.g., "004408"
-
-        # Split the time segment into hours, minutes, and seconds.
-        # We're assuming here that the time is represented in a 'hhmmss' format.
-        hours, remainder = divmod(int(time_segment), 10000)
-        minutes, seconds = divmod(remainder, 100)
-
-        formatted_time = hours * 3600 + minutes * 60 + seconds
-        return formatted_time
-    else:
-        # If the regex finds no match, there's a format mismatch. Handle as appropriate.
-        logging.info("The filename does not match the expected format.")
-        return None
+    return format_srt(merge_subtitle_cues(parse_srt(srt1_content), parse_srt(srt2_content)))
 
-def process_directory(output_path, merge_subtitles=False):
-    # Gather all JSON files in the directory
-    json_files = sorted([file for file in os.listdir(TMP_DIR) if file.endswith('.json')])
-    logging.info(f"Found {len(json_files)} speech recognition JSON file(s) for processing.")
+def merge_subtitle_cues(subtitles1, subtitles2):
+    """
+    Merge newly generated subtitles into existing ones.
 
-    try:
-        logging.info(f"Processing speech recognition JSON files")
-        srt_content = create_srt_content(json_files)
-        logging.info(f"Completed processing speech recognition JSON files")
+    Every new subtitle replaces the existing subtitles it overlaps in time, as well as earlier new subtitles it
+    overlaps. The result is ordered by start time, existing subtitles first on ties, and re-indexed from 1.
+    """
+    if not subtitles2:
+        # Nothing is replaced, so the existing subtitles are written back as they were.
+        return subtitles1
+
+    kept1, kept2 = find_kept_intervals(
+        [(sub.start, sub.end) for sub in subtitles1],
+        [(sub.start, sub.end) for sub in subtitles2],
+    )
+    merged_subtitles = [subtitles1[i] for i in kept1] + [subtitles2[i] for i in kept2]
+    # A stable sort by start keeps existing subtitles before new ones with the same start.
+    merged_subtitles.sort(key=lambda sub: sub.start)
+
+    # Re-index the subtitles
+    for i, sub in enumerate(merged_subtitles, start=1):
+        sub.index = i
+
+    return merged_subtitles
+
+def write_file_atomically(path, content):
+    """Write text to path through a partial file renamed over it, so readers never see a half-written file."""
+    partial_path = path + PARTIAL_OUTPUT_SUFFIX
+    with open(partial_path, 'w', encoding='utf-8') as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(partial_path, path)
+
+def write_srt_output(output_path, srt_content, merge_subtitles=False):
+    if merge_subtitles and os.path.exists(output_path):
+        # If the merge flag is set, merge the new subtitles with the existing ones.
+        logging.info(f"Merging generated subtitles with existing ones")
+        with stage("merge"):
+            srt_content = format_srt(merge_subtitle_cues(read_srt_file(output_path), parse_srt(srt_content)))
+
+    logging.info(f"Writing to output file: {output_path}")
+    with stage("srt_write"):
+        write_file_atomically(output_path, srt_content.strip())
+
+class SrtStreamWriter:
+    """
+    Write subtitles to <output>.partial while segments are still being transcribed.
+
+    Every segment result is turned into cues as soon as it arrives, and all but the last cue are written and
+    flushed right away; the last one is held back because the next segment may continue it. Only that cue is kept
+    in memory. commit() writes the last cue, merges with the existing output when requested and renames the file
+    into place, so the output path only ever holds complete subtitles. A run that fails leaves the partial file
+    behind with everything transcribed so far. The partial file is only created with the first segment result, and
+    one holding no cue is removed on close, so runs failing before transcription leave nothing behind.
 
-        if merge_subtitles and os.path.exists(output_path):
-            # If the merge flag is set, merge the new subtitles with the existing ones.
+    Segment results must arrive in timeline order, as process_input delivers them.
+    """
+
+    def __init__(self, output_path, merge_subtitles=False):
+        self.output_path = output_path
+        self.partial_path = output_path + PARTIAL_OUTPUT_SUFFIX
+        self.merge_subtitles = merge_subtitles
+        self.cue_count = 0
+        self._pending_cue = None
+        self._last_range = None
+        self.committed = False
+        self._file = None
+
+    def _open_partial_file(self):
+        if self._file is None:
+            self._file = open(self.partial_path, 'w', encoding='utf-8')
+        return self._file
+
+    def add_segment_result(self, segment_result):
+        segment_range = (segment_result["start_ms"], segment_result["end_ms"])
+        if segment_range == self._last_range:
+            return
+        self._last_range = segment_range
+        self._open_partial_file()
+
+        with stage("srt_assembly"):
+            for segment in offset_segments(segment_result["result"]["segments"], segment_result["start_ms"]):
+                # Consecutive segments with the same text are joined into one cue.
+                if self._pending_cue is not None and self._pending_cue[0] == segment["text"]:
+                    self._pending_cue[2] = segment["end_ms"]
+                    continue
+                if self._pending_cue is not None:
+                    self._write_cue(*self._pending_cue)
+                self._pending_cue = [segment["text"], segment["start_ms"], segment["end_ms"]]
+            self._file.flush()
+
+    def _write_cue(self, text, start_ms, end_ms, last=False):
+        entry = build_subtitle_entry(self.cue_count + 1, start_ms, end_ms, text)[:-2]
+        if last:
+            entry = entry.rstrip()
+        if self.cue_count:
+            self._file.write("\n\n")
+        self._file.write(entry)
+        self.cue_count += 1
+
+    def commit(self):
+        """Finish the subtitles and move them to the output path."""
+        self._open_partial_file()
+        if self._pending_cue is not None:
+            self._write_cue(*self._pending_cue, last=True)
+            self._pending_cue = None
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+        if self.merge_subtitles and os.path.exists(self.output_path):
             logging.info(f"Merging generated subtitles with existing ones")
-            with open(output_path, 'r', encoding='utf-8') as file:
-                existing_srt_content = file.read()
-            srt_content = merge_srt_content(existing_srt_content, srt_content)
-
-        srt_output_file = open(output_path, 'w', encoding='utf-8')
-        logging.info(f"Writing to output file: {output_path}")
-        srt_output_file.write(srt_content.strip())
-        srt_output_file.close()
+            with stage("merge"):
+                merged_subtitles = merge_subtitle_cues(read_srt_file(self.output_path), read_srt_file(self.partial_path))
+                write_file_atomically(self.output_path, format_srt(merged_subtitles).strip())
+        else:
+            os.replace(self.partial_path, self.output_path)
+        self.committed = True
+        logging.info(f"Wrote {self.cue_count} subtitle(s) to output file: {self.output_path}")
+
+    def close(self):
+        """Release the partial file of a run that did not commit, keeping what was written so far."""
+        if self.committed or self._file is None or self._file.closed:
+            return
+        self._file.close()
+        if self.cue_count == 0:
+            # Nothing was transcribed, so there is nothing worth keeping.
+            try:
+                os.remove(self.partial_path)
+            except OSError:
+                logging.warning(f"Could not remove the empty partial subtitles file {self.partial_path}.", exc_info=True)
+            return
+        logging.warning(f"Subtitles were not completed. What was transcribed so far is kept in {self.partial_path}")
+
+def open_srt_writer(args):
+    """Validate the run's output path and open a streaming writer for it."""
+    output_path = validate_output(args.output or os.path.dirname(args.input))
+    return SrtStreamWriter(output_path, getattr(args, "merge", False))
+
+def process_segment_results(output_path, segment_results, merge_subtitles=False):
+    logging.info(f"Processing {len(segment_results)} speech recognition segment result(s)")
+
+    try:
+        with stage("srt_assembly", segment_results=len(segment_results)):
+            srt_content = create_srt_content_from_results(segment_results)
+        write_srt_output(output_path, srt_content, merge_subtitles)
     except Exception as e:
-        logging.error(f"An error occurred while processing speech recognition JSON files: {str(e)}", exc_info=True)
+        logging.error(f"An error occurred while processing speech recognition results: {str(e)}", exc_info=True)
+
+    logging.info("All segment results have been processed.")
 
-    logging.info("All files have been processed.")
+def generate_output(args, segment_results=None, srt_writer=None):
+    """
+    Write the SRT output for a run.
+
+    :param segment_results: list returned by process_input.
+    :param srt_writer: SrtStreamWriter that already received the run's segment results; it is committed.
+    :raises ValueError: if neither is given.
+    """
+    if srt_writer is not None:
+        try:
+            with stage("srt_commit", cues=srt_writer.cue_count):
+                srt_writer.commit()
+        except Exception as e:
+            logging.error(f"An error occurred while writing the subtitles: {str(e)}", exc_info=True)
+        finally:
+            srt_writer.close()
+        return
+
+    if segment_results is None:
+        raise ValueError("Subtitles are generated from the segment results of process_input or a streaming writer.")
 
-def generate_output(args):
     output_path = args.output or os.path.dirname(args.input)
     output_path = validate_output(output_path)
-    merge_subtitles = args.merge
-    process_directory(output_path, merge_subtitles)
+    process_segment_results(output_path, segment_results, args.merge)
@@ -1,10 +1,17 @@
 import logging
-import os
-import shutil
-from config import APP_VERSION, TMP_DIR
-from modules import Chronometer, execution_args
-from process_input import process_input
-from generate_output import generate_output
+from config import APP_VERSION
+from modules import (
+    Chronometer,
+    build_run_journal_path,
+    execution_args,
+    remove_run_journal,
+    remove_workspace,
+    start_stage_metrics,
+    stop_stage_metrics,
+    write_stage_metrics,
+)
+from process_input import create_run_workspace, process_input
+from generate_output import generate_output, open_srt_writer
 
 # Create and start the chronometer
 chrono = Chronometer()
@@ -14,22 +21,44 @@ chrono.start()
 logging.basicConfig(level=logging.INFO)
 
 if __name__ == "__main__":
+    work_dir = None
+    srt_writer = None
     try:
         # Parse execution arguments
         args = execution_args()
 
         # Run the program or print the version
         if not args.version:
-            process_input(args)
-            generate_output(args)
+            if getattr(args, "metrics_out", None) or getattr(args, "metrics_trace", None):
+                start_stage_metrics()
+            work_dir = create_run_workspace(getattr(args, "workspace_root", None))
+            # Subtitles are written while the segments are transcribed and moved into place at the end.
+            srt_writer = open_srt_writer(args)
+            # Finished segments are journaled next to the output until the subtitles are complete, for --resume.
+            run_journal_path = build_run_journal_path(srt_writer.output_path)
+            process_input(
+                args, work_dir=work_dir, on_segment_result=srt_writer.add_segment_result, run_journal_path=run_journal_path
+            )
+            generate_output(args, srt_writer=srt_writer)
+            if srt_writer.committed:
+                remove_run_journal(run_journal_path)
         else:
             logging.info(f"Version {APP_VERSION}")
     except Exception as e:
         logging.error(f"An error occurred while running process: {str(e)}", exc_info=True)
     finally:
-        # Clean up the temporary directory
-        if os.path.exists(TMP_DIR):
-            shutil.rmtree(TMP_DIR)
+        if srt_writer is not None:
+            srt_writer.close()
+
+        # Clean up this run's workspace only; other runs may be using the same root
+        remove_workspace(work_dir)
+
+        stage_recorder = stop_stage_metrics()
+        if stage_recorder is not None:
+            try:
+                write_stage_metrics(stage_recorder, args.metrics_out, args.metrics_trace)
+            except Exception as e:
+                logging.error(f"Could not write the stage metrics: {str(e)}", exc_info=True)
 
         logging.info("Clean exit.")
 
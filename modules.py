@@ -2,8 +2,27 @@ import sys
 sys.path.insert(1, './modules')
 
 from app_config import load_app_config, save_app_config, update_app_config
+from basic_cleaning import apply_basic_cleaning_chain, iter_basic_cleaning_chunks
 from chronometer import Chronometer
 from cleaning_settings import load_cleaning_settings, save_cleaning_settings
 from convert_hhmmss_to_ms import convert_hhmmss_to_ms
+from file_cache import FileCache, hash_file, hash_key
 from format_ms_duration import format_ms_duration
-from execution_args import execution_args
+from interval_overlap import find_kept_intervals
+from long_form import TranscriptContext, plan_transcription_windows, reconcile_window_result
+from media_probe import MediaProbe, probe_media
+from model_cache import ModelCache
+from overlap_add import OverlapAddWriter, plan_overlap_chunks
+from run_journal import RunJournal, build_run_journal_path, read_run_journal, remove_run_journal
+from stage_metrics import StageRecorder, stage, start_stage_metrics, stop_stage_metrics, write_stage_metrics
+from voice_activity import (
+    compute_frame_levels,
+    detect_speech_frames,
+    find_speech_regions,
+    get_voice_activity_settings,
+    plan_speech_segments,
+    trim_segments_to_speech,
+)
+from working_audio import WorkingAudio, is_working_audio_format, read_wav_header
+from workspace import create_workspace, remove_workspace, resolve_workspace_root
+from execution_args import batch_execution_args, execution_args, serve_execution_args
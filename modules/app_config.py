@@ -20,6 +20,26 @@ APP_CONFIG_DEFAULTS = {
     "speechbrain_strategy_settings": {
         "model_source": "speechbrain/metricgan-plus-voicebank",
         "validate_runtime_before_launch": True,
+        "chunk_seconds": 30,
+        "overlap_seconds": 1,
+        "torch_threads": None,
+    },
+    "transcription_settings": {
+        "model_name": "tiny",
+        "device": None,
+    },
+    "audio_cache_settings": {
+        "enabled": True,
+        "max_size_mb": 2048,
+    },
+    "transcription_cache_settings": {
+        "enabled": True,
+        "max_size_mb": 256,
+    },
+    "workspace_settings": {
+        "root": None,
+        "prefer_tmpfs": True,
+        "tmpfs_min_free_mb": 2048,
     },
 }
 
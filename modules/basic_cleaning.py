@@ -0,0 +1,254 @@
+import math
+
+# Defaults of pydub's compress_dynamic_range and normalize, which the basic cleaning chain has always used.
+COMPRESSOR_THRESHOLD_DB = -20.0
+COMPRESSOR_RATIO = 4.0
+COMPRESSOR_ATTACK_MS = 5.0
+COMPRESSOR_RELEASE_MS = 50.0
+NORMALIZATION_HEADROOM_DB = 0.1
+DEFAULT_CHUNK_FRAMES = 1 << 19
+INT16_SCALE = 32768.0
+
+
+def build_filter_sections(sample_rate, high_pass_cutoff_hz=None, low_pass_cutoff_hz=None):
+    """
+    Build the high-pass and low-pass filters as second-order sections for scipy.signal.sosfilt.
+
+    Both are the one-pole RC filters used by pydub, stored as biquad rows whose second-order terms are zero, so the
+    cascade runs in one sosfilt call while keeping pydub's frequency response.
+
+    :return: list of [b0, b1, b2, a0, a1, a2] rows, high-pass first.
+    """
+    sections = []
+    dt = 1.0 / sample_rate
+
+    if high_pass_cutoff_hz is not None:
+        rc = 1.0 / (high_pass_cutoff_hz * 2 * math.pi)
+        alpha = rc / (rc + dt)
+        # y[n] = alpha * (y[n - 1] + x[n] - x[n - 1])
+        sections.append([alpha, -alpha, 0.0, 1.0, -alpha, 0.0])
+
+    if low_pass_cutoff_hz is not None:
+        rc = 1.0 / (low_pass_cutoff_hz * 2 * math.pi)
+        alpha = dt / (rc + dt)
+        # y[n] = y[n - 1] + alpha * (x[n] - y[n - 1])
+        sections.append([alpha, 0.0, 0.0, 1.0, alpha - 1.0, 0.0])
+
+    return sections
+
+
+def initial_filter_state(sections, first_frame):
+    """
+    Return the sosfilt state that makes every section output the first input frame unchanged, as pydub does.
+
+    :param first_frame: numpy.ndarray of shape (channels,).
+    :return: numpy.ndarray of shape (sections, 2, channels).
+    """
+    import numpy as np
+
+    state = np.zeros((len(sections), 2, first_frame.shape[0]), dtype=first_frame.dtype)
+    for index, (b0, _b1, _b2, _a0, _a1, _a2) in enumerate(sections):
+        # Transposed direct form II: y[0] = b0 * x[0] + z[0], so z[0] = (1 - b0) * x[0] gives y[0] = x[0].
+        state[index, 0] = (1.0 - b0) * first_frame
+    return state
+
+
+class BlockCompressor:
+    """
+    Envelope-follower compressor evaluated once per block of a quarter attack window instead of once per sample.
+
+    It follows pydub's compress_dynamic_range: the envelope is the RMS of the preceding attack window, the
+    attenuation ramps towards its target over the attack time and backs off over the release time, and it is held
+    while the level stays below the threshold.
+    """
+
+    def __init__(
+        self,
+        sample_rate,
+        threshold_db=COMPRESSOR_THRESHOLD_DB,
+        ratio=COMPRESSOR_RATIO,
+        attack_ms=COMPRESSOR_ATTACK_MS,
+        release_ms=COMPRESSOR_RELEASE_MS,
+    ):
+        self.attack_frames = sample_rate * attack_ms / 1000.0
+        self.release_frames = sample_rate * release_ms / 1000.0
+        self.window_frames = max(1, int(self.attack_frames))
+        self.block_frames = max(1, self.window_frames // 4)
+        self.threshold = 10 ** (threshold_db / 20.0)
+        self.ratio = ratio
+        self.attenuation_db = 0.0
+        self.power_history = None
+
+    def process(self, chunk):
+        """
+        Return the per-frame gain for a chunk of normalized samples, updating the envelope state.
+
+        :param chunk: numpy.ndarray of shape (frames, channels); every chunk but the last must hold whole blocks.
+        :return: numpy.ndarray of shape (frames,) with linear gains.
+        """
+        block_start_db, block_end_db = self.measure(chunk)
+        return self.block_gain(block_start_db, block_end_db, chunk.shape[0])
+
+    def measure(self, chunk):
+        """
+        Return the attenuation at the start and end of each block of a chunk, updating the envelope state.
+
+        :param chunk: numpy.ndarray of shape (frames, channels); every chunk but the last must hold whole blocks.
+        :return: tuple of two numpy.ndarray of shape (blocks,) with attenuations in dB.
+        """
+        import numpy as np
+
+        frame_count = chunk.shape[0]
+        block_frames = self.block_frames
+        block_count = -(-frame_count // block_frames)
+
+        frame_power = np.einsum("ij,ij->i", chunk, chunk).astype(np.float64) / chunk.shape[1]
+        if self.power_history is None:
+            self.power_history = np.zeros(0, dtype=np.float64)
+        power = np.concatenate((self.power_history, frame_power))
+        cumulative_power = np.concatenate(([0.0], np.cumsum(power)))
+        self.power_history = power[-self.window_frames:]
+
+        # The envelope at each block end is the RMS of the attack window before it, shorter only at the stream start.
+        window_ends = len(power) - frame_count + np.minimum(
+            np.arange(1, block_count + 1) * block_frames, frame_count
+        )
+        window_starts = np.maximum(window_ends - self.window_frames, 0)
+        envelope = np.sqrt(
+            np.maximum(cumulative_power[window_ends] - cumulative_power[window_starts], 0.0)
+            / (window_ends - window_starts)
+        )
+
+        above_threshold = envelope > self.threshold
+        target_db = np.zeros(block_count, dtype=np.float64)
+        target_db[above_threshold] = (1.0 - 1.0 / self.ratio) * 20.0 * np.log10(envelope[above_threshold] / self.threshold)
+
+        attack_step = block_frames / self.attack_frames
+        release_step = block_frames / self.release_frames
+        attenuation_db = self.attenuation_db
+        block_end_db = []
+        for is_above, target in zip(above_threshold.tolist(), target_db.tolist()):
+            if is_above:
+                if attenuation_db <= target:
+                    attenuation_db = min(attenuation_db + target * attack_step, target)
+                else:
+                    attenuation_db = max(attenuation_db - target * release_step, target)
+            block_end_db.append(attenuation_db)
+
+        block_end_db = np.asarray(block_end_db, dtype=np.float64)
+        block_start_db = np.empty_like(block_end_db)
+        block_start_db[0] = self.attenuation_db
+        block_start_db[1:] = block_end_db[:-1]
+        self.attenuation_db = attenuation_db
+        return block_start_db, block_end_db
+
+    def block_gain(self, block_start_db, block_end_db, frame_count):
+        """
+        Expand block attenuations returned by measure into per-frame linear gains.
+
+        :return: numpy.ndarray of shape (frame_count,) with linear gains.
+        """
+        import numpy as np
+
+        block_frames = self.block_frames
+        # Within a block the attenuation moves linearly, as it does sample by sample in pydub.
+        ramp = np.arange(1, block_frames + 1, dtype=np.float64) / block_frames
+        frame_attenuation_db = block_start_db[:, None] + (block_end_db - block_start_db)[:, None] * ramp
+        gain = np.power(10.0, frame_attenuation_db.reshape(-1)[:frame_count] / -20.0)
+        return gain.astype(np.float32)
+
+
+def iter_basic_cleaning_chunks(samples, sample_rate, strategy_settings, chunk_frames=DEFAULT_CHUNK_FRAMES):
+    """
+    Run the basic cleaning chain (high-pass, low-pass, compression, normalization) over 16-bit PCM samples.
+
+    The samples are converted to float32, filtered and compressed one chunk at a time, so memory use does not grow
+    with the input length. Normalization needs the peak of the whole result, so it takes two passes over the input:
+    the first measures the peak and records the compressor attenuation of each block, the second filters the chunks
+    again, applies the recorded attenuation and yields them scaled. Settings use the same keys as the pydub chain.
+
+    :param samples: numpy.ndarray of int16 samples, shape (frames,) or (frames, channels). Memory maps are fine.
+    :param sample_rate: int, sample rate of the samples.
+    :param strategy_settings: dict, basic_strategy_settings.
+    :param chunk_frames: int, number of frames converted to float32 at a time.
+    :return: generator of numpy.ndarray int16 chunks, which concatenate to an array shaped like the input.
+    """
+    import numpy as np
+    from scipy import signal
+
+    if samples.shape[0] == 0:
+        return
+
+    frames = samples.reshape(samples.shape[0], -1)
+    sections = build_filter_sections(
+        sample_rate,
+        strategy_settings.get("high_pass_cutoff_hz"),
+        strategy_settings.get("low_pass_cutoff_hz"),
+    )
+    sos = np.asarray(sections, dtype=np.float32).reshape(-1, 6)
+
+    compressor = None
+    if strategy_settings.get("apply_dynamic_range_compression", True):
+        compressor = BlockCompressor(sample_rate)
+        chunk_frames = max(compressor.block_frames, chunk_frames // compressor.block_frames * compressor.block_frames)
+
+    def filtered_chunks():
+        filter_state = None
+        for start in range(0, frames.shape[0], chunk_frames):
+            chunk = frames[start:start + chunk_frames].astype(np.float32)
+            chunk /= INT16_SCALE
+            if len(sections):
+                if filter_state is None:
+                    filter_state = initial_filter_state(sections, chunk[0])
+                chunk, filter_state = signal.sosfilt(sos, chunk, axis=0, zi=filter_state)
+            yield chunk
+
+    def to_int16(chunk):
+        np.floor(chunk, out=chunk)
+        np.clip(chunk, -INT16_SCALE, INT16_SCALE - 1, out=chunk)
+        return chunk.astype(np.int16).reshape((chunk.shape[0],) + samples.shape[1:])
+
+    if not strategy_settings.get("apply_normalization", True):
+        for chunk in filtered_chunks():
+            if compressor is not None:
+                chunk *= compressor.process(chunk)[:, None]
+            chunk *= INT16_SCALE
+            yield to_int16(chunk)
+        return
+
+    # First pass: the peak, and the attenuation of each compressor block (one value per block, not per frame).
+    peak = 0.0
+    block_attenuations = []
+    for chunk in filtered_chunks():
+        if compressor is not None:
+            block_start_db, block_end_db = compressor.measure(chunk)
+            block_attenuations.append((block_start_db, block_end_db))
+            chunk *= compressor.block_gain(block_start_db, block_end_db, chunk.shape[0])[:, None]
+        peak = max(peak, float(np.abs(chunk).max()) * INT16_SCALE)
+
+    # Second pass: the filters are deterministic, so the chunks come out exactly as in the first pass.
+    for index, chunk in enumerate(filtered_chunks()):
+        if compressor is not None:
+            chunk *= compressor.block_gain(*block_attenuations[index], chunk.shape[0])[:, None]
+        chunk *= INT16_SCALE
+        if peak > 0:
+            chunk *= INT16_SCALE * 10 ** (-NORMALIZATION_HEADROOM_DB / 20.0) / peak
+        yield to_int16(chunk)
+
+
+def apply_basic_cleaning_chain(samples, sample_rate, strategy_settings, chunk_frames=DEFAULT_CHUNK_FRAMES):
+    """
+    Run the basic cleaning chain over 16-bit PCM samples and collect the result in one int16 array.
+
+    See iter_basic_cleaning_chunks, which streams the same result without holding all of it.
+
+    :return: numpy.ndarray of int16 samples with the same shape as the input.
+    """
+    import numpy as np
+
+    output = np.empty(samples.shape, dtype=np.int16)
+    position = 0
+    for chunk in iter_basic_cleaning_chunks(samples, sample_rate, strategy_settings, chunk_frames):
+        output[position:position + chunk.shape[0]] = chunk
+        position += chunk.shape[0]
+    return output
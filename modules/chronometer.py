@@ -59,7 +59,7 @@ class Chronometer:
         # Otherwise, calculate the duration between start and stop times.
         return self._end_time - self._start_time
 
-    def print_duration(self):
+    def print_duration(self, label="Total execution time"):
         """Print the duration in a human-readable format."""
-        logging.info(f"Total execution time: {seconds_to_formatted_string(self.get_duration())}")
+        logging.info(f"{label}: {seconds_to_formatted_string(self.get_duration())}")
 
@@ -1,17 +1,78 @@
 import argparse
 
-def execution_args():
-  parser = argparse.ArgumentParser(description="Tool for automatic generation of subtitles provided an audio/video input.")
-  parser.add_argument('-v', '--version', action='store_true', help="Prints the version of the tool and exits.")
-  parser.add_argument('-i', '--input', type=str, help="Input file path (supported audio file or video file).")
+def add_transcription_args(parser):
   parser.add_argument('-c', '--checkpoints', type=str, help="Checkpoints, either in comma-separated format hh:mm:ss (hours and minutes optional) or using pattern (ie 5s, 10m, 1h).")
+  parser.add_argument('--auto-checkpoints', type=str, nargs='?', const='5m', metavar='TARGET', help="Place checkpoints automatically in pauses near a target segment length given as a pattern (ie 30s, 5m; defaults to 5m), skipping long stretches without speech. Cannot be combined with --checkpoints or --segments.")
   parser.add_argument('-s', '--segments', type=str, help="Segments to process in start-end format (00:50-13:57) or using pattern (ie 5s, 10m, 1h).")
+  parser.add_argument('--long-form', action='store_true', help="Transcribe in overlapping 30 second windows, prompting each with the text before it and keeping every word spoken across a seam once.")
+  parser.add_argument('--skip-silence', action='store_true', help="Trim the processed segments down to their speech before transcription, skipping silent spans while keeping the original timestamps.")
   parser.add_argument('-l', '--language', type=str, help="Language of the audio.")
+  parser.add_argument('--model', type=str, help="Whisper model used for speech recognition (ie tiny, base, small, medium, large). Overrides the saved transcription settings.")
+  parser.add_argument('--device', type=str, help="Device used to run the speech recognition model (ie cpu, cuda, cuda:1). Defaults to CUDA when available, otherwise CPU.")
   parser.add_argument('--cleaning-mode', type=str, choices=['off', 'basic', 'speechbrain'], help="Optional audio cleaning mode to apply before transcription.")
+
+def add_runtime_args(parser):
+  parser.add_argument('--no-transcription-cache', action='store_true', help="Transcribe every segment again instead of reusing results cached by previous runs.")
+  parser.add_argument('--workers', type=int, default=1, help="Number of worker processes used to transcribe segments in parallel. Each worker loads its own copy of the speech recognition model.")
+  parser.add_argument('--workspace-root', type=str, help="Directory under which each run creates its own temporary workspace. Defaults to the configured root, a tmpfs mount with enough free space, or ./tmp/.")
+
+def validate_transcription_args(parser, args):
+  if args.auto_checkpoints and (args.checkpoints or args.segments):
+    parser.error("--auto-checkpoints cannot be combined with --checkpoints or --segments.")
+  if args.workers < 1:
+    parser.error("--workers must be a positive integer.")
+
+def execution_args():
+  parser = argparse.ArgumentParser(description="Tool for automatic generation of subtitles provided an audio/video input.")
+  parser.add_argument('-v', '--version', action='store_true', help="Prints the version of the tool and exits.")
+  parser.add_argument('-i', '--input', type=str, help="Input file path (supported audio file or video file).")
+  add_transcription_args(parser)
   parser.add_argument('--save-cleaning-mode', action='store_true', help="Persist the provided --cleaning-mode value as the new default for future runs.")
   parser.add_argument('-o', '--output', type=str, help="Output SRT file path (if no name is given and only a path, then a default name will be used). If not provided at all, then the output location will be the same one as the input.")
+  add_runtime_args(parser)
+  parser.add_argument('--segment-results-dir', type=str, help="Also checkpoint the speech recognition result of every segment to its own JSON file in this directory. Results are otherwise kept in memory only.")
   parser.add_argument('-m', '--merge', action='store_true', help='If defined, it includes the new generated subtitles into the existing SRT file defined in the output parameter (if provided).')
+  parser.add_argument('--resume', action='store_true', help="Continue an interrupted run from the journal kept next to the output, skipping the segments it already finished with the same input and settings.")
+  parser.add_argument('--metrics-out', type=str, metavar='PATH', help="Write a JSON report with the wall time, CPU time and peak memory of every stage of the run to this file.")
+  parser.add_argument('--metrics-trace', type=str, metavar='PATH', help="Write the stages of the run to this file in Chrome trace event format, for chrome://tracing, Perfetto or speedscope.")
   args = parser.parse_args()
   if args.save_cleaning_mode and not args.cleaning_mode:
     parser.error("--save-cleaning-mode requires --cleaning-mode.")
+  validate_transcription_args(parser, args)
+  return args
+
+def batch_execution_args():
+  parser = argparse.ArgumentParser(description="Generate subtitles for many audio/video inputs in one process, loading the speech recognition model once.")
+  inputs = parser.add_mutually_exclusive_group(required=True)
+  inputs.add_argument('--inputs', type=str, help="Directory or glob pattern (ie 'recordings/*.mp4') of the input files.")
+  inputs.add_argument('--manifest', type=str, help="JSONL file with one input per line: {\"input\": ..., \"output\": ..., \"language\": ..., \"segments\": ..., \"checkpoints\": ...}. Only input is required; other keys override the command line values.")
+  parser.add_argument('--output-dir', type=str, help="Directory for the generated SRT files of inputs without an explicit output. Defaults to each input's directory.")
+  parser.add_argument('--summary', type=str, default="batch-summary.json", help="Path of the JSON status summary written when the batch finishes.")
+  add_transcription_args(parser)
+  add_runtime_args(parser)
+  args = parser.parse_args()
+  validate_transcription_args(parser, args)
+  return args
+
+def serve_execution_args():
+  parser = argparse.ArgumentParser(description="Run a resident transcription service that keeps the models loaded and accepts subtitle jobs over a local HTTP API.")
+  parser.add_argument('--host', type=str, default="127.0.0.1", help="Address the HTTP API listens on. Defaults to 127.0.0.1 (local connections only).")
+  parser.add_argument('--port', type=int, default=8765, help="Port the HTTP API listens on.")
+  parser.add_argument('--socket', type=str, help="Serve the HTTP API on this Unix socket path instead of a TCP port.")
+  parser.add_argument('--job-workers', type=int, default=1, help="Number of jobs processed at the same time. Audio preparation runs concurrently; transcription and SpeechBrain enhancement run one job at a time.")
+  parser.add_argument('--max-queue-depth', type=int, default=16, help="Maximum number of jobs waiting to start. Submissions beyond it are rejected until the queue drains.")
+  parser.add_argument('--output-dir', type=str, help="Directory for the SRT files of jobs without an explicit output. Defaults to each input's directory.")
+  parser.add_argument('-l', '--language', type=str, help="Default language of jobs that do not set one.")
+  parser.add_argument('--model', type=str, help="Whisper model used for speech recognition (ie tiny, base, small, medium, large). Overrides the saved transcription settings.")
+  parser.add_argument('--device', type=str, help="Device used to run the speech recognition model (ie cpu, cuda, cuda:1). Defaults to CUDA when available, otherwise CPU.")
+  parser.add_argument('--cleaning-mode', type=str, choices=['off', 'basic', 'speechbrain'], help="Default audio cleaning mode of jobs that do not set one.")
+  add_runtime_args(parser)
+  args = parser.parse_args()
+  if args.job_workers < 1:
+    parser.error("--job-workers must be a positive integer.")
+  if args.max_queue_depth < 1:
+    parser.error("--max-queue-depth must be a positive integer.")
+  if args.workers != 1:
+    # Worker processes load their own model for every run, which would defeat the resident model of the service.
+    parser.error("--workers is not supported by the transcription service; use --job-workers to run jobs concurrently.")
   return args
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_file(file_path, chunk_size=HASH_CHUNK_SIZE):
+    """Return the SHA-256 hex digest of a file's content, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_key(*parts):
+    """Return a stable SHA-256 hex digest for JSON-serializable key parts (dict keys are sorted)."""
+    serialized_parts = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized_parts.encode("utf-8")).hexdigest()
+
+
+def link_or_copy_file(source_path, destination_path):
+    """Hard-link the source to the destination, copying it instead when linking is not possible."""
+    try:
+        os.link(source_path, destination_path)
+    except OSError:
+        shutil.copyfile(source_path, destination_path)
+
+
+class FileCache:
+    """Size-bounded directory of files addressed by hash keys, evicted least-recently-used first."""
+
+    def __init__(self, cache_dir, max_size_bytes):
+        if max_size_bytes < 0:
+            raise ValueError("File cache size limit cannot be negative.")
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+
+    def path_for(self, key, suffix=""):
+        return os.path.join(self.cache_dir, f"{key}{suffix}")
+
+    def lookup(self, key, suffix=""):
+        """
+        Return the cached file path for the key, or None on a miss.
+
+        A hit refreshes the entry's modification time, which is what eviction orders by.
+        """
+        entry_path = self.path_for(key, suffix)
+        try:
+            os.utime(entry_path)
+        except FileNotFoundError:
+            return None
+        return entry_path
+
+    def restore(self, key, destination_path, suffix=""):
+        """
+        Place the cached file for the key at the destination path.
+
+        :return: str, the destination path on a hit, or None on a miss.
+        """
+        entry_path = self.lookup(key, suffix)
+        if entry_path is None:
+            return None
+
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+        link_or_copy_file(entry_path, destination_path)
+        return destination_path
+
+    def store_file(self, key, source_path, suffix=""):
+        """Add a copy of the source file to the cache under the key, then evict down to the size limit."""
+        entry_path = self.path_for(key, suffix)
+        temporary_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        link_or_copy_file(source_path, temporary_path)
+        os.replace(temporary_path, entry_path)
+        self.evict()
+        return entry_path
+
+    def store_bytes(self, key, data, suffix=""):
+        """Add the given bytes to the cache under the key, then evict down to the size limit."""
+        entry_path = self.path_for(key, suffix)
+        temporary_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, entry_path)
+        self.evict()
+        return entry_path
+
+    def read_bytes(self, key, suffix=""):
+        """Return the cached bytes for the key, or None on a miss."""
+        entry_path = self.lookup(key, suffix)
+        if entry_path is None:
+            return None
+
+        try:
+            with open(entry_path, "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def entries(self):
+        """Return (path, size, modification time) for each cached file, least recently used first."""
+        entries = []
+        try:
+            directory_entries = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return entries
+
+        for entry in directory_entries:
+            if not entry.is_file(follow_symlinks=False) or entry.name.endswith(".tmp"):
+                continue
+            try:
+                stat_result = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            entries.append((entry.path, stat_result.st_size, stat_result.st_mtime))
+
+        entries.sort(key=lambda cache_entry: cache_entry[2])
+        return entries
+
+    def size(self):
+        return sum(entry_size for _, entry_size, _ in self.entries())
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits its size limit.
+
+        :return: list, the removed file paths.
+        """
+        removed_paths = []
+
+        with self._lock:
+            entries = self.entries()
+            total_size = sum(entry_size for _, entry_size, _ in entries)
+
+            for entry_path, entry_size, _ in entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                try:
+                    os.remove(entry_path)
+                except FileNotFoundError:
+                    pass
+                total_size -= entry_size
+                removed_paths.append(entry_path)
+
+        if removed_paths:
+            logging.info(f"Evicted {len(removed_paths)} entries from the cache at {self.cache_dir}.")
+
+        return removed_paths
@@ -1,9 +1,11 @@
-def format_ms_duration(ms, use_separator=False):
+def format_ms_duration(ms, use_separator=False, include_milliseconds=False):
     """
     Convert duration from milliseconds to a formatted string: "hh:mm:ss".
     
     :param ms: Duration in milliseconds.
     :type ms: int
+    :param include_milliseconds: Append the remaining milliseconds as ".mmm".
+    :type include_milliseconds: bool
     :return: Formatted duration.
     :rtype: str
     """
@@ -19,5 +21,7 @@ def format_ms_duration(ms, use_separator=False):
 
     # Format the result as "hh:mm:ss"
     formatted_duration = f"{hours:02}{separator}{minutes:02}{separator}{seconds:02}"
+    if include_milliseconds:
+        formatted_duration += f".{ms % 1000:03}"
 
     return formatted_duration
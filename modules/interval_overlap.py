@@ -0,0 +1,54 @@
+import bisect
+
+
+def find_kept_intervals(base_intervals, replacement_intervals):
+    """
+    Replay replacement intervals, in order, over a list of base intervals and report which intervals survive.
+
+    Every replacement removes the base intervals and the earlier replacements it overlaps, then takes their place.
+    Intervals overlap when each one starts before the other ends, so intervals that only touch are both kept.
+
+    Replacements are sorted by start once and indexed in a Fenwick tree holding the latest end among starts up to
+    each rank. Walking the replacements from last to first, an interval survives when no later replacement
+    starting before its end also ends after its start. This takes O((n + m) log m) instead of re-filtering the whole
+    list for every replacement.
+
+    :param base_intervals: list of (start, end) pairs of comparable values.
+    :param replacement_intervals: list of (start, end) pairs, in the order they are applied.
+    :return: tuple of two lists, the indexes of the kept base intervals and of the kept replacements, ascending.
+    """
+    replacement_count = len(replacement_intervals)
+    order = sorted(range(replacement_count), key=lambda index: replacement_intervals[index][0])
+    sorted_starts = [replacement_intervals[index][0] for index in order]
+    ranks = [0] * replacement_count
+    for rank, index in enumerate(order, start=1):
+        ranks[index] = rank
+
+    latest_ends = [None] * (replacement_count + 1)
+
+    def add(rank, end):
+        while rank <= replacement_count:
+            if latest_ends[rank] is None or latest_ends[rank] < end:
+                latest_ends[rank] = end
+            rank += rank & -rank
+
+    def overlaps_added(start, end):
+        # Only replacements starting strictly before this interval ends can overlap it.
+        rank = bisect.bisect_left(sorted_starts, end)
+        latest_end = None
+        while rank > 0:
+            if latest_ends[rank] is not None and (latest_end is None or latest_end < latest_ends[rank]):
+                latest_end = latest_ends[rank]
+            rank -= rank & -rank
+        return latest_end is not None and start < latest_end
+
+    kept_replacements = []
+    for index in range(replacement_count - 1, -1, -1):
+        start, end = replacement_intervals[index]
+        if not overlaps_added(start, end):
+            kept_replacements.append(index)
+        add(ranks[index], end)
+    kept_replacements.reverse()
+
+    kept_base = [index for index, (start, end) in enumerate(base_intervals) if not overlaps_added(start, end)]
+    return kept_base, kept_replacements
@@ -0,0 +1,99 @@
+from collections import deque
+
+from overlap_add import plan_overlap_chunks
+
+
+def plan_transcription_windows(segments, window_ms, overlap_ms):
+    """
+    Split the segments to transcribe into overlapping windows, each with the range of the timeline it is kept for.
+
+    Consecutive windows of a segment share overlap_ms of audio, and the seam between them is placed in the middle
+    of that overlap: words starting before it are taken from the earlier window, the others from the later one.
+    The kept ranges of a segment's windows tile the segment exactly.
+
+    :param segments: list of (start_ms, end_ms) ranges.
+    :return: list of (window_start_ms, window_end_ms, keep_start_ms, keep_end_ms) tuples, in segment order.
+    """
+    windows = []
+    for segment_start, segment_end in segments:
+        chunks = [
+            (segment_start + chunk_start, segment_start + chunk_end)
+            for chunk_start, chunk_end in plan_overlap_chunks(segment_end - segment_start, window_ms, overlap_ms)
+        ]
+        for index, (window_start, window_end) in enumerate(chunks):
+            keep_start = (window_start + chunks[index - 1][1]) // 2 if index > 0 else window_start
+            keep_end = (chunks[index + 1][0] + window_end) // 2 if index + 1 < len(chunks) else window_end
+            windows.append((window_start, window_end, keep_start, keep_end))
+    return windows
+
+
+def _shift_times(item, offset_seconds):
+    return dict(item, start=round(item["start"] - offset_seconds, 3), end=round(item["end"] - offset_seconds, 3))
+
+
+def reconcile_window_result(result, window_start_ms, window_end_ms, keep_start_ms, keep_end_ms):
+    """
+    Keep the part of a window's Whisper result that falls in the window's kept range.
+
+    Words are assigned by their start timestamp, so a word spoken across a seam is kept exactly once. Segments
+    losing some of their words are rebuilt from the remaining ones; segments without word timestamps are kept
+    when their midpoint is in range. The kept range is open-ended at the edges of the window, where no other
+    window competes for the words.
+
+    :param result: dict returned by whisper.transcribe for the window, with times relative to window_start_ms.
+    :return: dict like result, with times relative to keep_start_ms.
+    """
+    keep_from = (keep_start_ms - window_start_ms) / 1000 if keep_start_ms > window_start_ms else float("-inf")
+    keep_to = (keep_end_ms - window_start_ms) / 1000 if keep_end_ms < window_end_ms else float("inf")
+    offset_seconds = (keep_start_ms - window_start_ms) / 1000
+
+    kept_segments = []
+    for segment in result.get("segments", []):
+        words = segment.get("words")
+        if not words:
+            if keep_from <= (segment["start"] + segment["end"]) / 2 < keep_to:
+                kept_segments.append(_shift_times(segment, offset_seconds))
+            continue
+
+        kept_words = [word for word in words if keep_from <= word["start"] < keep_to]
+        if not kept_words:
+            continue
+        if len(kept_words) < len(words):
+            segment = dict(
+                segment,
+                text=" " + " ".join(word["text"].strip() for word in kept_words),
+                start=kept_words[0]["start"],
+                end=kept_words[-1]["end"],
+            )
+        segment = _shift_times(segment, offset_seconds)
+        segment["words"] = [_shift_times(word, offset_seconds) for word in kept_words]
+        kept_segments.append(segment)
+
+    return dict(result, text="".join(segment["text"] for segment in kept_segments), segments=kept_segments)
+
+
+class TranscriptContext:
+    """
+    The last words transcribed, used to prompt the next window with the text spoken right before its audio.
+
+    Only a bounded number of words is kept, so the context costs the same however long the input is.
+    """
+
+    def __init__(self, max_words):
+        self.max_words = max_words
+        # Room for the words of an overlap, which are kept but left out of the prompt of the next window.
+        self._words = deque(maxlen=max_words * 2)
+
+    def add_result(self, result, offset_ms):
+        """Add the words of a reconciled window result whose times are relative to offset_ms."""
+        for segment in result.get("segments", []):
+            words = segment.get("words") or [{"text": text, "end": segment["end"]} for text in segment["text"].split()]
+            for word in words:
+                text = word["text"].strip()
+                if text:
+                    self._words.append((offset_ms + round(word["end"] * 1000), text))
+
+    def build_prompt(self, before_ms):
+        """Return the last words that end by before_ms as one string, or None when there are none."""
+        words = [text for end_ms, text in self._words if end_ms <= before_ms][-self.max_words:]
+        return " ".join(words) if words else None
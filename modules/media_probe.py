@@ -0,0 +1,554 @@
+import logging
+import os
+import struct
+from collections import namedtuple
+
+from working_audio import WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, read_wav_header
+
+PROBE_HEADER_SIZE = 64 * 1024
+PROBE_TRAILER_SIZE = 64 * 1024
+MAX_MP4_MOOV_SIZE = 64 * 1024 * 1024
+
+WAV_CODECS = {
+    0x0006: "pcm_alaw",
+    0x0007: "pcm_mulaw",
+    0x0011: "adpcm_ima_wav",
+    0x0055: "mp3",
+    0x00FF: "aac",
+    0x2000: "ac3",
+}
+PCM_CODECS = {1: "pcm_u8", 2: "pcm_s16le", 3: "pcm_s24le", 4: "pcm_s32le"}
+FLOAT_CODECS = {4: "pcm_f32le", 8: "pcm_f64le"}
+
+CONTAINER_MIME_TYPES = {
+    ("wav", "audio"): "audio/x-wav",
+    ("mp3", "audio"): "audio/mpeg",
+    ("aac", "audio"): "audio/aac",
+    ("flac", "audio"): "audio/flac",
+    ("ogg", "audio"): "audio/ogg",
+    ("ogg", "video"): "video/ogg",
+    ("mp4", "audio"): "audio/mp4",
+    ("mp4", "video"): "video/mp4",
+    ("m4a", "audio"): "audio/mp4",
+    ("mov", "video"): "video/quicktime",
+    ("avi", "video"): "video/x-msvideo",
+    ("matroska", "audio"): "audio/x-matroska",
+    ("matroska", "video"): "video/x-matroska",
+    ("webm", "audio"): "audio/webm",
+    ("webm", "video"): "video/webm",
+}
+
+_MediaProbeFields = namedtuple(
+    "MediaProbe",
+    ["container", "media_type", "codecs", "duration_ms", "sample_rate", "channels", "mime_type"],
+)
+
+
+class MediaProbe(_MediaProbeFields):
+    """Container, codec hints and duration of a media file, as read from its header."""
+
+    @property
+    def is_video(self):
+        return self.media_type == "video"
+
+    @property
+    def is_audio(self):
+        return self.media_type == "audio"
+
+
+UNKNOWN_MEDIA_PROBE = MediaProbe(None, None, (), None, None, None, None)
+
+
+def _build_probe(container, media_type, codecs=(), duration_ms=None, sample_rate=None, channels=None):
+    return MediaProbe(
+        container,
+        media_type,
+        tuple(codecs),
+        int(duration_ms) if duration_ms is not None else None,
+        sample_rate,
+        channels,
+        CONTAINER_MIME_TYPES.get((container, media_type)),
+    )
+
+
+def _read_at(file, offset, size):
+    file.seek(offset)
+    return file.read(size)
+
+
+# --- RIFF (WAV, AVI) ---
+
+def _iter_riff_chunks(data, offset, end):
+    while offset + 8 <= end:
+        chunk_id = data[offset:offset + 4]
+        chunk_size = struct.unpack_from("<I", data, offset + 4)[0]
+        yield chunk_id, offset + 8, min(offset + 8 + chunk_size, end)
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+
+def _probe_wav(file_path):
+    header = read_wav_header(file_path)
+    if header.format_tag == WAVE_FORMAT_PCM:
+        codec = PCM_CODECS.get(header.sample_width, "pcm")
+    elif header.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+        codec = FLOAT_CODECS.get(header.sample_width, "pcm_float")
+    else:
+        codec = WAV_CODECS.get(header.format_tag, f"wav_format_0x{header.format_tag:04x}")
+
+    duration_ms = None
+    if header.format_tag in (WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT) and header.sample_rate:
+        duration_ms = header.frame_count * 1000 // header.sample_rate
+
+    return _build_probe("wav", "audio", (codec,), duration_ms, header.sample_rate, header.channels)
+
+
+def _probe_avi(data):
+    codecs = []
+    stream_types = set()
+    duration_ms = None
+    sample_rate = None
+    channels = None
+
+    for chunk_id, start, end in _iter_riff_chunks(data, 12, len(data)):
+        if chunk_id != b"LIST" or data[start:start + 4] != b"hdrl":
+            continue
+        for sub_id, sub_start, sub_end in _iter_riff_chunks(data, start + 4, end):
+            if sub_id == b"avih" and sub_end - sub_start >= 20:
+                microseconds_per_frame, total_frames = struct.unpack_from("<I12xI", data, sub_start)
+                duration_ms = microseconds_per_frame * total_frames // 1000
+            elif sub_id == b"LIST" and data[sub_start:sub_start + 4] == b"strl":
+                stream_type = None
+                for stream_id, stream_start, stream_end in _iter_riff_chunks(data, sub_start + 4, sub_end):
+                    if stream_id == b"strh":
+                        stream_type = data[stream_start:stream_start + 4]
+                        stream_types.add(stream_type)
+                    elif stream_id == b"strf" and stream_type == b"vids" and stream_end - stream_start >= 20:
+                        codecs.append(data[stream_start + 16:stream_start + 20].decode("latin-1").strip("\x00 ").lower())
+                    elif stream_id == b"strf" and stream_type == b"auds" and stream_end - stream_start >= 8:
+                        format_tag, channels, sample_rate = struct.unpack_from("<HHI", data, stream_start)
+                        codecs.append("pcm" if format_tag == WAVE_FORMAT_PCM else WAV_CODECS.get(format_tag, f"0x{format_tag:04x}"))
+        break
+
+    # AVI is a video container; it is only treated as audio when its stream headers list no video stream.
+    media_type = "audio" if b"auds" in stream_types and b"vids" not in stream_types else "video"
+    return _build_probe("avi", media_type, codecs, duration_ms, sample_rate, channels)
+
+
+# --- MPEG audio (MP3, ADTS AAC) ---
+
+MPEG_BITRATES_KBPS = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MPEG_SAMPLE_RATES = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000), 2.5: (11025, 12000, 8000)}
+MPEG_VERSIONS = {0: 2.5, 2: 2, 3: 1}
+MPEG_LAYERS = {1: 3, 2: 2, 3: 1}
+ADTS_SAMPLE_RATES = (96000, 88200, 64000, 48000, 44100, 32000, 24000, 22050, 16000, 12000, 11025, 8000, 7350)
+
+
+def _parse_mpeg_frame_header(frame):
+    if len(frame) < 4 or frame[0] != 0xFF or frame[1] & 0xE0 != 0xE0:
+        return None
+
+    version = MPEG_VERSIONS.get((frame[1] >> 3) & 0x03)
+    layer = MPEG_LAYERS.get((frame[1] >> 1) & 0x03)
+    bitrate_index = frame[2] >> 4
+    sample_rate_index = (frame[2] >> 2) & 0x03
+    if version is None or layer is None or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    bitrate_kbps = MPEG_BITRATES_KBPS[(1 if version == 1 else 2, layer)][bitrate_index]
+    sample_rate = MPEG_SAMPLE_RATES[version][sample_rate_index]
+    channels = 1 if frame[3] >> 6 == 3 else 2
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or version == 1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+
+    return version, layer, bitrate_kbps, sample_rate, channels, samples_per_frame
+
+
+def _probe_mpeg_audio(file, audio_offset, file_size):
+    frame = _read_at(file, audio_offset, 4096)
+    if len(frame) >= 4 and frame[0] == 0xFF and frame[1] & 0xF6 == 0xF0:
+        sample_rate_index = (frame[2] >> 2) & 0x0F
+        sample_rate = ADTS_SAMPLE_RATES[sample_rate_index] if sample_rate_index < len(ADTS_SAMPLE_RATES) else None
+        channels = ((frame[2] & 0x01) << 2) | (frame[3] >> 6)
+        return _build_probe("aac", "audio", ("aac",), None, sample_rate, channels or None)
+
+    frame_header = _parse_mpeg_frame_header(frame)
+    if frame_header is None:
+        return None
+
+    version, layer, bitrate_kbps, sample_rate, channels, samples_per_frame = frame_header
+    codec = {1: "mp1", 2: "mp2", 3: "mp3"}[layer]
+
+    # VBR files carry their frame count in a Xing/Info (or VBRI) header inside the first frame.
+    side_info_size = (32 if channels == 2 else 17) if version == 1 else (17 if channels == 2 else 9)
+    frame_count = None
+    xing_offset = 4 + side_info_size
+    if frame[xing_offset:xing_offset + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack_from(">I", frame, xing_offset + 4)[0]
+        if flags & 0x01:
+            frame_count = struct.unpack_from(">I", frame, xing_offset + 8)[0]
+    elif frame[36:40] == b"VBRI":
+        frame_count = struct.unpack_from(">I", frame, 50)[0]
+
+    if frame_count is not None:
+        duration_ms = frame_count * samples_per_frame * 1000 // sample_rate
+    else:
+        duration_ms = (file_size - audio_offset) * 8 // bitrate_kbps
+
+    return _build_probe("mp3", "audio", (codec,), duration_ms, sample_rate, channels)
+
+
+def _id3_tag_size(data):
+    flags = data[5]
+    size = 0
+    for byte in data[6:10]:
+        size = (size << 7) | (byte & 0x7F)
+    return 10 + size + (10 if flags & 0x10 else 0)
+
+
+# --- FLAC ---
+
+def _probe_flac(data, offset=0):
+    if data[offset + 4] & 0x7F != 0 or len(data) < offset + 26:
+        return _build_probe("flac", "audio", ("flac",))
+
+    stream_info = int.from_bytes(data[offset + 18:offset + 26], "big")
+    sample_rate = stream_info >> 44
+    channels = ((stream_info >> 41) & 0x07) + 1
+    total_samples = stream_info & 0xFFFFFFFFF
+    duration_ms = total_samples * 1000 // sample_rate if sample_rate and total_samples else None
+    return _build_probe("flac", "audio", ("flac",), duration_ms, sample_rate, channels)
+
+
+# --- MP4 / QuickTime ---
+
+def _iter_mp4_boxes(data, offset, end):
+    while offset + 8 <= end:
+        box_size, box_type = struct.unpack_from(">I4s", data, offset)
+        header_size = 8
+        if box_size == 1 and offset + 16 <= end:
+            box_size = struct.unpack_from(">Q", data, offset + 8)[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = end - offset
+        if box_size < header_size:
+            return
+        yield box_type, offset + header_size, min(offset + box_size, end)
+        offset += box_size
+
+
+def _find_mp4_box(data, start, end, path):
+    for box_type, box_start, box_end in _iter_mp4_boxes(data, start, end):
+        if box_type == path[0]:
+            if len(path) == 1:
+                return box_start, box_end
+            return _find_mp4_box(data, box_start, box_end, path[1:])
+    return None
+
+
+def _read_mp4_moov(file, file_size):
+    offset = 0
+    while offset + 8 <= file_size:
+        box_header = _read_at(file, offset, 16)
+        if len(box_header) < 8:
+            return None
+        box_size, box_type = struct.unpack_from(">I4s", box_header)
+        header_size = 8
+        if box_size == 1 and len(box_header) == 16:
+            box_size = struct.unpack_from(">Q", box_header, 8)[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = file_size - offset
+        if box_size < header_size:
+            return None
+        if box_type == b"moov":
+            if box_size > MAX_MP4_MOOV_SIZE:
+                return None
+            return _read_at(file, offset, box_size)
+        offset += box_size
+    return None
+
+
+def _probe_mp4(file, data, file_size):
+    major_brand = data[8:12]
+    if major_brand in (b"M4A ", b"M4B ", b"M4P "):
+        container, media_type = "m4a", "audio"
+    elif major_brand == b"qt  ":
+        container, media_type = "mov", "video"
+    else:
+        container, media_type = "mp4", "video"
+
+    moov = _read_mp4_moov(file, file_size)
+    if moov is None:
+        return _build_probe(container, media_type)
+
+    duration_ms = None
+    mvhd = _find_mp4_box(moov, 8, len(moov), (b"mvhd",))
+    if mvhd is not None:
+        start, _end = mvhd
+        if moov[start] == 1:
+            timescale, duration = struct.unpack_from(">IQ", moov, start + 20)
+        else:
+            timescale, duration = struct.unpack_from(">II", moov, start + 12)
+        if timescale:
+            duration_ms = duration * 1000 // timescale
+
+    codecs = []
+    handler_types = set()
+    sample_rate = None
+    channels = None
+    for box_type, trak_start, trak_end in _iter_mp4_boxes(moov, 8, len(moov)):
+        if box_type != b"trak":
+            continue
+        hdlr = _find_mp4_box(moov, trak_start, trak_end, (b"mdia", b"hdlr"))
+        handler_type = moov[hdlr[0] + 8:hdlr[0] + 12] if hdlr else None
+        handler_types.add(handler_type)
+        stsd = _find_mp4_box(moov, trak_start, trak_end, (b"mdia", b"minf", b"stbl", b"stsd"))
+        if stsd is None or handler_type not in (b"vide", b"soun"):
+            continue
+        entry_offset = stsd[0] + 8
+        if entry_offset + 8 > stsd[1]:
+            continue
+        codecs.append(moov[entry_offset + 4:entry_offset + 8].decode("latin-1").strip())
+        if handler_type == b"soun" and entry_offset + 36 <= stsd[1] and sample_rate is None:
+            channels, _sample_size = struct.unpack_from(">HH", moov, entry_offset + 24)
+            sample_rate = struct.unpack_from(">I", moov, entry_offset + 32)[0] >> 16
+
+    if b"vide" in handler_types:
+        media_type = "video"
+    elif b"soun" in handler_types:
+        media_type = "audio"
+
+    return _build_probe(container, media_type, codecs, duration_ms, sample_rate, channels)
+
+
+# --- Matroska / WebM ---
+
+EBML_HEADER_ID = 0x1A45DFA3
+EBML_DOCTYPE_ID = 0x4282
+MATROSKA_SEGMENT_ID = 0x18538067
+MATROSKA_INFO_ID = 0x1549A966
+MATROSKA_TIMECODE_SCALE_ID = 0x2AD7B1
+MATROSKA_DURATION_ID = 0x4489
+MATROSKA_TRACKS_ID = 0x1654AE6B
+MATROSKA_TRACK_ENTRY_ID = 0xAE
+MATROSKA_TRACK_TYPE_ID = 0x83
+MATROSKA_CODEC_ID = 0x86
+MATROSKA_AUDIO_ID = 0xE1
+MATROSKA_SAMPLING_FREQUENCY_ID = 0xB5
+MATROSKA_CHANNELS_ID = 0x9F
+MATROSKA_CLUSTER_ID = 0x1F43B675
+
+
+def _read_ebml_vint(data, offset, keep_marker):
+    first_byte = data[offset]
+    length = 1
+    while length <= 8 and not first_byte & (0x80 >> (length - 1)):
+        length += 1
+    if length > 8 or offset + length > len(data):
+        raise ValueError("Invalid EBML variable-length integer.")
+
+    value = first_byte if keep_marker else first_byte & (0xFF >> length)
+    for byte in data[offset + 1:offset + length]:
+        value = (value << 8) | byte
+    unknown_size = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, offset + length, unknown_size
+
+
+def _iter_ebml_elements(data, offset, end):
+    while offset < end:
+        element_id, offset, _ = _read_ebml_vint(data, offset, keep_marker=True)
+        element_size, offset, unknown_size = _read_ebml_vint(data, offset, keep_marker=False)
+        element_end = end if unknown_size else min(offset + element_size, end)
+        yield element_id, offset, element_end
+        offset = element_end
+
+
+def _ebml_uint(data, start, end):
+    return int.from_bytes(data[start:end], "big")
+
+
+def _ebml_float(data, start, end):
+    if end - start == 4:
+        return struct.unpack_from(">f", data, start)[0]
+    if end - start == 8:
+        return struct.unpack_from(">d", data, start)[0]
+    return None
+
+
+def _probe_matroska(data):
+    container = "matroska"
+    timecode_scale = 1000000
+    duration = None
+    codecs = []
+    track_types = set()
+    sample_rate = None
+    channels = None
+
+    try:
+        for element_id, start, end in _iter_ebml_elements(data, 0, len(data)):
+            if element_id == EBML_HEADER_ID:
+                for child_id, child_start, child_end in _iter_ebml_elements(data, start, end):
+                    if child_id == EBML_DOCTYPE_ID and data[child_start:child_end].rstrip(b"\x00") == b"webm":
+                        container = "webm"
+            elif element_id == MATROSKA_SEGMENT_ID:
+                for child_id, child_start, child_end in _iter_ebml_elements(data, start, end):
+                    if child_id == MATROSKA_CLUSTER_ID:
+                        break
+                    if child_id == MATROSKA_INFO_ID:
+                        for info_id, info_start, info_end in _iter_ebml_elements(data, child_start, child_end):
+                            if info_id == MATROSKA_TIMECODE_SCALE_ID:
+                                timecode_scale = _ebml_uint(data, info_start, info_end)
+                            elif info_id == MATROSKA_DURATION_ID:
+                                duration = _ebml_float(data, info_start, info_end)
+                    elif child_id == MATROSKA_TRACKS_ID:
+                        for track_id, track_start, track_end in _iter_ebml_elements(data, child_start, child_end):
+                            if track_id != MATROSKA_TRACK_ENTRY_ID:
+                                continue
+                            for field_id, field_start, field_end in _iter_ebml_elements(data, track_start, track_end):
+                                if field_id == MATROSKA_TRACK_TYPE_ID:
+                                    track_types.add(_ebml_uint(data, field_start, field_end))
+                                elif field_id == MATROSKA_CODEC_ID:
+                                    codecs.append(data[field_start:field_end].rstrip(b"\x00").decode("latin-1"))
+                                elif field_id == MATROSKA_AUDIO_ID and sample_rate is None:
+                                    for audio_id, audio_start, audio_end in _iter_ebml_elements(data, field_start, field_end):
+                                        if audio_id == MATROSKA_SAMPLING_FREQUENCY_ID:
+                                            sample_rate = int(_ebml_float(data, audio_start, audio_end) or 0) or None
+                                        elif audio_id == MATROSKA_CHANNELS_ID:
+                                            channels = _ebml_uint(data, audio_start, audio_end)
+    except (ValueError, IndexError, struct.error):
+        # The header window may cut an element short; keep whatever was parsed before it.
+        pass
+
+    media_type = "video" if 1 in track_types or any(codec.startswith("V_") for codec in codecs) else "audio"
+    duration_ms = duration * timecode_scale / 1000000 if duration is not None else None
+    return _build_probe(container, media_type, codecs, duration_ms, sample_rate, channels)
+
+
+# --- Ogg ---
+
+def _iter_ogg_pages(data, offset=0):
+    while True:
+        offset = data.find(b"OggS", offset)
+        if offset < 0 or offset + 27 > len(data):
+            return
+        header_type, granule_position, serial_number = struct.unpack_from("<BqI", data, offset + 5)
+        segment_count = data[offset + 26]
+        payload_start = offset + 27 + segment_count
+        payload_size = sum(data[offset + 27:payload_start])
+        yield header_type, granule_position, serial_number, data[payload_start:payload_start + payload_size]
+        offset = payload_start + payload_size
+
+
+def _probe_ogg(file, data, file_size):
+    codecs = []
+    media_type = "audio"
+    audio_serial = None
+    sample_rate = None
+    channels = None
+    granule_rate = None
+    pre_skip = 0
+
+    for header_type, _granule, serial_number, payload in _iter_ogg_pages(data):
+        if not header_type & 0x02:
+            break
+        if payload.startswith(b"\x01vorbis") and len(payload) >= 16:
+            channels, sample_rate = struct.unpack_from("<BI", payload, 11)
+            codecs.append("vorbis")
+            audio_serial, granule_rate = serial_number, sample_rate
+        elif payload.startswith(b"OpusHead") and len(payload) >= 16:
+            channels, pre_skip, sample_rate = struct.unpack_from("<BHI", payload, 9)
+            codecs.append("opus")
+            audio_serial, granule_rate = serial_number, 48000
+        elif payload.startswith(b"\x7fFLAC"):
+            codecs.append("flac")
+            stream_info = int.from_bytes(payload[27:35], "big") if len(payload) >= 35 else 0
+            sample_rate = (stream_info >> 44) or None
+            audio_serial, granule_rate = serial_number, sample_rate
+        elif payload.startswith(b"\x80theora"):
+            codecs.append("theora")
+            media_type = "video"
+
+    duration_ms = None
+    if audio_serial is not None and granule_rate:
+        trailer = _read_at(file, max(0, file_size - PROBE_TRAILER_SIZE), PROBE_TRAILER_SIZE)
+        last_granule = None
+        for _header_type, granule_position, serial_number, _payload in _iter_ogg_pages(trailer):
+            if serial_number == audio_serial and granule_position >= 0:
+                last_granule = granule_position
+        if last_granule is not None:
+            duration_ms = max(0, last_granule - pre_skip) * 1000 // granule_rate
+
+    return _build_probe("ogg", media_type, codecs, duration_ms, sample_rate, channels)
+
+
+def sniff_media(file_path):
+    """
+    Identify a media file from its container header without decoding it.
+
+    :param file_path: str, path to the media file.
+    :return: MediaProbe, or None when the container is not recognized.
+    """
+    file_size = os.path.getsize(file_path)
+    with open(file_path, "rb") as file:
+        data = file.read(PROBE_HEADER_SIZE)
+
+        if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+            return _probe_wav(file_path)
+        if data[:4] == b"RIFF" and data[8:12] == b"AVI ":
+            return _probe_avi(data)
+        if data[4:8] == b"ftyp":
+            return _probe_mp4(file, data, file_size)
+        if data[:4] == b"\x1a\x45\xdf\xa3":
+            return _probe_matroska(data)
+        if data[:4] == b"OggS":
+            return _probe_ogg(file, data, file_size)
+        if data[:4] == b"fLaC":
+            return _probe_flac(data)
+        if data[:3] == b"ID3" and len(data) >= 10:
+            audio_offset = _id3_tag_size(data)
+            if _read_at(file, audio_offset, 4) == b"fLaC":
+                return _probe_flac(_read_at(file, audio_offset, 64))
+            return _probe_mpeg_audio(file, audio_offset, file_size)
+        if data[:1] == b"\xff":
+            return _probe_mpeg_audio(file, 0, file_size)
+
+    return None
+
+
+def probe_media(file_path, mime_type_detector=None):
+    """
+    Probe a media file once, reading only its container header.
+
+    Recognized containers are RIFF/WAVE, RIFF/AVI, MP3 (with or without ID3), ADTS AAC, MP4/M4A/MOV, Matroska/WebM,
+    Ogg and FLAC. Anything else is classified by MIME type through the optional detector (libmagic).
+
+    :param file_path: str, path to the media file.
+    :param mime_type_detector: callable taking the file path and returning a MIME type, used as the fallback.
+    :return: MediaProbe, with None fields for anything that could not be determined.
+    """
+    try:
+        media_probe = sniff_media(file_path)
+    except (OSError, ValueError, IndexError, struct.error) as e:
+        logging.debug(f"Could not read the media header of {file_path}: {e}")
+        media_probe = None
+
+    if media_probe is not None:
+        return media_probe
+
+    if mime_type_detector is None:
+        return UNKNOWN_MEDIA_PROBE
+
+    mime_type = mime_type_detector(file_path)
+    media_type = mime_type.split("/", 1)[0] if mime_type else None
+    return MediaProbe(None, media_type if media_type in ("audio", "video") else None, (), None, None, None, mime_type)
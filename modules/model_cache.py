@@ -0,0 +1,51 @@
+import threading
+from collections import OrderedDict
+
+
+class ModelCache:
+    """Least-recently-used cache of loaded models, keyed by (name, device, precision)."""
+
+    def __init__(self, max_entries=2):
+        if max_entries < 1:
+            raise ValueError("Model cache must hold at least one model.")
+        self.max_entries = max_entries
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader):
+        """
+        Return the cached model for the key, loading it with the given callable on a cache miss.
+
+        :param key: tuple, (model name, device, precision).
+        :param loader: callable without arguments that loads the model.
+        :return: tuple, (model, True if it was loaded by this call or False if it was reused).
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key], False
+
+            # Loading under the lock keeps concurrent callers from loading the same model twice.
+            model = loader()
+            self._models[key] = model
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+            return model, True
+
+    def clear(self):
+        """Drop every cached model."""
+        with self._lock:
+            self._models.clear()
+
+    def keys(self):
+        """Return the cached keys, from least to most recently used."""
+        with self._lock:
+            return list(self._models.keys())
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._models
+
+    def __len__(self):
+        with self._lock:
+            return len(self._models)
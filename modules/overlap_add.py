@@ -0,0 +1,70 @@
+def plan_overlap_chunks(frame_count, chunk_frames, overlap_frames):
+    """
+    Split a frame range into fixed-size windows that overlap their predecessor by a fixed number of frames.
+
+    :param frame_count: int, total number of frames.
+    :param chunk_frames: int, frames per window; the last window may be shorter.
+    :param overlap_frames: int, frames shared by consecutive windows, smaller than chunk_frames.
+    :return: list of (start, end) frame ranges.
+    """
+    if chunk_frames <= 0:
+        raise ValueError("Chunk size must be positive.")
+    if overlap_frames < 0 or overlap_frames >= chunk_frames:
+        raise ValueError("Chunk overlap must be non-negative and smaller than the chunk size.")
+
+    chunks = []
+    hop_frames = chunk_frames - overlap_frames
+    start = 0
+    while start < frame_count:
+        end = min(start + chunk_frames, frame_count)
+        chunks.append((start, end))
+        if end == frame_count:
+            break
+        start += hop_frames
+    return chunks
+
+
+class OverlapAddWriter:
+    """
+    Joins processed overlapping windows with linear crossfades and hands finished frames to a sink.
+
+    Only the overlapping tail of the previous window is held back, so memory stays bounded by one window however
+    long the stream is.
+    """
+
+    def __init__(self, write_frames, overlap_frames):
+        self.write_frames = write_frames
+        self.overlap_frames = overlap_frames
+        self.pending_tail = None
+        self.frames_written = 0
+
+    def add(self, window):
+        """
+        Add the next processed window, which must overlap the previous one by overlap_frames.
+
+        :param window: numpy.ndarray of float samples.
+        """
+        import numpy as np
+
+        window = np.asarray(window, dtype=np.float32)
+        if self.pending_tail is not None and len(self.pending_tail):
+            overlap = min(len(self.pending_tail), len(window))
+            fade_in = (np.arange(1, overlap + 1, dtype=np.float32) / (overlap + 1))
+            window = window.copy()
+            window[:overlap] = self.pending_tail[:overlap] * (1.0 - fade_in) + window[:overlap] * fade_in
+
+        tail_start = max(len(window) - self.overlap_frames, 0)
+        self._write(window[:tail_start])
+        self.pending_tail = window[tail_start:].copy()
+
+    def finish(self):
+        """Write the held-back tail of the last window and return the number of frames written."""
+        if self.pending_tail is not None:
+            self._write(self.pending_tail)
+            self.pending_tail = None
+        return self.frames_written
+
+    def _write(self, frames):
+        if len(frames):
+            self.write_frames(frames)
+            self.frames_written += len(frames)
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+
+from stage_metrics import stage
+
+RUN_JOURNAL_SUFFIX = ".journal.jsonl"
+
+
+def build_run_journal_path(output_path):
+    """Return the path of the run journal kept next to an output file."""
+    return output_path + RUN_JOURNAL_SUFFIX
+
+
+def read_run_journal(path, config_hash):
+    """
+    Read the segment results recorded in a run journal with the given settings.
+
+    Lines that cannot be parsed, like the last one of a run killed while writing it, are skipped, and so are the
+    records of runs with other settings.
+
+    :return: dict mapping (start_ms, end_ms) to the segment's Whisper result.
+    """
+    completed = {}
+    unreadable_records = 0
+    stale_records = 0
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            for line in file:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    segment_range = (int(record["start_ms"]), int(record["end_ms"]))
+                    result = record["result"]
+                except (ValueError, KeyError, TypeError):
+                    unreadable_records += 1
+                    continue
+                if record.get("config") != config_hash:
+                    stale_records += 1
+                    continue
+                completed[segment_range] = result
+    except FileNotFoundError:
+        return completed
+
+    if unreadable_records:
+        logging.warning(f"Skipped {unreadable_records} unreadable record(s) in the run journal {path}.")
+    if stale_records:
+        logging.warning(f"Ignored {stale_records} record(s) of the run journal {path} made with a different input or settings.")
+    return completed
+
+
+class RunJournal:
+    """
+    Append-only JSONL file recording every segment a run has finished transcribing.
+
+    Each line holds the segment range in milliseconds, the hash of the input and settings it was transcribed with
+    and the segment's Whisper result. Lines are flushed and synced as they are written, so a run that crashes or is
+    killed keeps every finished segment and a resumed run can skip them.
+    """
+
+    def __init__(self, path, config_hash, resume=False):
+        """
+        :param path: str, journal file path.
+        :param config_hash: str identifying the input and the transcription settings.
+        :param resume: bool, reuse the records of a previous run with the same config_hash instead of starting over.
+        """
+        self.path = path
+        self.config_hash = config_hash
+        self.completed = read_run_journal(path, config_hash) if resume else {}
+
+        # The reused records are written to a fresh file, so no torn line of a killed run precedes the new ones.
+        partial_path = path + ".partial"
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as file:
+                for (start_ms, end_ms), result in sorted(self.completed.items()):
+                    file.write(self._format_record(start_ms, end_ms, result))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(partial_path, path)
+            self._file = open(path, 'a', encoding='utf-8')
+        except OSError as e:
+            raise RuntimeError(f"Could not open the run journal {path}. Original error: {e}") from e
+
+        if self.completed:
+            logging.info(f"Resuming from {len(self.completed)} segment(s) recorded in the run journal {path}.")
+        elif resume:
+            logging.info(f"No finished segments to resume in {path}; starting from the first segment.")
+
+    def _format_record(self, start_ms, end_ms, result):
+        record = {"start_ms": start_ms, "end_ms": end_ms, "config": self.config_hash, "result": result}
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def lookup(self, start_ms, end_ms):
+        """Return the recorded result of a segment, or None when it was not finished yet."""
+        return self.completed.get((start_ms, end_ms))
+
+    def record(self, start_ms, end_ms, result):
+        """Durably append a finished segment to the journal."""
+        if (start_ms, end_ms) in self.completed:
+            return
+        with stage("journal_write"):
+            self._file.write(self._format_record(start_ms, end_ms, result))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.completed[(start_ms, end_ms)] = result
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def remove_run_journal(path):
+    """Remove the journal of a run that completed, so a later --resume starts over."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logging.warning(f"Could not remove the run journal {path}.", exc_info=True)
@@ -0,0 +1,183 @@
+import contextlib
+import datetime
+import json
+import logging
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as unknown.
+    resource = None
+
+METRICS_REPORT_VERSION = 1
+
+# Recorder of the current run, or None while stage metrics are disabled.
+active_recorder = None
+
+
+def read_peak_rss_bytes():
+    """Return the peak resident set size of this process so far, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def bytes_to_mb(byte_count):
+    return round(byte_count / (1024 * 1024), 2) if byte_count is not None else None
+
+
+class StageRecorder:
+    """
+    Collect the nested stage spans of one run.
+
+    Every span keeps its wall time, the CPU time of this process while it was open and the peak RSS of the process
+    when it closed, along with how much that peak grew during the span. Spans nest per thread, so stages run on a
+    background thread get their own stack.
+    """
+
+    def __init__(self):
+        self.spans = []
+        self._started_at = datetime.datetime.now(datetime.timezone.utc)
+        self._origin = time.perf_counter()
+        self._origin_cpu = time.process_time()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        stack = self._stack()
+        path = "/".join([open_span["name"] for open_span in stack] + [name])
+        record = {
+            "name": name,
+            "path": path,
+            "depth": len(stack),
+            "thread": threading.get_ident(),
+            "attributes": attributes,
+        }
+        stack.append(record)
+        start_rss = read_peak_rss_bytes()
+        start_cpu = time.process_time()
+        start = time.perf_counter()
+        try:
+            yield record["attributes"]
+        finally:
+            end = time.perf_counter()
+            end_cpu = time.process_time()
+            end_rss = read_peak_rss_bytes()
+            stack.pop()
+            record.update(
+                start_seconds=round(start - self._origin, 6),
+                wall_seconds=round(end - start, 6),
+                cpu_seconds=round(end_cpu - start_cpu, 6),
+                peak_rss_mb=bytes_to_mb(end_rss),
+                peak_rss_growth_mb=bytes_to_mb(end_rss - start_rss) if end_rss is not None else None,
+            )
+            with self._lock:
+                self.spans.append(record)
+
+    def build_report(self):
+        """
+        Build the JSON run report.
+
+        :return: dict with the run totals, every span in start order and a summary per stage path.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_seconds"])
+
+        summary = {}
+        for span in spans:
+            stage_summary = summary.setdefault(span["path"], {"count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": None})
+            stage_summary["count"] += 1
+            stage_summary["wall_seconds"] = round(stage_summary["wall_seconds"] + span["wall_seconds"], 6)
+            stage_summary["cpu_seconds"] = round(stage_summary["cpu_seconds"] + span["cpu_seconds"], 6)
+            if span["peak_rss_mb"] is not None:
+                stage_summary["peak_rss_mb"] = max(stage_summary["peak_rss_mb"] or 0, span["peak_rss_mb"])
+
+        return {
+            "version": METRICS_REPORT_VERSION,
+            "started_at": self._started_at.isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._origin, 6),
+            "cpu_seconds": round(time.process_time() - self._origin_cpu, 6),
+            "peak_rss_mb": bytes_to_mb(read_peak_rss_bytes()),
+            "stages": [{key: value for key, value in span.items() if key != "thread"} for span in spans],
+            "summary": summary,
+        }
+
+    def build_chrome_trace(self, process_id=1):
+        """
+        Build the spans as Chrome trace events, for chrome://tracing, Perfetto or speedscope.
+
+        :return: dict with one complete ("X") event per span, timed in microseconds.
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_seconds"])
+
+        thread_ids = {}
+        events = []
+        for span in spans:
+            thread_id = thread_ids.setdefault(span["thread"], len(thread_ids) + 1)
+            events.append(
+                {
+                    "name": span["name"],
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": round(span["start_seconds"] * 1_000_000),
+                    "dur": round(span["wall_seconds"] * 1_000_000),
+                    "pid": process_id,
+                    "tid": thread_id,
+                    "args": dict(span["attributes"], cpu_seconds=span["cpu_seconds"], peak_rss_mb=span["peak_rss_mb"]),
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def stage(name, **attributes):
+    """
+    Context manager timing one stage of the run, nested in the stage that is open on the same thread.
+
+    It does nothing while stage metrics are disabled. The attributes are stored with the span; the context value is
+    the attribute dict, so a stage can add details it only learns while running.
+    """
+    recorder = active_recorder
+    if recorder is None:
+        return contextlib.nullcontext({})
+    return recorder.span(name, **attributes)
+
+
+def start_stage_metrics():
+    """Start recording stage spans for this process and return the recorder."""
+    global active_recorder
+    active_recorder = StageRecorder()
+    return active_recorder
+
+
+def stop_stage_metrics():
+    """Stop recording stage spans and return the recorder of the run, or None when none was started."""
+    global active_recorder
+    recorder, active_recorder = active_recorder, None
+    return recorder
+
+
+def write_json_file(path, content):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(content, file, indent=2)
+
+
+def write_stage_metrics(recorder, report_path=None, trace_path=None):
+    """Write the run report and the Chrome trace of a recorder to the requested paths."""
+    if report_path:
+        write_json_file(report_path, recorder.build_report())
+        logging.info(f"Wrote stage metrics to {report_path}")
+    if trace_path:
+        write_json_file(trace_path, recorder.build_chrome_trace())
+        logging.info(f"Wrote stage trace to {trace_path}")
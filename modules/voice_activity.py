@@ -0,0 +1,251 @@
+import bisect
+import math
+
+DEFAULT_FRAME_MS = 20
+# Pauses shorter than this belong to the surrounding speech, so stop consonants and breaths never end a region.
+DEFAULT_MIN_SILENCE_MS = 300
+DEFAULT_MIN_SPEECH_MS = 100
+DEFAULT_SPEECH_PAD_MS = 200
+# Non-speech stretches at least this long are left out of the segments entirely.
+DEFAULT_SKIP_SILENCE_MS = 2000
+SILENCE_FLOOR_DB = -50.0
+NOISE_FLOOR_PERCENTILE = 10
+NOISE_FLOOR_MARGIN_DB = 12.0
+SPEECH_LEVEL_PERCENTILE = 95
+SPEECH_LEVEL_RANGE_DB = 25.0
+LEVEL_CHUNK_FRAMES = 1 << 14
+
+
+def get_voice_activity_settings():
+    """Return the thresholds that decide which audio counts as speech, for keys of results that depend on them."""
+    return {
+        "min_silence_ms": DEFAULT_MIN_SILENCE_MS,
+        "min_speech_ms": DEFAULT_MIN_SPEECH_MS,
+        "speech_pad_ms": DEFAULT_SPEECH_PAD_MS,
+        "skip_silence_ms": DEFAULT_SKIP_SILENCE_MS,
+        "silence_floor_db": SILENCE_FLOOR_DB,
+        "noise_floor_percentile": NOISE_FLOOR_PERCENTILE,
+        "noise_floor_margin_db": NOISE_FLOOR_MARGIN_DB,
+        "speech_level_percentile": SPEECH_LEVEL_PERCENTILE,
+        "speech_level_range_db": SPEECH_LEVEL_RANGE_DB,
+    }
+
+
+def compute_frame_levels(samples, sample_rate, frame_ms=DEFAULT_FRAME_MS):
+    """
+    Return the RMS level of consecutive fixed-size frames in dB relative to full scale.
+
+    :param samples: numpy.ndarray of int16 samples or float samples in [-1, 1]. Memory maps are read in chunks.
+    :param sample_rate: int, sample rate of the samples.
+    :param frame_ms: int, frame length in milliseconds; a trailing partial frame is measured on its own.
+    :return: numpy.ndarray of float64 levels, one per frame.
+    """
+    import numpy as np
+
+    frame_size = max(1, sample_rate * frame_ms // 1000)
+    frame_count = -(-len(samples) // frame_size)
+    scale = 32768.0 if samples.dtype.kind == "i" else 1.0
+    levels = np.empty(frame_count, dtype=np.float64)
+
+    chunk_size = LEVEL_CHUNK_FRAMES * frame_size
+    for chunk_start in range(0, len(samples), chunk_size):
+        chunk = np.asarray(samples[chunk_start:chunk_start + chunk_size], dtype=np.float64) / scale
+        chunk_frame_count = -(-len(chunk) // frame_size)
+        padded = np.zeros(chunk_frame_count * frame_size, dtype=np.float64)
+        padded[:len(chunk)] = chunk
+        frame_lengths = np.full(chunk_frame_count, frame_size, dtype=np.float64)
+        frame_lengths[-1] = len(chunk) - (chunk_frame_count - 1) * frame_size
+
+        power = np.square(padded).reshape(chunk_frame_count, frame_size).sum(axis=1) / frame_lengths
+        first_frame = chunk_start // frame_size
+        levels[first_frame:first_frame + chunk_frame_count] = 10.0 * np.log10(np.maximum(power, 1e-12))
+
+    return levels
+
+
+def estimate_speech_threshold(frame_levels_db):
+    """
+    Pick the level separating speech from background for a recording.
+
+    The threshold sits a margin above the noise floor, but never more than a fixed range below the speech level,
+    so recordings without any pauses keep their quieter words, and never below the absolute silence floor.
+    """
+    import numpy as np
+
+    if len(frame_levels_db) == 0:
+        return SILENCE_FLOOR_DB
+
+    noise_floor_db = float(np.percentile(frame_levels_db, NOISE_FLOOR_PERCENTILE))
+    speech_level_db = float(np.percentile(frame_levels_db, SPEECH_LEVEL_PERCENTILE))
+    return max(SILENCE_FLOOR_DB, min(noise_floor_db + NOISE_FLOOR_MARGIN_DB, speech_level_db - SPEECH_LEVEL_RANGE_DB))
+
+
+def find_runs(mask):
+    """Return the (start, end) index ranges where a boolean array is true."""
+    import numpy as np
+
+    edges = np.diff(np.concatenate(([0], np.asarray(mask, dtype=np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+
+def detect_speech_frames(
+    frame_levels_db,
+    threshold_db=None,
+    frame_ms=DEFAULT_FRAME_MS,
+    min_silence_ms=DEFAULT_MIN_SILENCE_MS,
+    min_speech_ms=DEFAULT_MIN_SPEECH_MS,
+):
+    """
+    Mark the frames that hold speech.
+
+    Frames above the threshold are speech; pauses shorter than min_silence_ms are filled in and bursts shorter than
+    min_speech_ms are dropped.
+
+    :return: numpy.ndarray of bool, one per frame.
+    """
+    import numpy as np
+
+    if threshold_db is None:
+        threshold_db = estimate_speech_threshold(frame_levels_db)
+
+    speech_mask = np.asarray(frame_levels_db) > threshold_db
+    min_silence_frames = math.ceil(min_silence_ms / frame_ms)
+    min_speech_frames = math.ceil(min_speech_ms / frame_ms)
+
+    runs = find_runs(speech_mask)
+    for (_, previous_end), (next_start, _) in zip(runs, runs[1:]):
+        if next_start - previous_end < min_silence_frames:
+            speech_mask[previous_end:next_start] = True
+
+    for start, end in find_runs(speech_mask):
+        if end - start < min_speech_frames:
+            speech_mask[start:end] = False
+
+    return speech_mask
+
+
+def find_speech_regions(speech_mask, frame_ms, total_duration_ms, speech_pad_ms=DEFAULT_SPEECH_PAD_MS):
+    """
+    Convert a speech mask into padded speech regions in milliseconds, merging regions that the padding joins.
+
+    :return: list of (start_ms, end_ms) tuples.
+    """
+    regions = []
+    for start_frame, end_frame in find_runs(speech_mask):
+        start_ms = max(0, start_frame * frame_ms - speech_pad_ms)
+        end_ms = min(total_duration_ms, end_frame * frame_ms + speech_pad_ms)
+        if regions and start_ms <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end_ms))
+        else:
+            regions.append((start_ms, end_ms))
+    return regions
+
+
+def choose_split_boundary(speech_mask, frame_levels_db, frame_ms, candidates, target_ms):
+    """
+    Choose where to split a long stretch of speech among candidate boundaries in milliseconds.
+
+    Boundaries that fall in a pause are preferred, closest to the target first; otherwise the quietest one is used.
+    """
+    def frame_at(boundary_ms):
+        return min(max(boundary_ms // frame_ms, 0), len(frame_levels_db) - 1)
+
+    silent_candidates = [
+        candidate for candidate in candidates
+        if not speech_mask[frame_at(candidate - frame_ms)] and not speech_mask[frame_at(candidate)]
+    ]
+    if silent_candidates:
+        return min(silent_candidates, key=lambda candidate: abs(candidate - target_ms))
+
+    return min(
+        candidates,
+        key=lambda candidate: (
+            max(frame_levels_db[frame_at(candidate - frame_ms)], frame_levels_db[frame_at(candidate)]),
+            abs(candidate - target_ms),
+        ),
+    )
+
+
+def plan_speech_segments(
+    speech_mask,
+    frame_levels_db,
+    frame_ms,
+    total_duration_ms,
+    target_segment_ms,
+    skip_silence_ms=DEFAULT_SKIP_SILENCE_MS,
+    speech_pad_ms=DEFAULT_SPEECH_PAD_MS,
+    boundary_ms=1000,
+):
+    """
+    Group speech into segments close to a target length, leaving long non-speech stretches out.
+
+    Segment edges are aligned to multiples of boundary_ms. Stretches of speech longer than one and a half targets
+    are split at an aligned boundary between half a target and one and a half targets from the segment start,
+    inside a pause whenever one is available.
+
+    :return: list of (start_ms, end_ms) tuples in order.
+    """
+    regions = find_speech_regions(speech_mask, frame_ms, total_duration_ms, speech_pad_ms)
+
+    islands = []
+    for start_ms, end_ms in regions:
+        start_ms = start_ms // boundary_ms * boundary_ms
+        end_ms = min(total_duration_ms, -(-end_ms // boundary_ms) * boundary_ms)
+        if islands and start_ms - islands[-1][1] < skip_silence_ms:
+            islands[-1] = (islands[-1][0], max(islands[-1][1], end_ms))
+        else:
+            islands.append((start_ms, end_ms))
+
+    segments = []
+    max_segment_ms = target_segment_ms * 3 // 2
+    for island_start, island_end in islands:
+        segment_start = island_start
+        while island_end - segment_start > max_segment_ms:
+            first_candidate = -(-(segment_start + target_segment_ms // 2) // boundary_ms) * boundary_ms
+            last_candidate = min(segment_start + max_segment_ms, island_end - boundary_ms)
+            candidates = list(range(max(first_candidate, segment_start + boundary_ms), last_candidate + 1, boundary_ms))
+            if not candidates:
+                break
+            boundary = choose_split_boundary(
+                speech_mask, frame_levels_db, frame_ms, candidates, segment_start + target_segment_ms
+            )
+            segments.append((segment_start, boundary))
+            segment_start = boundary
+        segments.append((segment_start, island_end))
+
+    return segments
+
+
+def trim_segments_to_speech(
+    segments,
+    speech_regions,
+    skip_silence_ms=DEFAULT_SKIP_SILENCE_MS,
+    boundary_ms=1000,
+):
+    """
+    Trim each segment down to the speech it contains, splitting it where it holds long non-speech stretches.
+
+    The pieces keep their absolute positions, so results transcribed from them stay on the original timeline.
+    Piece edges are widened to multiples of boundary_ms without leaving the segment they came from.
+
+    :param segments: list of (start_ms, end_ms) tuples.
+    :param speech_regions: list of ordered, non-overlapping (start_ms, end_ms) speech regions.
+    :return: list of (start_ms, end_ms) tuples.
+    """
+    region_ends = [end_ms for _, end_ms in speech_regions]
+    trimmed_segments = []
+
+    for segment_start, segment_end in segments:
+        pieces = []
+        for region_start, region_end in speech_regions[bisect.bisect_right(region_ends, segment_start):]:
+            if region_start >= segment_end:
+                break
+            start_ms = max(segment_start, region_start // boundary_ms * boundary_ms)
+            end_ms = min(segment_end, -(-region_end // boundary_ms) * boundary_ms)
+            if pieces and start_ms - pieces[-1][1] < skip_silence_ms:
+                pieces[-1] = (pieces[-1][0], max(pieces[-1][1], end_ms))
+            elif start_ms < end_ms:
+                pieces.append((start_ms, end_ms))
+        trimmed_segments.extend(pieces)
+
+    return trimmed_segments
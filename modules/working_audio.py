@@ -0,0 +1,127 @@
+import os
+import struct
+from collections import namedtuple
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+WavHeader = namedtuple(
+    "WavHeader",
+    ["format_tag", "channels", "sample_rate", "sample_width", "data_offset", "frame_count"],
+)
+
+
+def read_wav_header(file_path):
+    """
+    Read the format and data layout of a RIFF/WAVE file without decoding its samples.
+
+    :param file_path: str, path to the WAV file.
+    :return: WavHeader with the sample format and the byte offset of the sample data.
+    """
+    file_size = os.path.getsize(file_path)
+
+    with open(file_path, "rb") as file:
+        riff_header = file.read(12)
+        if len(riff_header) < 12 or riff_header[:4] != b"RIFF" or riff_header[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {file_path}")
+
+        fmt = None
+        while True:
+            chunk_header = file.read(8)
+            if len(chunk_header) < 8:
+                raise ValueError(f"WAV file has no data chunk: {file_path}")
+
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                chunk_data = file.read(chunk_size)
+                format_tag, channels, sample_rate, _byte_rate, block_align, bits_per_sample = struct.unpack("<HHIIHH", chunk_data[:16])
+                if format_tag == WAVE_FORMAT_EXTENSIBLE and chunk_size >= 26:
+                    # The actual format tag is the first field of the extensible sub-format GUID.
+                    format_tag = struct.unpack("<H", chunk_data[24:26])[0]
+                fmt = (format_tag, channels, sample_rate, bits_per_sample // 8, block_align)
+                if chunk_size & 1:
+                    file.seek(1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError(f"WAV file has a data chunk before its format chunk: {file_path}")
+
+                format_tag, channels, sample_rate, sample_width, block_align = fmt
+                data_offset = file.tell()
+                # Streaming writers may leave a placeholder size behind, so never trust it past the end of the file.
+                data_size = min(chunk_size, file_size - data_offset)
+                return WavHeader(format_tag, channels, sample_rate, sample_width, data_offset, data_size // block_align)
+            else:
+                file.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def is_working_audio_format(header, sample_rate=None):
+    """Return True if the WAV header describes 16-bit PCM mono audio (at the given sample rate, if any)."""
+    return (
+        header.format_tag == WAVE_FORMAT_PCM
+        and header.sample_width == 2
+        and header.channels == 1
+        and (sample_rate is None or header.sample_rate == sample_rate)
+    )
+
+
+class WorkingAudio:
+    """
+    Memory-mapped view over a 16-bit PCM mono working WAV file.
+
+    Only the WAV header is read when the view is created. Samples are paged in from disk on demand,
+    so the working audio is never held in memory as a whole.
+    """
+
+    def __init__(self, file_path, header=None):
+        header = header or read_wav_header(file_path)
+        if not is_working_audio_format(header):
+            raise ValueError(f"Working audio must be 16-bit PCM mono WAV: {file_path}")
+
+        self.path = file_path
+        self.sample_rate = header.sample_rate
+        self.frame_count = header.frame_count
+        self._data_offset = header.data_offset
+        self._samples = None
+
+    @property
+    def samples(self):
+        """Return the int16 samples as a read-only memory map."""
+        if self._samples is None:
+            import numpy as np
+
+            if self.frame_count == 0:
+                self._samples = np.zeros(0, dtype=np.int16)
+            else:
+                self._samples = np.memmap(self.path, dtype="<i2", mode="r", offset=self._data_offset, shape=(self.frame_count,))
+        return self._samples
+
+    def ms_to_frame(self, ms):
+        return min(ms * self.sample_rate // 1000, self.frame_count)
+
+    def get_samples(self, start_ms, end_ms):
+        """Return a view over the samples between two offsets in milliseconds."""
+        return self.samples[self.ms_to_frame(start_ms):self.ms_to_frame(end_ms)]
+
+    def to_audio_segment(self):
+        """Decode the whole working file into a pydub AudioSegment, for stages that still need one."""
+        from pydub import AudioSegment
+
+        return AudioSegment.from_file(self.path, format="wav")
+
+    def __getitem__(self, item):
+        # Mirrors AudioSegment slicing in milliseconds, decoding only the requested range.
+        from pydub import AudioSegment
+
+        start_ms = item.start or 0
+        end_ms = len(self) if item.stop is None else item.stop
+        return AudioSegment(
+            data=self.get_samples(start_ms, end_ms).tobytes(),
+            sample_width=2,
+            frame_rate=self.sample_rate,
+            channels=1,
+        )
+
+    def __len__(self):
+        # Duration in milliseconds, like pydub's AudioSegment.
+        return self.frame_count * 1000 // self.sample_rate
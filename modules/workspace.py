@@ -0,0 +1,95 @@
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+TMPFS_FILESYSTEM_TYPES = ("tmpfs", "ramfs")
+DEFAULT_TMPFS_DIR = "/dev/shm"
+TMPFS_WORKSPACE_DIRNAME = "subtitles-generator"
+WORKSPACE_PREFIX = "run_"
+PROC_MOUNTS_FILE = "/proc/mounts"
+
+
+def find_filesystem_type(path, mounts_file=PROC_MOUNTS_FILE):
+    """
+    Return the type of the filesystem holding a path, as listed in /proc/mounts, or None when it is unknown.
+
+    :param path: str, an existing path.
+    :param mounts_file: str, mount table to read; platforms without one always return None.
+    """
+    try:
+        with open(mounts_file, 'r', encoding='utf-8') as file:
+            mounts = [line.split() for line in file]
+    except OSError:
+        return None
+
+    real_path = os.path.realpath(path)
+    best_mount_point, filesystem_type = "", None
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        # Spaces and other special characters in mount points are octal-escaped.
+        mount_point = re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), fields[1])
+        is_parent = real_path == mount_point or real_path.startswith(mount_point.rstrip(os.sep) + os.sep)
+        if is_parent and len(mount_point) >= len(best_mount_point):
+            best_mount_point, filesystem_type = mount_point, fields[2]
+    return filesystem_type
+
+
+def is_tmpfs(path, mounts_file=PROC_MOUNTS_FILE):
+    return find_filesystem_type(path, mounts_file) in TMPFS_FILESYSTEM_TYPES
+
+
+def resolve_workspace_root(
+    configured_root=None,
+    default_root="./tmp/",
+    prefer_tmpfs=True,
+    tmpfs_min_free_bytes=0,
+    tmpfs_dir=DEFAULT_TMPFS_DIR,
+    mounts_file=PROC_MOUNTS_FILE,
+):
+    """
+    Choose the directory under which run workspaces are created.
+
+    An explicitly configured root always wins. Otherwise a memory-backed filesystem is used when one is mounted at
+    tmpfs_dir with at least tmpfs_min_free_bytes available, so intermediate audio never touches the disk, and
+    default_root is used when it is not.
+
+    :return: str, the workspace root.
+    """
+    if configured_root:
+        return configured_root
+
+    if prefer_tmpfs and os.path.isdir(tmpfs_dir) and os.access(tmpfs_dir, os.W_OK) and is_tmpfs(tmpfs_dir, mounts_file):
+        free_bytes = shutil.disk_usage(tmpfs_dir).free
+        if free_bytes >= tmpfs_min_free_bytes:
+            return os.path.join(tmpfs_dir, TMPFS_WORKSPACE_DIRNAME)
+        logging.info(
+            f"Not using {tmpfs_dir} for the run workspace: {free_bytes // (1024 * 1024)} MB free, "
+            f"{tmpfs_min_free_bytes // (1024 * 1024)} MB required."
+        )
+
+    return default_root
+
+
+def create_workspace(root):
+    """
+    Create a new, uniquely named workspace directory for one run under the root.
+
+    :return: str, the workspace path, ending with a path separator like config.TMP_DIR.
+    """
+    try:
+        os.makedirs(root, exist_ok=True)
+        workspace = tempfile.mkdtemp(prefix=f"{WORKSPACE_PREFIX}{os.getpid()}_", dir=root)
+    except OSError as e:
+        raise RuntimeError(f"Could not create a run workspace under {root}. Original error: {e}") from e
+
+    logging.info(f"Using run workspace {workspace}{' (tmpfs)' if is_tmpfs(workspace) else ''}")
+    return os.path.join(workspace, "")
+
+
+def remove_workspace(workspace):
+    """Remove one run workspace, leaving the root and the workspaces of other runs in place."""
+    if workspace and os.path.isdir(workspace):
+        shutil.rmtree(workspace, ignore_errors=True)
@@ -1,15 +1,54 @@
+import concurrent.futures
 import datetime
+import functools
+import hashlib
 import importlib
+import importlib.metadata
 import json
 import logging
+import multiprocessing
 import os
 import re
+import shutil
+import subprocess
 import sys
-import magic
-import whisper_timestamped as whisper
-from pydub import AudioSegment, effects as audio_effects
+import tempfile
+import threading
+import time
+import wave
 from config import AUDIO_CACHE_DIR, TMP_DIR
-from modules import convert_hhmmss_to_ms, format_ms_duration, load_cleaning_settings, save_cleaning_settings
+from modules import (
+    Chronometer,
+    FileCache,
+    ModelCache,
+    OverlapAddWriter,
+    RunJournal,
+    TranscriptContext,
+    WorkingAudio,
+    compute_frame_levels,
+    convert_hhmmss_to_ms,
+    create_workspace,
+    detect_speech_frames,
+    find_speech_regions,
+    format_ms_duration,
+    get_voice_activity_settings,
+    hash_file,
+    hash_key,
+    is_working_audio_format,
+    iter_basic_cleaning_chunks,
+    load_app_config,
+    load_cleaning_settings,
+    plan_overlap_chunks,
+    plan_speech_segments,
+    plan_transcription_windows,
+    probe_media,
+    read_wav_header,
+    reconcile_window_result,
+    resolve_workspace_root,
+    save_cleaning_settings,
+    stage,
+    trim_segments_to_speech,
+)
 
 
 MOVIEPY_INSTALL_HINT = (
@@ -62,6 +101,32 @@ def get_moviepy_audio_file_clip():
 
     return AudioFileClip
 
+# Heavy dependencies, imported on first use so that loading this module (for --version, argument errors or the GUI)
+# does not pay for torch, Whisper, pydub and libmagic. Maps the module attribute to (module name, attribute or None).
+LAZY_IMPORTS = {
+    "magic": ("magic", None),
+    "whisper": ("whisper_timestamped", None),
+    "AudioSegment": ("pydub", "AudioSegment"),
+    "audio_effects": ("pydub.effects", None),
+}
+
+
+def lazy_import(name):
+    """Return one of the LAZY_IMPORTS, importing it and keeping it as a module attribute the first time."""
+    module_globals = globals()
+    if name not in module_globals:
+        module_name, attribute = LAZY_IMPORTS[name]
+        value = importlib.import_module(module_name)
+        module_globals[name] = getattr(value, attribute) if attribute else value
+    return module_globals[name]
+
+
+def __getattr__(name):
+    # Module attribute access (process_input.whisper) imports the dependency like the old top-level import did.
+    if name in LAZY_IMPORTS:
+        return lazy_import(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def format_missing_module_error(error):
     missing_name = getattr(error, "name", None)
     if missing_name:
@@ -74,11 +139,41 @@ logging.basicConfig(level=logging.INFO)
 
 WORKING_AUDIO_FORMAT = "wav"
 WORKING_AUDIO_FILENAME = f"working_input_audio.{WORKING_AUDIO_FORMAT}"
+TRANSCRIPTION_SAMPLE_RATE = 16000
+INGESTION_CHUNK_SIZE = 1024 * 1024
+TRANSCRIPTION_SAMPLES_FILENAME = "transcription_samples.npy"
+DEFAULT_SPEECH_TO_TEXT_MODEL_NAME = "tiny"
+# Options passed to whisper.transcribe besides the language; they are part of the transcription cache key.
+TRANSCRIPTION_DECODE_OPTIONS = {}
+TRANSCRIPTION_CACHE_DIRNAME = "transcription_results"
+DEFAULT_TRANSCRIPTION_CACHE_MAX_SIZE_MB = 256
+TRANSCRIPTION_CACHE_SUFFIX = ".json"
+SPEECH_TO_TEXT_MODEL_CACHE_SIZE = 2
+# Long-form windows match the 30 s Whisper decodes at once; the overlap gives words cut at a seam a second chance.
+LONG_FORM_WINDOW_MS = 30000
+LONG_FORM_OVERLAP_MS = 5000
+# Whisper prompts are capped at 223 tokens, which these words stay well below.
+LONG_FORM_PROMPT_MAX_WORDS = 50
+
+# Loaded speech recognition models are kept for the lifetime of the process, so repeated runs reuse them.
+speech_to_text_model_cache = ModelCache(max_entries=SPEECH_TO_TEXT_MODEL_CACHE_SIZE)
+speechbrain_enhancer_cache = ModelCache(max_entries=1)
+# The cached enhancer is shared by every thread of the process, and SpeechBrain models are not safe to run concurrently.
+speechbrain_enhancement_lock = threading.Lock()
 SUPPORTED_CLEANING_MODES = ("off", "basic", "speechbrain")
 DEFAULT_CLEANING_MODE = "off"
 PREPROCESSED_AUDIO_FILENAME_TEMPLATE = f"working_input_audio_{{}}.{WORKING_AUDIO_FORMAT}"
 SPEECHBRAIN_MODEL_SOURCE = "speechbrain/metricgan-plus-voicebank"
 SPEECHBRAIN_MODEL_CACHE_DIRNAME = "speechbrain_metricgan_plus_voicebank"
+DEFAULT_SPEECHBRAIN_CHUNK_SECONDS = 30
+DEFAULT_SPEECHBRAIN_OVERLAP_SECONDS = 1
+VOICE_ACTIVITY_FRAME_MS = 20
+WORKING_AUDIO_CACHE_DIRNAME = "working_audio"
+DEFAULT_AUDIO_CACHE_MAX_SIZE_MB = 2048
+# A tmpfs workspace holds the working and cleaned audio in memory, so it is only used with this much room left.
+DEFAULT_TMPFS_MIN_FREE_MB = 2048
+# Bump when the working or cleaned audio produced for the same input and settings changes.
+AUDIO_CACHE_FORMAT_VERSION = 1
 SPEECHBRAIN_INSTALL_HINT = (
     "Install them with install_speechbrain_dependencies.cmd on Windows or install_speechbrain_dependencies.sh on Linux/macOS."
 )
@@ -89,7 +184,7 @@ def validate_audio_file(file_path):
         sys.exit(1)
 
     try:
-        audio = AudioSegment.from_file(file_path)
+        audio = lazy_import("AudioSegment").from_file(file_path)
         return audio
     except Exception as e:
         logging.error(
@@ -98,11 +193,35 @@ def validate_audio_file(file_path):
         )
         sys.exit(1)
 
-def is_video_file(file_path):
+@functools.lru_cache(maxsize=None)
+def get_mime_detector(magic_class):
+    # One libmagic handle per process instead of one per probed file.
+    return magic_class(mime=True)
+
+def detect_mime_type(file_path):
+    return get_mime_detector(lazy_import("magic").Magic).from_file(file_path)
+
+def probe_input_media(file_path):
+    """
+    Probe the container header of the input once; libmagic is only consulted for unrecognized containers.
+
+    :param file_path: str, path to the input file.
+    :return: MediaProbe with the container, media type, codec hints and duration of the input.
+    """
+    media_probe = probe_media(file_path, mime_type_detector=detect_mime_type)
+    duration = format_ms_duration(media_probe.duration_ms, use_separator=True) if media_probe.duration_ms is not None else "unknown"
+    logging.info(
+        f"Probed {file_path}: {media_probe.media_type or 'unknown'} in {media_probe.container or media_probe.mime_type or 'unknown'} container, "
+        f"codecs {', '.join(media_probe.codecs) or 'unknown'}, duration {duration}."
+    )
+    return media_probe
+
+def is_video_file(file_path, media_probe=None):
     """
     Check if the given file is a video by examining its content.
 
     :param file_path: str, path to the file.
+    :param media_probe: MediaProbe, result of a previous probe of the file, to avoid probing it again.
     :return: bool, True if file is a video, False otherwise.
     """
 
@@ -111,15 +230,10 @@ def is_video_file(file_path):
         logging.error(f"File does not exist: {file_path}")
         return False
 
-    # Use python-magic to determine the file's mime type.
-    mime = magic.Magic(mime=True)
-    mime_type = mime.from_file(file_path)
+    if media_probe is None:
+        media_probe = probe_input_media(file_path)
 
-    # Check the mime type for 'video'.
-    if mime_type.startswith('video'):
-        return True
-    else:
-        return False
+    return media_probe.is_video
 
 def extract_audio(video_path, audio_path):
     """
@@ -147,17 +261,185 @@ def normalize_audio_file(input_audio, output_path, output_format=WORKING_AUDIO_F
     logging.info(f"Normalized audio saved to {output_path}")
     return output_path
 
-def prepare_working_audio(input_path):
-    os.makedirs(TMP_DIR, exist_ok=True)
-    working_audio_path = os.path.join(TMP_DIR, WORKING_AUDIO_FILENAME)
+def find_ffmpeg():
+    return shutil.which("ffmpeg")
 
-    if is_video_file(input_path):
-        extract_audio(input_path, working_audio_path)
-        return working_audio_path, validate_audio_file(working_audio_path)
+def stream_audio_to_working_wav(input_path, output_path, ffmpeg_path=None):
+    """
+    Decode any input readable by FFmpeg into a 16 kHz mono 16-bit PCM WAV file in a single streaming pass.
+
+    The decoded PCM is read from FFmpeg in fixed-size chunks and appended to the output file, so memory usage
+    does not depend on the input duration.
+
+    Only the first audio stream is mapped, so video, subtitle and data streams are never decoded.
+
+    :param input_path: str, path to the audio (or video) input.
+    :param output_path: str, path of the working WAV file to write.
+    :param ffmpeg_path: str, FFmpeg executable, or None to look it up on PATH.
+    :return: int, number of PCM bytes written.
+    """
+    command = [
+        ffmpeg_path or find_ffmpeg() or "ffmpeg",
+        "-nostdin",
+        "-v", "error",
+        "-i", input_path,
+        "-map", "0:a:0",
+        "-vn", "-sn", "-dn",
+        "-ac", "1",
+        "-ar", str(TRANSCRIPTION_SAMPLE_RATE),
+        "-f", "s16le",
+        "-acodec", "pcm_s16le",
+        "-",
+    ]
+
+    bytes_written = 0
+    start_time = time.perf_counter()
+    # FFmpeg diagnostics go to a temporary file so a chatty stderr can never block the PCM pipe.
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file)
+        try:
+            with wave.open(output_path, "wb") as output_file:
+                output_file.setnchannels(1)
+                output_file.setsampwidth(2)
+                output_file.setframerate(TRANSCRIPTION_SAMPLE_RATE)
+                while True:
+                    chunk = process.stdout.read(INGESTION_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    output_file.writeframesraw(chunk)
+                    bytes_written += len(chunk)
+        except BaseException:
+            process.kill()
+            raise
+        finally:
+            process.stdout.close()
+            return_code = process.wait()
+
+        if return_code != 0:
+            stderr_file.seek(0)
+            error_output = stderr_file.read().decode("utf-8", errors="replace").strip()
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise RuntimeError(f"FFmpeg could not decode '{input_path}' (exit code {return_code}): {error_output}")
+
+    log_stream_throughput(input_path, bytes_written, time.perf_counter() - start_time)
+    return bytes_written
+
+def format_byte_rate(byte_count, seconds):
+    return f"{byte_count / max(seconds, 1e-9) / (1024 * 1024):.1f} MiB/s"
+
+def log_stream_throughput(input_path, bytes_written, elapsed_seconds):
+    try:
+        input_size = os.path.getsize(input_path)
+    except OSError:
+        input_size = 0
+
+    logging.info(
+        f"FFmpeg streamed {input_size} input bytes into {bytes_written} PCM bytes in {elapsed_seconds:.2f}s "
+        f"(input {format_byte_rate(input_size, elapsed_seconds)}, output {format_byte_rate(bytes_written, elapsed_seconds)})."
+    )
+
+def extract_video_audio(video_path, working_audio_path):
+    """
+    Extract the first audio stream of a video straight into the 16 kHz mono working WAV with FFmpeg.
 
-    input_audio = validate_audio_file(input_path)
-    normalize_audio_file(input_audio, working_audio_path)
-    return working_audio_path, validate_audio_file(working_audio_path)
+    Unlike extract_audio, no intermediate audio file is encoded and the video stream is never decoded.
+
+    :param video_path: str, path to the video file.
+    :param working_audio_path: str, path of the working WAV file to write.
+    :return: WorkingAudio, memory-mapped view of the extracted audio.
+    """
+    logging.info(f"Extracting the first audio stream of {video_path} with FFmpeg...")
+    try:
+        stream_audio_to_working_wav(video_path, working_audio_path)
+    except Exception as e:
+        logging.error(f"Could not extract audio from '{video_path}'. Please ensure the video has an audio stream. Error: {e}")
+        raise
+
+    working_audio = open_working_audio(working_audio_path)
+    logging.info(f"Audio extracted and saved to {working_audio_path} ({format_ms_duration(len(working_audio), use_separator=True)})")
+    return working_audio
+
+def open_working_audio(file_path):
+    """
+    Open a working WAV file as a memory-mapped WorkingAudio view, reading only its header.
+
+    Files that are not already 16 kHz mono 16-bit PCM (for example the float output of an enhancement model)
+    are converted in place with a streaming FFmpeg pass first.
+    """
+    header = read_wav_header(file_path)
+    if is_working_audio_format(header, TRANSCRIPTION_SAMPLE_RATE):
+        return WorkingAudio(file_path, header)
+
+    logging.info(f"Converting {file_path} to the 16 kHz mono working format...")
+    converted_path = f"{file_path}.converted.{WORKING_AUDIO_FORMAT}"
+    stream_audio_to_working_wav(file_path, converted_path)
+    os.replace(converted_path, file_path)
+    return WorkingAudio(file_path)
+
+def load_working_audio(file_path, streaming=False):
+    # Streaming runs reopen intermediate files as memory-mapped views instead of decoding them with pydub.
+    if streaming:
+        return open_working_audio(file_path)
+    return validate_audio_file(file_path)
+
+def ingest_working_audio(source_path, working_audio_path):
+    logging.info(f"Streaming {source_path} into the {WORKING_AUDIO_FORMAT.upper()} working file...")
+    try:
+        stream_audio_to_working_wav(source_path, working_audio_path)
+    except Exception as e:
+        logging.error(f"Could not decode audio file '{source_path}'. Please ensure it's a valid audio file. Error: {e}")
+        raise
+    working_audio = open_working_audio(working_audio_path)
+    logging.info(f"Working audio saved to {working_audio_path} ({format_ms_duration(len(working_audio), use_separator=True)})")
+    return working_audio
+
+def is_working_audio_probe(media_probe):
+    return (
+        media_probe is not None
+        and media_probe.container == "wav"
+        and media_probe.codecs == ("pcm_s16le",)
+        and media_probe.sample_rate == TRANSCRIPTION_SAMPLE_RATE
+        and media_probe.channels == 1
+    )
+
+def prepare_working_audio(input_path, media_probe=None, work_dir=None):
+    work_dir = work_dir or TMP_DIR
+    os.makedirs(work_dir, exist_ok=True)
+    working_audio_path = os.path.join(work_dir, WORKING_AUDIO_FILENAME)
+    streaming = find_ffmpeg() is not None
+
+    if streaming and not os.path.exists(input_path):
+        logging.error(f"The provided audio file does not exist: {input_path}")
+        sys.exit(1)
+
+    if streaming and is_working_audio_probe(media_probe):
+        # Inputs already in the working format are copied as-is instead of being decoded again.
+        logging.info(f"{input_path} is already 16 kHz mono PCM, copying it as the working audio...")
+        with stage("normalization", method="copy"):
+            shutil.copyfile(input_path, working_audio_path)
+            return working_audio_path, open_working_audio(working_audio_path)
+
+    is_video = media_probe.is_video if media_probe is not None else is_video_file(input_path)
+    if is_video:
+        if streaming:
+            with stage("extraction", method="ffmpeg"):
+                return working_audio_path, extract_video_audio(input_path, working_audio_path)
+
+        # Without FFmpeg on PATH, fall back to extracting the audio through MoviePy.
+        with stage("extraction", method="moviepy"):
+            extract_audio(input_path, working_audio_path)
+            return working_audio_path, validate_audio_file(working_audio_path)
+
+    if streaming:
+        with stage("normalization", method="ffmpeg"):
+            return working_audio_path, ingest_working_audio(input_path, working_audio_path)
+
+    # Without FFmpeg on PATH, fall back to decoding the input with pydub.
+    with stage("normalization", method="pydub"):
+        input_audio = validate_audio_file(input_path)
+        normalize_audio_file(input_audio, working_audio_path)
+        return working_audio_path, validate_audio_file(working_audio_path)
 
 def get_saved_cleaning_mode():
     persisted_settings = load_cleaning_settings()
@@ -201,11 +483,52 @@ def persist_default_cleaning_mode(cleaning_mode, already_resolved=False):
     logging.info(f"Saved default cleaning mode '{resolved_mode}'.")
     return resolved_mode
 
+def write_working_audio_chunks(chunks, output_path, sample_rate):
+    with wave.open(output_path, "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(sample_rate)
+        for chunk in chunks:
+            output_file.writeframesraw(chunk.astype("<i2", copy=False).tobytes())
+    return output_path
+
+def write_working_audio_samples(samples, output_path, sample_rate):
+    # Written in slices so the int16 bytes are never duplicated for the whole file at once.
+    return write_working_audio_chunks(
+        (samples[start:start + INGESTION_CHUNK_SIZE] for start in range(0, len(samples), INGESTION_CHUNK_SIZE)),
+        output_path,
+        sample_rate,
+    )
+
+def apply_vectorized_basic_audio_cleaning(working_audio, output_path, strategy_settings):
+    """
+    Run the basic cleaning chain over the memory-mapped working samples with NumPy and SciPy.
+
+    :param working_audio: WorkingAudio, the 16-bit PCM mono working audio.
+    :param output_path: str, path of the cleaned working WAV file.
+    :param strategy_settings: dict, basic_strategy_settings.
+    :return: str, the output path.
+    :raises ImportError: if NumPy or SciPy is not installed.
+    """
+    # The cleaned chunks go straight to the file, so no full-length copy of the audio is held in memory.
+    cleaned_chunks = iter_basic_cleaning_chunks(working_audio.samples, working_audio.sample_rate, strategy_settings)
+    write_working_audio_chunks(cleaned_chunks, output_path, working_audio.sample_rate)
+    logging.info(f"Basic cleaned audio saved to {output_path}")
+    return output_path
+
 def apply_basic_audio_cleaning(input_audio, output_path, output_format=WORKING_AUDIO_FORMAT, strategy_settings=None):
     if strategy_settings is None:
         strategy_settings = load_cleaning_settings().get("basic_strategy_settings", {})
 
     logging.info("Applying basic audio cleaning...")
+    if isinstance(input_audio, WorkingAudio):
+        try:
+            return apply_vectorized_basic_audio_cleaning(input_audio, output_path, strategy_settings)
+        except ImportError as e:
+            logging.warning(f"Vectorized basic cleaning is unavailable, falling back to pydub effects. Original error: {e}")
+            input_audio = input_audio.to_audio_segment()
+
+    audio_effects = lazy_import("audio_effects")
     cleaned_audio = input_audio
 
     high_pass_cutoff_hz = strategy_settings.get("high_pass_cutoff_hz")
@@ -269,12 +592,96 @@ def load_speechbrain_enhancer(strategy_settings=None):
             f"and the cache directory is writable. Original error: {e}"
         ) from e
 
-def apply_speechbrain_audio_cleaning(input_path, output_path):
+def get_speechbrain_enhancer(strategy_settings=None):
+    """Return the SpeechBrain enhancer, loading it only the first time it is needed in this process."""
+    if strategy_settings is None:
+        strategy_settings = get_cleaning_strategy_settings("speechbrain")
+
+    cache_key = (strategy_settings.get("model_source") or SPEECHBRAIN_MODEL_SOURCE,)
+    enhancer, loaded = speechbrain_enhancer_cache.get_or_load(cache_key, load_speechbrain_enhancer)
+    if not loaded:
+        logging.info("Reusing cached SpeechBrain enhancer.")
+    return enhancer
+
+def configure_torch_threads(torch_module, thread_count=None):
+    """
+    Set the intra-op (and, when still possible, inter-op) thread counts used by PyTorch.
+
+    :param thread_count: int or None, number of threads; None uses one per available CPU.
+    :return: int, the intra-op thread count in effect.
+    """
+    thread_count = thread_count or os.cpu_count() or 1
+    torch_module.set_num_threads(thread_count)
+    try:
+        torch_module.set_num_interop_threads(thread_count)
+    except RuntimeError:
+        # PyTorch only accepts this before its first parallel operation in the process.
+        pass
+    return thread_count
+
+def enhance_working_audio_in_chunks(enhancer, working_audio, output_path, strategy_settings):
+    """
+    Enhance a memory-mapped working audio in fixed-size overlapping windows, crossfading them into the output WAV.
+
+    Only one window is held in memory at a time, whatever the length of the recording.
+
+    :param enhancer: SpeechBrain SpectralMaskEnhancement instance.
+    :param working_audio: WorkingAudio, the 16 kHz mono working audio.
+    :param output_path: str, path of the enhanced working WAV file.
+    :param strategy_settings: dict, speechbrain_strategy_settings.
+    :return: str, the output path.
+    """
+    import numpy as np
+
+    torch = importlib.import_module("torch")
+    thread_count = configure_torch_threads(torch, strategy_settings.get("torch_threads"))
+
+    sample_rate = working_audio.sample_rate
+    chunk_frames = int(strategy_settings.get("chunk_seconds", DEFAULT_SPEECHBRAIN_CHUNK_SECONDS) * sample_rate)
+    overlap_frames = int(strategy_settings.get("overlap_seconds", DEFAULT_SPEECHBRAIN_OVERLAP_SECONDS) * sample_rate)
+    chunks = plan_overlap_chunks(working_audio.frame_count, chunk_frames, overlap_frames)
+    logging.info(
+        f"Enhancing {format_ms_duration(len(working_audio))} of audio in {len(chunks)} chunks "
+        f"with {thread_count} torch threads..."
+    )
+
+    with wave.open(output_path, "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(sample_rate)
+
+        def write_frames(frames):
+            pcm_frames = np.clip(np.round(frames * 32768.0), -32768, 32767).astype("<i2")
+            output_file.writeframesraw(pcm_frames.tobytes())
+
+        writer = OverlapAddWriter(write_frames, overlap_frames)
+        for chunk_index, (start_frame, end_frame) in enumerate(chunks, start=1):
+            noisy = working_audio.samples[start_frame:end_frame].astype(np.float32) / 32768.0
+            with torch.no_grad():
+                enhanced = enhancer.enhance_batch(torch.from_numpy(noisy).unsqueeze(0), lengths=torch.tensor([1.0]))
+            enhanced = enhanced.detach().cpu().numpy().reshape(-1)[:len(noisy)]
+            if len(enhanced) < len(noisy):
+                enhanced = np.pad(enhanced, (0, len(noisy) - len(enhanced)))
+
+            writer.add(enhanced)
+            logging.info(f"SpeechBrain enhanced chunk {chunk_index}/{len(chunks)}.")
+        writer.finish()
+
+    return output_path
+
+def apply_speechbrain_audio_cleaning(input_path, output_path, working_audio=None, strategy_settings=None):
     logging.info("Applying SpeechBrain audio cleaning...")
-    enhancer = load_speechbrain_enhancer()
+    if strategy_settings is None:
+        strategy_settings = get_cleaning_strategy_settings("speechbrain")
+    enhancer = get_speechbrain_enhancer(strategy_settings)
 
     try:
-        enhancer.enhance_file(input_path, output_path)
+        with speechbrain_enhancement_lock:
+            # Memory-mapped working audio is enhanced window by window; anything else goes through SpeechBrain's loader.
+            if working_audio is not None and strategy_settings.get("chunk_seconds", DEFAULT_SPEECHBRAIN_CHUNK_SECONDS):
+                enhance_working_audio_in_chunks(enhancer, working_audio, output_path, strategy_settings)
+            else:
+                enhancer.enhance_file(input_path, output_path)
     except Exception as e:
         raise RuntimeError(f"SpeechBrain cleaning mode failed while enhancing the working audio. Original error: {e}") from e
 
@@ -284,8 +691,9 @@ def apply_speechbrain_audio_cleaning(input_path, output_path):
     logging.info(f"SpeechBrain cleaned audio saved to {output_path}")
     return output_path
 
-def apply_audio_cleaning(working_audio_path, cleaning_mode=None, working_audio=None, already_resolved=False):
+def apply_audio_cleaning(working_audio_path, cleaning_mode=None, working_audio=None, already_resolved=False, work_dir=None):
     resolved_mode = validate_cleaning_mode(cleaning_mode) if already_resolved else resolve_cleaning_mode(cleaning_mode)
+    streaming = isinstance(working_audio, WorkingAudio)
 
     if resolved_mode == DEFAULT_CLEANING_MODE:
         logging.info("Audio cleaning mode set to off. Using normalized working audio.")
@@ -293,21 +701,129 @@ def apply_audio_cleaning(working_audio_path, cleaning_mode=None, working_audio=N
             working_audio = validate_audio_file(working_audio_path)
         return working_audio_path, working_audio
 
-    cleaned_audio_path = os.path.join(TMP_DIR, PREPROCESSED_AUDIO_FILENAME_TEMPLATE.format(resolved_mode))
+    cleaned_audio_path = os.path.join(work_dir or TMP_DIR, PREPROCESSED_AUDIO_FILENAME_TEMPLATE.format(resolved_mode))
+
+    with stage("cleaning", mode=resolved_mode):
+        if resolved_mode == "basic":
+            source_audio = working_audio
+            if source_audio is None:
+                source_audio = validate_audio_file(working_audio_path)
+            apply_basic_audio_cleaning(source_audio, cleaned_audio_path)
+        elif resolved_mode == "speechbrain":
+            apply_speechbrain_audio_cleaning(working_audio_path, cleaned_audio_path, working_audio if streaming else None)
+
+        return cleaned_audio_path, load_working_audio(cleaned_audio_path, streaming)
+
+def get_audio_cache():
+    """Return the working audio cache configured in the app config, or None when it is disabled."""
+    cache_settings = load_app_config().get("audio_cache_settings", {})
+    if not cache_settings.get("enabled", True):
+        return None
+
+    max_size_mb = cache_settings.get("max_size_mb", DEFAULT_AUDIO_CACHE_MAX_SIZE_MB)
+    return FileCache(os.path.join(AUDIO_CACHE_DIR, WORKING_AUDIO_CACHE_DIRNAME), int(max_size_mb * 1024 * 1024))
+
+def create_run_workspace(workspace_root=None):
+    """
+    Create the workspace holding the intermediate files of one run.
+
+    The root is the given one, the root configured in the app config, a tmpfs mount with enough free space or
+    TMP_DIR, in that order. Every run gets its own directory under it, so concurrent runs never share files.
 
-    if resolved_mode == "basic":
-        source_audio = working_audio
-        if source_audio is None:
-            source_audio = validate_audio_file(working_audio_path)
-        apply_basic_audio_cleaning(source_audio, cleaned_audio_path)
-    elif resolved_mode == "speechbrain":
-        apply_speechbrain_audio_cleaning(working_audio_path, cleaned_audio_path)
+    :return: str, the workspace path.
+    """
+    workspace_settings = load_app_config().get("workspace_settings", {})
+    tmpfs_min_free_mb = workspace_settings.get("tmpfs_min_free_mb", DEFAULT_TMPFS_MIN_FREE_MB)
+    workspace_root = resolve_workspace_root(
+        workspace_root or workspace_settings.get("root"),
+        default_root=TMP_DIR,
+        prefer_tmpfs=workspace_settings.get("prefer_tmpfs", True),
+        tmpfs_min_free_bytes=int(tmpfs_min_free_mb * 1024 * 1024),
+    )
+    return create_workspace(workspace_root)
+
+def get_cleaning_strategy_settings(cleaning_mode):
+    if cleaning_mode == DEFAULT_CLEANING_MODE:
+        return {}
+    return load_cleaning_settings().get(f"{cleaning_mode}_strategy_settings", {})
+
+def build_audio_cache_key(input_hash, streaming, cleaning_mode=DEFAULT_CLEANING_MODE, strategy_settings=None):
+    # The working format differs between FFmpeg streaming (16 kHz mono PCM) and the pydub fallback (source layout).
+    working_format = f"pcm_s16le_{TRANSCRIPTION_SAMPLE_RATE}_mono" if streaming else "pydub_wav"
+    return hash_key(AUDIO_CACHE_FORMAT_VERSION, input_hash, working_format, cleaning_mode, strategy_settings or {})
+
+def restore_cached_audio(audio_cache, cache_key, destination_path, streaming):
+    try:
+        restored_path = audio_cache.restore(cache_key, destination_path, f".{WORKING_AUDIO_FORMAT}")
+        if restored_path is None:
+            return None
+        return load_working_audio(restored_path, streaming)
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cached audio for {destination_path}: {str(e)}")
+        return None
 
-    return cleaned_audio_path, validate_audio_file(cleaned_audio_path)
+def store_cached_audio(audio_cache, cache_key, source_path):
+    try:
+        audio_cache.store_file(cache_key, source_path, f".{WORKING_AUDIO_FORMAT}")
+    except OSError as e:
+        logging.warning(f"Could not add {source_path} to the audio cache: {str(e)}")
+
+def remove_stale_file(file_path):
+    # A restored file is a hard link into the cache when the workspace is on the cache's filesystem, and writing
+    # through it would change the cached entry, so stale files are unlinked rather than overwritten in place.
+    # Workspaces on tmpfs are on another filesystem, so their restored files are always copies.
+    if os.path.lexists(file_path):
+        os.remove(file_path)
+
+def prepare_transcription_audio(input_path, cleaning_mode=None, already_resolved=False, work_dir=None):
+    # The input is probed once here and the result is handed to every later stage.
+    # Intermediate files go to work_dir, which defaults to the run's temporary directory.
+    media_probe = None
+    if os.path.isfile(input_path):
+        with stage("probe"):
+            media_probe = probe_input_media(input_path)
+    work_dir = work_dir or TMP_DIR
+
+    audio_cache = get_audio_cache()
+    if audio_cache is None or media_probe is None:
+        working_audio_path, working_audio = prepare_working_audio(input_path, media_probe, work_dir=work_dir)
+        return apply_audio_cleaning(
+            working_audio_path, cleaning_mode, working_audio, already_resolved=already_resolved, work_dir=work_dir
+        )
+
+    resolved_mode = validate_cleaning_mode(cleaning_mode) if already_resolved else resolve_cleaning_mode(cleaning_mode)
+    streaming = find_ffmpeg() is not None
+    with stage("hash_input"):
+        input_hash = hash_file(input_path)
+    os.makedirs(work_dir, exist_ok=True)
+
+    cleaned_cache_key = None
+    if resolved_mode != DEFAULT_CLEANING_MODE:
+        cleaned_cache_key = build_audio_cache_key(input_hash, streaming, resolved_mode, get_cleaning_strategy_settings(resolved_mode))
+        cleaned_audio_path = os.path.join(work_dir, PREPROCESSED_AUDIO_FILENAME_TEMPLATE.format(resolved_mode))
+        cleaned_audio = restore_cached_audio(audio_cache, cleaned_cache_key, cleaned_audio_path, streaming)
+        if cleaned_audio is not None:
+            logging.info(f"Reusing cached '{resolved_mode}' cleaned audio for {input_path}.")
+            return cleaned_audio_path, cleaned_audio
+        remove_stale_file(cleaned_audio_path)
+
+    working_cache_key = build_audio_cache_key(input_hash, streaming)
+    working_audio_path = os.path.join(work_dir, WORKING_AUDIO_FILENAME)
+    working_audio = restore_cached_audio(audio_cache, working_cache_key, working_audio_path, streaming)
+    if working_audio is not None:
+        logging.info(f"Reusing cached working audio for {input_path}.")
+    else:
+        remove_stale_file(working_audio_path)
+        working_audio_path, working_audio = prepare_working_audio(input_path, media_probe, work_dir=work_dir)
+        store_cached_audio(audio_cache, working_cache_key, working_audio_path)
+
+    transcription_audio_path, transcription_audio = apply_audio_cleaning(
+        working_audio_path, resolved_mode, working_audio, already_resolved=True, work_dir=work_dir
+    )
+    if cleaned_cache_key is not None:
+        store_cached_audio(audio_cache, cleaned_cache_key, transcription_audio_path)
 
-def prepare_transcription_audio(input_path, cleaning_mode=None, already_resolved=False):
-    working_audio_path, working_audio = prepare_working_audio(input_path)
-    return apply_audio_cleaning(working_audio_path, cleaning_mode, working_audio, already_resolved=already_resolved)
+    return transcription_audio_path, transcription_audio
 
 def parse_segments(segments_str, total_duration_ms):
     segments = []
@@ -347,6 +863,13 @@ def parse_segments(segments_str, total_duration_ms):
 
             segments.append((start_ms, end_ms))
 
+        # A range given twice would only produce the same subtitles twice.
+        first_indexes = {}
+        for index, segment in enumerate(segments):
+            if segment in first_indexes:
+                raise ValueError(f"Segment {index + 1} repeats segment {first_indexes[segment] + 1}; each range can only be requested once.")
+            first_indexes[segment] = index
+
         # After all segments are collected, check for order and overlap.
 
         previous_end = 0
@@ -387,12 +910,256 @@ def write_transcription_json(result, output_json_file):
                 logging.warning(f"Could not remove partial transcription JSON file {output_json_file}.", exc_info=True)
         raise
 
-def process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
-    # This function assumes the existence of a 'whisper' module and 'model' variable.
-    # These are not standard Python or known third-party libraries as of the last update in 2022.
-    # Ensure your environment contains these, or replace them with the actual modules and methods you're using for audio processing.
+def load_transcription_samples(input_audio):
+    """
+    Decode the working audio once into the 16 kHz mono buffer consumed by Whisper.
+
+    :param input_audio: WorkingAudio or AudioSegment, the prepared working audio.
+    :return: numpy.ndarray with the whole working audio, or None if the in-memory handoff is unavailable.
+             Memory-mapped working audio is returned as its int16 view; anything else is decoded to float32.
+    """
+    if isinstance(input_audio, WorkingAudio) and input_audio.sample_rate == TRANSCRIPTION_SAMPLE_RATE:
+        return input_audio.samples
+
+    try:
+        import numpy as np
+
+        with stage("decode_samples"):
+            resampled_audio = input_audio.set_frame_rate(TRANSCRIPTION_SAMPLE_RATE).set_channels(1).set_sample_width(2)
+            samples = np.frombuffer(resampled_audio.raw_data, dtype=np.int16).astype(np.float32)
+            samples /= 32768.0
+    except Exception as e:
+        logging.info(f"In-memory segment handoff is unavailable, temporary WAV files will be used instead: {e}")
+        return None
 
-    segment_number = 1
+    logging.info(f"Decoded {len(samples)} working audio samples for in-memory segment handoff.")
+    return samples
+
+def get_segment_sample_view(samples, segment_start, segment_end):
+    start_index = segment_start * TRANSCRIPTION_SAMPLE_RATE // 1000
+    end_index = segment_end * TRANSCRIPTION_SAMPLE_RATE // 1000
+    return samples[start_index:end_index]
+
+def slice_transcription_samples(samples, segment_start, segment_end):
+    # Float buffers are handed over as views; int16 memory maps are only converted one segment at a time.
+    segment_samples = get_segment_sample_view(samples, segment_start, segment_end)
+
+    if segment_samples.dtype.kind == "i":
+        import numpy as np
+
+        segment_samples = segment_samples.astype(np.float32)
+        segment_samples /= 32768.0
+
+    return segment_samples
+
+def load_segment_audio_from_temp_file(input_audio, segment_start, segment_end, temp_audio_file):
+    # Fallback handoff: export the segment to a temporary WAV file and let Whisper decode it again.
+    logging.info("Creating tmp audio segment...")
+    audio_segment = input_audio[segment_start:segment_end]
+    audio_segment.export(temp_audio_file, format=WORKING_AUDIO_FORMAT)
+    logging.info("Created temporary audio segment.")
+    segment_audio = lazy_import("whisper").load_audio(temp_audio_file)
+    logging.info("Loaded audio segment.")
+    return segment_audio
+
+def transcribe_audio_segment(speech_to_text_model, segment_audio, audio_language, segment_number, decode_options=None):
+    logging.info("Transforming speech segment to text...")
+    if decode_options is None:
+        decode_options = TRANSCRIPTION_DECODE_OPTIONS
+    try:
+        return lazy_import("whisper").transcribe(speech_to_text_model, segment_audio, language=audio_language, **decode_options)
+    except Exception as e:
+        raise RuntimeError(f"An error occurred while transcribing the audio segment #{segment_number}: {str(e)}") from e
+
+def resolve_speech_to_text_device(device=None):
+    if device:
+        return device
+
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def resolve_speech_to_text_precision(device):
+    # Whisper decodes in FP16 on CUDA devices and falls back to FP32 everywhere else.
+    return "float16" if device.startswith("cuda") else "float32"
+
+def resolve_transcription_settings(args):
+    transcription_settings = load_app_config().get("transcription_settings", {})
+    model_name = getattr(args, "model", None) or transcription_settings.get("model_name") or DEFAULT_SPEECH_TO_TEXT_MODEL_NAME
+    device = getattr(args, "device", None) or transcription_settings.get("device")
+    return model_name, device
+
+def load_speech_to_text_model(model_name=DEFAULT_SPEECH_TO_TEXT_MODEL_NAME, device=None):
+    """
+    Load the speech recognition model, reusing a cached instance when one was already loaded in this process.
+
+    :param model_name: str, Whisper model name.
+    :param device: str, device to load the model on, or None to pick CUDA when available.
+    :return: the loaded speech recognition model.
+    """
+    resolved_device = resolve_speech_to_text_device(device)
+    cache_key = (model_name, resolved_device, resolve_speech_to_text_precision(resolved_device))
+
+    logging.info(f"Loading speech recognition model '{model_name}' on {resolved_device}...")
+    load_chrono = Chronometer()
+    load_chrono.start()
+    with stage("model_load", model=model_name, device=resolved_device) as stage_attributes:
+        model, loaded = speech_to_text_model_cache.get_or_load(
+            cache_key,
+            lambda: lazy_import("whisper").load_model(model_name, device=resolved_device),
+        )
+        stage_attributes["loaded"] = loaded
+    load_chrono.stop()
+
+    if loaded:
+        logging.info("Speech recognition model loaded.")
+        load_chrono.print_duration("Speech recognition model load time")
+    else:
+        logging.info("Reusing cached speech recognition model.")
+
+    return model
+
+def get_transcription_cache(enabled=True):
+    """Return the persistent transcription result cache, or None when it is disabled for this run or in the app config."""
+    cache_settings = load_app_config().get("transcription_cache_settings", {})
+    if not enabled or not cache_settings.get("enabled", True):
+        return None
+
+    max_size_mb = cache_settings.get("max_size_mb", DEFAULT_TRANSCRIPTION_CACHE_MAX_SIZE_MB)
+    return FileCache(os.path.join(AUDIO_CACHE_DIR, TRANSCRIPTION_CACHE_DIRNAME), int(max_size_mb * 1024 * 1024))
+
+def hash_segment_audio(segment_audio):
+    """Return a content hash of a segment's samples, or None when the audio is not a numeric sample array."""
+    try:
+        import numpy as np
+
+        contiguous_audio = np.ascontiguousarray(segment_audio)
+    except Exception:
+        return None
+
+    if contiguous_audio.dtype.kind not in "iuf":
+        return None
+
+    return f"{contiguous_audio.dtype.str}:{hashlib.sha256(contiguous_audio.data).hexdigest()}"
+
+def build_transcription_cache_key(segment_audio, model_name, audio_language, decode_options=None):
+    segment_hash = hash_segment_audio(segment_audio)
+    if segment_hash is None:
+        return None
+
+    return hash_key(
+        segment_hash,
+        TRANSCRIPTION_SAMPLE_RATE,
+        model_name,
+        audio_language,
+        decode_options if decode_options is not None else TRANSCRIPTION_DECODE_OPTIONS,
+        # Read from the package metadata, so a run served entirely from the cache never imports Whisper and torch.
+        get_package_version("openai-whisper"),
+        get_package_version("whisper-timestamped"),
+    )
+
+def serialize_transcription_result(result):
+    return json.dumps(result, ensure_ascii=False, indent=2).encode("utf-8")
+
+def load_cached_transcription(transcription_cache, cache_key):
+    """Return the cached Whisper result for the key, or None when there is none."""
+    if transcription_cache is None or cache_key is None:
+        return None
+
+    cached_result = transcription_cache.read_bytes(cache_key, TRANSCRIPTION_CACHE_SUFFIX)
+    if cached_result is None:
+        return None
+
+    try:
+        return json.loads(cached_result)
+    except ValueError as e:
+        logging.warning(f"Ignoring unreadable cached transcription {cache_key}: {str(e)}")
+        return None
+
+def store_cached_transcription(transcription_cache, cache_key, result):
+    if transcription_cache is None or cache_key is None:
+        return
+
+    try:
+        transcription_cache.store_bytes(cache_key, serialize_transcription_result(result), TRANSCRIPTION_CACHE_SUFFIX)
+    except OSError as e:
+        logging.warning(f"Could not add a result to the transcription cache: {str(e)}")
+
+SEGMENT_RESULT_FILE_TEMPLATE = "speech_recognition_result_segment_{}.json"
+
+def build_output_json_template(segment_results_dir=None):
+    """Return the checkpoint file template inside segment_results_dir, or None when checkpointing is disabled."""
+    if not segment_results_dir:
+        return None
+    os.makedirs(segment_results_dir, exist_ok=True)
+    return os.path.join(segment_results_dir, SEGMENT_RESULT_FILE_TEMPLATE)
+
+def build_segment_json_path(output_json_template, segment_start, segment_end):
+    if output_json_template is None:
+        return None
+    return output_json_template.format(
+        format_ms_duration(segment_start, include_milliseconds=True) + "_" + format_ms_duration(segment_end, include_milliseconds=True)
+    )
+
+def build_segment_result(segment_start, segment_end, result):
+    """
+    Pair a segment's Whisper result with the segment's position on the input timeline.
+
+    :return: dict with "start_ms", "end_ms" and "result"; the result's timestamps are relative to start_ms.
+    """
+    return {"start_ms": segment_start, "end_ms": segment_end, "result": result}
+
+def checkpoint_segment_result(result, output_json_file):
+    """Write a segment result to its checkpoint JSON file when checkpointing is enabled."""
+    if output_json_file is None:
+        return
+    with stage("json_write"):
+        write_transcription_json(result, output_json_file)
+    logging.info(f"Checkpointed segment result to {output_json_file}")
+
+def process_audio_segments(
+    input_audio,
+    segments_to_process,
+    audio_language,
+    speech_to_text_model,
+    output_json_template,
+    input_samples=None,
+    transcription_cache=None,
+    model_name=None,
+    progress_callback=None,
+    work_dir=None,
+    on_segment_result=None,
+    run_journal=None,
+    decode_options=None,
+    first_segment_number=1,
+):
+    """
+    Transcribe the segments one after another with an already loaded model.
+
+    Segments are handed to Whisper as views over a buffer decoded once up front. The temporary WAV round-trip is
+    only used when that buffer cannot be built. Segments whose samples, model and language match a cached result
+    skip Whisper entirely.
+
+    :param output_json_template: str with one placeholder for the segment range, or None. When given, every
+        segment result is also checkpointed to its own JSON file.
+    :param on_segment_result: optional callable receiving each segment result as soon as it is ready.
+    :param run_journal: optional RunJournal. Segments it already holds are not transcribed again, and every other
+        segment is recorded in it once finished.
+    :param decode_options: options passed to whisper.transcribe besides the language, instead of
+        TRANSCRIPTION_DECODE_OPTIONS. They are part of the transcription cache key.
+    :param first_segment_number: number of the first segment, for logging and temporary file names.
+    :return: list of segment results built by build_segment_result, in processing order; empty when they are
+        handed to on_segment_result instead.
+    """
+    if input_samples is None:
+        input_samples = load_transcription_samples(input_audio)
+
+    segment_number = first_segment_number
+    segment_results = []
+    deliver_segment_result = on_segment_result or segment_results.append
 
     for segment_to_process in segments_to_process:
         # Convert the checkpoint to milliseconds
@@ -400,33 +1167,55 @@ def process_audio_segments(input_audio, segments_to_process, audio_language, spe
         segment_end = segment_to_process[1]
         logging.info(f"Processing segment {segment_number} starting at {format_ms_duration(segment_start, use_separator=True)} and ending at {format_ms_duration(segment_end, use_separator=True)}")
 
-        # Create the audio segment
-        audio_segment = input_audio[segment_start:segment_end]
+        temp_audio_file = os.path.join(work_dir or TMP_DIR, f"temp_segment_{segment_number}.{WORKING_AUDIO_FORMAT}")
 
-        # Save the audio segment to a temporary file
-        # TODO: if a single segment is provided, don't create a temporary file, instead use the original input audio file directly, for optimization.
-        logging.info("Creating tmp audio segment...")
-        output_format = WORKING_AUDIO_FORMAT
-        temp_audio_file = os.path.join(TMP_DIR, f"temp_segment_{segment_number}.{output_format}")
+        output_json_file = build_segment_json_path(output_json_template, segment_start, segment_end)
+
+        journaled_result = run_journal.lookup(segment_start, segment_end) if run_journal is not None else None
+        if journaled_result is not None:
+            logging.info(f"Resumed segment {segment_number} from the run journal")
+            checkpoint_segment_result(journaled_result, output_json_file)
+            deliver_segment_result(build_segment_result(segment_start, segment_end, journaled_result))
+            if progress_callback is not None:
+                progress_callback(segment_number, len(segments_to_process))
+            segment_number += 1
+            continue
 
         try:
-            audio_segment.export(temp_audio_file, format=output_format)
-            logging.info("Created temporary audio segment.")
+            with stage("segment", number=segment_number, start_ms=segment_start, end_ms=segment_end):
+                with stage("export"):
+                    if input_samples is not None:
+                        segment_audio = None
+                        cacheable_audio = get_segment_sample_view(input_samples, segment_start, segment_end)
+                    else:
+                        segment_audio = load_segment_audio_from_temp_file(input_audio, segment_start, segment_end, temp_audio_file)
+                        cacheable_audio = segment_audio
 
-            # Transcribe the audio segment
-            logging.info("Transforming speech segment to text...")
-            segment_audio = whisper.load_audio(temp_audio_file)
-            logging.info("Loaded audio segment. Transcribing...")
-            try:
-                result = whisper.transcribe(speech_to_text_model, segment_audio, language=audio_language)
-            except Exception as e:
-                raise RuntimeError(f"An error occurred while transcribing the audio segment #{segment_number}: {str(e)}") from e
-            logging.info("Transformed speech segment to text. Writing to tmp JSON file...")
-
-            # Save the result to a JSON file
-            output_json_file = output_json_template.format(format_ms_duration(segment_start) + "_" + format_ms_duration(segment_end))
-            write_transcription_json(result, output_json_file)
-            logging.info(f'Content has been written to the file {output_json_file}')
+                cache_key = None
+                with stage("cache_lookup"):
+                    if transcription_cache is not None:
+                        cache_key = build_transcription_cache_key(cacheable_audio, model_name, audio_language, decode_options)
+                    result = load_cached_transcription(transcription_cache, cache_key)
+
+                if result is not None:
+                    logging.info(f"Reused cached transcription for segment {segment_number}")
+                else:
+                    if segment_audio is None:
+                        with stage("export"):
+                            segment_audio = slice_transcription_samples(input_samples, segment_start, segment_end)
+
+                    # Transcribe the audio segment
+                    with stage("decode"):
+                        result = transcribe_audio_segment(
+                            speech_to_text_model, segment_audio, audio_language, segment_number, decode_options
+                        )
+                    logging.info("Transformed speech segment to text.")
+                    store_cached_transcription(transcription_cache, cache_key, result)
+
+                checkpoint_segment_result(result, output_json_file)
+                if run_journal is not None:
+                    run_journal.record(segment_start, segment_end, result)
+                deliver_segment_result(build_segment_result(segment_start, segment_end, result))
         finally:
             if os.path.exists(temp_audio_file):
                 try:
@@ -435,9 +1224,239 @@ def process_audio_segments(input_audio, segments_to_process, audio_language, spe
                     logging.warning(f"Could not remove temporary audio segment file {temp_audio_file}.", exc_info=True)
 
         logging.info(f"Completed processing for segment {segment_number}")
+        if progress_callback is not None:
+            progress_callback(segment_number, len(segments_to_process))
 
         # Prepare for the next segment
-        segment_number += 1  # Adjusted from 1000 to 1 for logical sequencing
+        segment_number += 1
+
+    return segment_results
+
+def build_long_form_decode_options(context_prompt):
+    if context_prompt is None:
+        return TRANSCRIPTION_DECODE_OPTIONS
+    return dict(TRANSCRIPTION_DECODE_OPTIONS, initial_prompt=context_prompt)
+
+def process_audio_windows(
+    input_audio,
+    windows,
+    audio_language,
+    speech_to_text_model,
+    output_json_template,
+    input_samples=None,
+    transcription_cache=None,
+    model_name=None,
+    progress_callback=None,
+    work_dir=None,
+    on_segment_result=None,
+    run_journal=None,
+):
+    """
+    Transcribe overlapping long-form windows in order, prompting each with the text that precedes it.
+
+    Every window goes through process_audio_segments, so the transcription cache and the run journal hold its raw
+    Whisper result under the window range. The result is then reduced to the window's kept range with
+    reconcile_window_result, which drops the words the neighbouring windows own, before it is checkpointed and
+    delivered. Only one window of samples is decoded at a time, and the prompt context is a bounded word buffer.
+
+    :param windows: list of (window_start_ms, window_end_ms, keep_start_ms, keep_end_ms) from
+        plan_transcription_windows.
+    :return: list of segment results covering the kept ranges, in timeline order; empty when they are handed to
+        on_segment_result instead.
+    """
+    if input_samples is None:
+        input_samples = load_transcription_samples(input_audio)
+
+    segment_results = []
+    deliver_segment_result = on_segment_result or segment_results.append
+    context = TranscriptContext(LONG_FORM_PROMPT_MAX_WORDS)
+
+    for window_number, window in enumerate(windows, start=1):
+        window_start, window_end, keep_start, keep_end = window
+        window_result = process_audio_segments(
+            input_audio,
+            [(window_start, window_end)],
+            audio_language,
+            speech_to_text_model,
+            None,
+            input_samples=input_samples,
+            transcription_cache=transcription_cache,
+            model_name=model_name,
+            work_dir=work_dir,
+            run_journal=run_journal,
+            decode_options=build_long_form_decode_options(context.build_prompt(window_start)),
+            first_segment_number=window_number,
+        )[0]
+
+        result = reconcile_window_result(window_result["result"], *window)
+        context.add_result(result, keep_start)
+        checkpoint_segment_result(result, build_segment_json_path(output_json_template, keep_start, keep_end))
+        deliver_segment_result(build_segment_result(keep_start, keep_end, result))
+        if progress_callback is not None:
+            progress_callback(window_number, len(windows))
+
+    return segment_results
+
+# Per-process state of a transcription worker, populated once by initialize_transcription_worker.
+transcription_worker_state = {}
+
+def initialize_transcription_worker(model_name, samples_path, torch_threads=None, device=None):
+    if torch_threads:
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+
+    logging.info(f"Transcription worker {os.getpid()} starting...")
+    transcription_worker_state["model"] = load_speech_to_text_model(model_name, device)
+    # Every worker maps the same samples read-only, so the audio is shared through the page cache.
+    if samples_path.endswith(f".{WORKING_AUDIO_FORMAT}"):
+        transcription_worker_state["samples"] = WorkingAudio(samples_path).samples
+    else:
+        import numpy as np
+
+        transcription_worker_state["samples"] = np.load(samples_path, mmap_mode="r")
+
+def transcribe_segment_in_worker(segment_number, segment_start, segment_end, audio_language, output_json_file):
+    logging.info(f"Worker {os.getpid()} processing segment {segment_number} starting at {format_ms_duration(segment_start, use_separator=True)} and ending at {format_ms_duration(segment_end, use_separator=True)}")
+    segment_audio = slice_transcription_samples(transcription_worker_state["samples"], segment_start, segment_end)
+    result = transcribe_audio_segment(transcription_worker_state["model"], segment_audio, audio_language, segment_number)
+    checkpoint_segment_result(result, output_json_file)
+    # The result travels back to the parent process with the future.
+    return result
+
+def get_worker_torch_threads(workers):
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def process_audio_segments_in_parallel(
+    input_audio,
+    segments_to_process,
+    audio_language,
+    model_name,
+    output_json_template,
+    workers,
+    device=None,
+    transcription_cache=None,
+    progress_callback=None,
+    work_dir=None,
+    on_segment_result=None,
+    run_journal=None,
+):
+    """
+    Transcribe the segments on a pool of worker processes, each one loading the speech recognition model once.
+
+    Workers send their results back with the futures; with an output_json_template they also checkpoint them to
+    their own JSON files. Results held by the run journal or the cache are restored up front and their segments are
+    never submitted to the pool; the others are recorded in the run journal as they finish.
+
+    :param progress_callback: optional callable receiving (completed segments, total segments).
+    :param on_segment_result: optional callable receiving the segment results in segment order, each one as soon
+        as it and every segment before it are ready.
+    :return: list of segment results built by build_segment_result, in segment order; empty when they are handed
+        to on_segment_result instead.
+    """
+    input_samples = load_transcription_samples(input_audio)
+    if input_samples is None:
+        raise RuntimeError("Parallel transcription requires the in-memory sample buffer, but the working audio could not be decoded into it.")
+
+    segment_results = []
+    deliver_segment_result = on_segment_result or segment_results.append
+    # Results that finished ahead of an earlier segment wait here, so they are delivered in segment order.
+    ready_results = {}
+    next_segment_number = 1
+
+    def complete_segment(segment_number, segment_result):
+        nonlocal next_segment_number
+        ready_results[segment_number] = segment_result
+        while next_segment_number in ready_results:
+            deliver_segment_result(ready_results.pop(next_segment_number))
+            next_segment_number += 1
+
+    pending_segments = []
+    for segment_number, (segment_start, segment_end) in enumerate(segments_to_process, start=1):
+        output_json_file = build_segment_json_path(output_json_template, segment_start, segment_end)
+        journaled_result = run_journal.lookup(segment_start, segment_end) if run_journal is not None else None
+        if journaled_result is not None:
+            logging.info(f"Resumed segment {segment_number} from the run journal")
+            checkpoint_segment_result(journaled_result, output_json_file)
+            complete_segment(segment_number, build_segment_result(segment_start, segment_end, journaled_result))
+            continue
+        cache_key = None
+        if transcription_cache is not None:
+            segment_samples = get_segment_sample_view(input_samples, segment_start, segment_end)
+            cache_key = build_transcription_cache_key(segment_samples, model_name, audio_language)
+        cached_result = load_cached_transcription(transcription_cache, cache_key)
+        if cached_result is not None:
+            logging.info(f"Reused cached transcription for segment {segment_number}")
+            checkpoint_segment_result(cached_result, output_json_file)
+            if run_journal is not None:
+                run_journal.record(segment_start, segment_end, cached_result)
+            complete_segment(segment_number, build_segment_result(segment_start, segment_end, cached_result))
+            continue
+        pending_segments.append((segment_number, segment_start, segment_end, output_json_file, cache_key))
+
+    completed_segments = len(segments_to_process) - len(pending_segments)
+    if progress_callback is not None and completed_segments:
+        progress_callback(completed_segments, len(segments_to_process))
+    if not pending_segments:
+        return segment_results
+
+    workers = min(workers, len(pending_segments))
+    if isinstance(input_audio, WorkingAudio):
+        samples_path = input_audio.path
+        owns_samples_file = False
+    else:
+        import numpy as np
+
+        samples_path = os.path.join(work_dir or TMP_DIR, TRANSCRIPTION_SAMPLES_FILENAME)
+        np.save(samples_path, input_samples)
+        owns_samples_file = True
+    del input_samples
+
+    logging.info(f"Transcribing {len(pending_segments)} segment(s) with {workers} worker process(es)...")
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initialize_transcription_worker,
+        initargs=(model_name, samples_path, get_worker_torch_threads(workers), device),
+    )
+
+    try:
+        futures = [
+            executor.submit(
+                transcribe_segment_in_worker,
+                segment_number,
+                segment_start,
+                segment_end,
+                audio_language,
+                output_json_file,
+            )
+            for segment_number, segment_start, segment_end, output_json_file, _cache_key in pending_segments
+        ]
+
+        # Collect in submission order so a failure is reported for the earliest failing segment.
+        for (segment_number, segment_start, segment_end, _output_json_file, cache_key), future in zip(pending_segments, futures):
+            # Workers decode in their own processes, so the parent only sees how long it waits for each result.
+            with stage("segment_wait", number=segment_number, start_ms=segment_start, end_ms=segment_end):
+                result = future.result()
+            store_cached_transcription(transcription_cache, cache_key, result)
+            if run_journal is not None:
+                run_journal.record(segment_start, segment_end, result)
+            complete_segment(segment_number, build_segment_result(segment_start, segment_end, result))
+            logging.info(f"Completed processing for segment {segment_number}")
+            completed_segments += 1
+            if progress_callback is not None:
+                progress_callback(completed_segments, len(segments_to_process))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if owns_samples_file and os.path.exists(samples_path):
+            try:
+                os.remove(samples_path)
+            except Exception:
+                logging.warning(f"Could not remove transcription samples file {samples_path}.", exc_info=True)
+
+    return segment_results
 
 def generate_time_checkpoints(pattern, total_milliseconds):
     """
@@ -452,17 +1471,7 @@ def generate_time_checkpoints(pattern, total_milliseconds):
     """
 
     # Determine the interval in seconds
-    number = int(re.search(r'\d+', pattern).group())
-    unit = pattern[-1]
-
-    if unit == 'h':
-        interval_seconds = number * 3600
-    elif unit == 'm':
-        interval_seconds = number * 60
-    elif unit == 's':
-        interval_seconds = number
-    else:
-        raise ValueError("Invalid time unit in pattern. Only 'h', 'm', and 's' are supported.")
+    interval_seconds = parse_pattern_interval_seconds(pattern)
 
     # Calculate the total time in seconds
     total_seconds = total_milliseconds // 1000
@@ -483,6 +1492,92 @@ def generate_time_checkpoints(pattern, total_milliseconds):
 
     return checkpoints
 
+def parse_pattern_interval_seconds(pattern):
+    number = int(re.search(r'\d+', pattern).group())
+    unit = pattern[-1]
+
+    if unit == 'h':
+        return number * 3600
+    elif unit == 'm':
+        return number * 60
+    elif unit == 's':
+        return number
+    raise ValueError("Invalid time unit in pattern. Only 'h', 'm', and 's' are supported.")
+
+def detect_speech(input_samples):
+    """
+    Run the energy-based voice activity pass over the 16 kHz working audio samples.
+
+    :return: tuple, the per-frame levels in dBFS and the per-frame speech mask.
+    """
+    with stage("voice_activity"):
+        frame_levels_db = compute_frame_levels(input_samples, TRANSCRIPTION_SAMPLE_RATE, VOICE_ACTIVITY_FRAME_MS)
+        return frame_levels_db, detect_speech_frames(frame_levels_db, frame_ms=VOICE_ACTIVITY_FRAME_MS)
+
+def skip_silent_audio(input_samples, segments_to_process, total_duration_ms):
+    """
+    Trim the requested segments down to their speech, so spans without speech are never transcribed.
+
+    :param input_samples: numpy.ndarray, the 16 kHz working audio samples.
+    :param segments_to_process: list of (start_ms, end_ms) tuples.
+    :param total_duration_ms: int, duration of the working audio.
+    :return: list of (start_ms, end_ms) tuples on the original timeline.
+    """
+    if input_samples is None:
+        raise RuntimeError("Silence skipping needs the decoded working audio samples, which are unavailable.")
+
+    logging.info("Detecting speech to skip silent audio...")
+    _frame_levels_db, speech_mask = detect_speech(input_samples)
+    speech_regions = find_speech_regions(speech_mask, VOICE_ACTIVITY_FRAME_MS, total_duration_ms)
+    # Segment offsets are carried in milliseconds, so pieces only need to line up with the analysis frames.
+    trimmed_segments = trim_segments_to_speech(segments_to_process, speech_regions, boundary_ms=VOICE_ACTIVITY_FRAME_MS)
+
+    requested_duration_ms = sum(end - start for start, end in segments_to_process)
+    skipped_duration_ms = requested_duration_ms - sum(end - start for start, end in trimmed_segments)
+    skipped_percentage = 100 * skipped_duration_ms / requested_duration_ms if requested_duration_ms else 0
+    logging.info(
+        f"Silence skipping kept {len(trimmed_segments)} speech span(s) from {len(segments_to_process)} segment(s) and "
+        f"skipped {format_ms_duration(skipped_duration_ms, use_separator=True)} of "
+        f"{format_ms_duration(requested_duration_ms, use_separator=True)} ({skipped_percentage:.1f}%)."
+    )
+    return trimmed_segments
+
+def generate_auto_segments(input_samples, total_duration_ms, target_pattern):
+    """
+    Place segment boundaries in pauses near a target segment length, found with an energy pass over the samples.
+
+    Long stretches without speech are left out of the segments, so Whisper never sees them.
+
+    :param input_samples: numpy.ndarray, the 16 kHz working audio samples.
+    :param total_duration_ms: int, duration of the working audio.
+    :param target_pattern: str, target segment length as a pattern (ie 30s, 5m).
+    :return: list of (start_ms, end_ms) tuples.
+    """
+    if not is_pattern(target_pattern):
+        raise ValueError(f"Invalid automatic checkpoint target '{target_pattern}'. Expected a pattern such as 30s, 5m or 1h.")
+    if input_samples is None:
+        raise RuntimeError("Automatic checkpoints need the decoded working audio samples, which are unavailable.")
+
+    logging.info("Detecting speech to place automatic checkpoints...")
+    frame_levels_db, speech_mask = detect_speech(input_samples)
+    segments = plan_speech_segments(
+        speech_mask,
+        frame_levels_db,
+        VOICE_ACTIVITY_FRAME_MS,
+        total_duration_ms,
+        parse_pattern_interval_seconds(target_pattern) * 1000,
+        boundary_ms=VOICE_ACTIVITY_FRAME_MS,
+    )
+
+    speech_duration_ms = sum(end - start for start, end in segments)
+    logging.info(
+        f"Automatic checkpoints produced {len(segments)} segment(s) covering "
+        f"{format_ms_duration(speech_duration_ms, use_separator=True)} of "
+        f"{format_ms_duration(total_duration_ms, use_separator=True)}; "
+        f"{format_ms_duration(total_duration_ms - speech_duration_ms, use_separator=True)} without speech will be skipped."
+    )
+    return segments
+
 def is_pattern(str):
     return re.search(r'^[1-9]\d*[hms]$', str)
 
@@ -549,14 +1644,57 @@ def generate_segments_from_checkpoints(checkpoints, total_duration_ms):
 
     return filter_zero_length_segments(segments_to_process)
 
-def process_input(args):
+@functools.lru_cache(maxsize=None)
+def get_package_version(distribution_name):
+    """Return the installed version of a distribution without importing it, or None when it is not installed."""
+    try:
+        return importlib.metadata.version(distribution_name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+def build_run_config_hash(
+    input_path, cleaning_mode, model_name, audio_language, long_form=False, auto_checkpoints=None, skip_silence=False
+):
+    """
+    Identify the input and the settings that decide a run's segment results, for matching run journal records.
+
+    The input is identified by its path, size and modification time rather than a content hash, so the journal can
+    be checked without reading the whole file again. Besides the mode names, the resolved cleaning settings and,
+    when speech detection places or trims the segments, its thresholds are part of the hash. Package versions are
+    read from the installed metadata, so resuming does not import Whisper and torch before they are needed.
+    """
+    try:
+        input_stat = os.stat(input_path)
+        input_identity = (os.path.abspath(input_path), input_stat.st_size, input_stat.st_mtime_ns)
+    except OSError:
+        input_identity = (os.path.abspath(input_path), None, None)
+
+    return hash_key(
+        input_identity,
+        cleaning_mode,
+        get_cleaning_strategy_settings(cleaning_mode),
+        model_name,
+        audio_language,
+        TRANSCRIPTION_DECODE_OPTIONS,
+        get_package_version("openai-whisper"),
+        get_package_version("whisper-timestamped"),
+        (LONG_FORM_WINDOW_MS, LONG_FORM_OVERLAP_MS, LONG_FORM_PROMPT_MAX_WORDS) if long_form else None,
+        auto_checkpoints,
+        bool(skip_silence),
+        dict(get_voice_activity_settings(), frame_ms=VOICE_ACTIVITY_FRAME_MS) if auto_checkpoints or skip_silence else None,
+    )
+
+def process_input(args, prepared_audio=None, progress_callback=None, work_dir=None, on_segment_result=None, run_journal_path=None):
     # extract command line args and set defaults
     checkpoints = args.checkpoints
     explicit_cleaning_mode = getattr(args, "cleaning_mode", None)
     cleaning_mode = resolve_cleaning_mode(explicit_cleaning_mode)
     segments = args.segments
+    auto_checkpoints = getattr(args, "auto_checkpoints", None)
     input_path = args.input
     audio_language = args.language or 'en'
+    model_name, device = resolve_transcription_settings(args)
+    long_form = getattr(args, "long_form", False)
 
     if not input_path:
         raise ValueError("Input file path is required.")
@@ -564,13 +1702,22 @@ def process_input(args):
     # checkpoints and segments are mutually exclusive
     if checkpoints and segments:
         raise ValueError("Cannot specify both checkpoints and segments simultaneously.")
+    if auto_checkpoints and (checkpoints or segments):
+        raise ValueError("Cannot specify automatic checkpoints together with checkpoints or segments.")
 
-    # Create the temporary directory if it doesn't exist
-    if not os.path.exists(TMP_DIR):
-        os.makedirs(TMP_DIR)
+    # Intermediate files and per-segment results go to the run's workspace, shared with generate_output.
+    work_dir = work_dir or TMP_DIR
+    os.makedirs(work_dir, exist_ok=True)
 
     # Prepare the normalized and optionally cleaned working audio used by transcription.
-    transcription_audio_path, input_audio = prepare_transcription_audio(input_path, cleaning_mode, already_resolved=True)
+    # Batch runs hand over audio that was already prepared while the previous input was being transcribed.
+    if prepared_audio is None:
+        with stage("prepare_audio", cleaning_mode=cleaning_mode):
+            transcription_audio_path, input_audio = prepare_transcription_audio(
+                input_path, cleaning_mode, already_resolved=True, work_dir=work_dir
+            )
+    else:
+        transcription_audio_path, input_audio = prepared_audio
     logging.info(f"Prepared transcription audio at {transcription_audio_path} using cleaning mode '{cleaning_mode}'.")
 
     if getattr(args, "save_cleaning_mode", False) and explicit_cleaning_mode is not None:
@@ -584,22 +1731,125 @@ def process_input(args):
 
     # Generate the segments to process based on the checkpoints or segments provided
     segments_to_process = []
+    input_samples = None
     if checkpoints:
         segments_to_process = generate_segments_from_checkpoints(checkpoints, total_duration_ms)
     elif segments:
         segments_to_process = parse_segments(segments, total_duration_ms)
+    elif auto_checkpoints:
+        input_samples = load_transcription_samples(input_audio)
+        segments_to_process = generate_auto_segments(input_samples, total_duration_ms, auto_checkpoints)
+        if not segments_to_process:
+            logging.warning("No speech was detected in the input audio. There is nothing to transcribe.")
+            return []
     else:
         # If no segments/checkpoints, process entire audio
         segments_to_process = [(0, total_duration_ms)]
 
-    # Load the speech recognition model
-    logging.info("Loading speech recognition model...")
-    # TODO: be able to specify the model to use in the command line
-    speech_to_text_model = whisper.load_model("tiny")
-    logging.info("Speech recognition model loaded.")
+    if getattr(args, "skip_silence", False):
+        if input_samples is None:
+            input_samples = load_transcription_samples(input_audio)
+        segments_to_process = skip_silent_audio(input_samples, segments_to_process, total_duration_ms)
+        if not segments_to_process:
+            logging.warning("No speech was detected in the requested audio. There is nothing to transcribe.")
+            return []
+
+    # Subtitles are written in timeline order as segments complete, so the segments are transcribed in that order.
+    ordered_segments = sorted(segments_to_process)
+    if ordered_segments != segments_to_process:
+        logging.info("Segments will be transcribed in timeline order.")
+    segments_to_process = ordered_segments
 
     # Process the audio segments
-    # The speech to text result for each segment will be saved to a JSON file.
-    # The content of the generated JSON files is used then in the generate_output.py script as input to generate the final subtitles output.
-    output_json_template = os.path.join(TMP_DIR, "speech_recognition_result_segment_{}.json")
-    process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template)
+    # The speech to text results are handed to on_segment_result as they complete, or returned to the caller.
+    # With --segment-results-dir, each result is also checkpointed to its own JSON file in that directory.
+    output_json_template = build_output_json_template(getattr(args, "segment_results_dir", None))
+
+    # Results of previous runs are reused for segments with identical samples, model and language.
+    transcription_cache = get_transcription_cache(not getattr(args, "no_transcription_cache", False))
+
+    # Finished segments are journaled next to the output, so an interrupted run can be resumed with --resume.
+    run_journal = None
+    if run_journal_path:
+        run_journal = RunJournal(
+            run_journal_path,
+            build_run_config_hash(
+                input_path,
+                cleaning_mode,
+                model_name,
+                audio_language,
+                long_form,
+                auto_checkpoints=auto_checkpoints,
+                skip_silence=getattr(args, "skip_silence", False),
+            ),
+            resume=getattr(args, "resume", False),
+        )
+
+    workers = getattr(args, "workers", None) or 1
+    windows = None
+    if long_form:
+        # Each window is prompted with the text of the one before it, so windows cannot be spread over workers.
+        windows = plan_transcription_windows(segments_to_process, LONG_FORM_WINDOW_MS, LONG_FORM_OVERLAP_MS)
+        logging.info(f"Long-form transcription will process {len(windows)} overlapping window(s).")
+        if workers > 1:
+            logging.info("Long-form windows are transcribed one after another; --workers is ignored.")
+            workers = 1
+    try:
+        with stage("transcribe", segments=len(segments_to_process), workers=workers) as stage_attributes:
+            if windows:
+                stage_attributes["windows"] = len(windows)
+            if workers > 1 and len(segments_to_process) > 1:
+                return process_audio_segments_in_parallel(
+                    input_audio,
+                    segments_to_process,
+                    audio_language,
+                    model_name,
+                    output_json_template,
+                    workers,
+                    device=device,
+                    transcription_cache=transcription_cache,
+                    progress_callback=progress_callback,
+                    work_dir=work_dir,
+                    on_segment_result=on_segment_result,
+                    run_journal=run_journal,
+                )
+
+            # Load the speech recognition model, unless the journal already holds every segment
+            speech_to_text_model = None
+            transcribed_ranges = [window[:2] for window in windows] if windows else segments_to_process
+            if run_journal is None or any(run_journal.lookup(*segment) is None for segment in transcribed_ranges):
+                speech_to_text_model = load_speech_to_text_model(model_name, device)
+
+            if windows:
+                return process_audio_windows(
+                    input_audio,
+                    windows,
+                    audio_language,
+                    speech_to_text_model,
+                    output_json_template,
+                    input_samples=input_samples,
+                    transcription_cache=transcription_cache,
+                    model_name=model_name,
+                    progress_callback=progress_callback,
+                    work_dir=work_dir,
+                    on_segment_result=on_segment_result,
+                    run_journal=run_journal,
+                )
+
+            return process_audio_segments(
+                input_audio,
+                segments_to_process,
+                audio_language,
+                speech_to_text_model,
+                output_json_template,
+                input_samples=input_samples,
+                transcription_cache=transcription_cache,
+                model_name=model_name,
+                progress_callback=progress_callback,
+                work_dir=work_dir,
+                on_segment_result=on_segment_result,
+                run_journal=run_journal,
+            )
+    finally:
+        if run_journal is not None:
+            run_journal.close()
@@ -0,0 +1,414 @@
+import http.server
+import json
+import logging
+import os
+import queue
+import shutil
+import socketserver
+import stat
+import threading
+import time
+import urllib.parse
+import uuid
+from argparse import Namespace
+from config import APP_VERSION, TMP_DIR
+from modules import remove_workspace, serve_execution_args
+from process_input import (
+    create_run_workspace,
+    get_speechbrain_enhancer,
+    load_speech_to_text_model,
+    prepare_transcription_audio,
+    process_input,
+    resolve_cleaning_mode,
+    resolve_transcription_settings,
+    validate_cleaning_mode,
+)
+from generate_output import generate_output, open_srt_writer, validate_output
+from batch import default_output_path
+
+SERVE_JOB_DIR_TEMPLATE = "serve_job_{}"
+# JSON type of each job field, as (Python type, name used in error messages). null leaves a field unset.
+JOB_FIELD_TYPES = {
+    "input": (str, "string"),
+    "output": (str, "string"),
+    "language": (str, "string"),
+    "segments": (str, "string"),
+    "checkpoints": (str, "string"),
+    "auto_checkpoints": (str, "string"),
+    "skip_silence": (bool, "boolean"),
+    "long_form": (bool, "boolean"),
+    "cleaning_mode": (str, "string"),
+}
+JOB_REQUEST_KEYS = tuple(JOB_FIELD_TYPES)
+FINISHED_JOB_STATUSES = ("succeeded", "failed")
+# Finished jobs stay queryable until this many newer ones have finished.
+MAX_FINISHED_JOBS = 1000
+QUEUE_FULL_RETRY_AFTER_SECONDS = 5
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue already holds the maximum number of waiting jobs."""
+
+class TranscriptionService:
+    """
+    Resident job runner that keeps the speech recognition model and the SpeechBrain enhancer loaded between jobs.
+
+    Jobs wait in a bounded queue and are picked up by a fixed number of worker threads. Every job keeps its files
+    in its own directory of the service workspace, so workers prepare audio and write subtitles concurrently, but
+    they transcribe, and enhance with SpeechBrain, one job at a time because the loaded models are shared.
+    """
+
+    def __init__(self, defaults, job_workers=1, max_queue_depth=16, work_dir=None):
+        """
+        :param defaults: argparse.Namespace with the service-wide settings (language, model, device, cleaning_mode,
+            output_dir, no_transcription_cache, workers) used by jobs that do not set them. workers must be 1.
+        :param work_dir: str, the service workspace holding the job directories. Defaults to TMP_DIR.
+        """
+        self.defaults = defaults
+        self.job_workers = job_workers
+        self.max_queue_depth = max_queue_depth
+        self.work_dir = work_dir or TMP_DIR
+        self._queue = queue.Queue(maxsize=max_queue_depth)
+        self._jobs = {}
+        self._job_args = {}
+        self._jobs_lock = threading.Lock()
+        self._transcription_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def warm_up(self):
+        """Load the speech recognition model, and the SpeechBrain enhancer when it is the default, before any job arrives."""
+        model_name, device = resolve_transcription_settings(self.defaults)
+        load_speech_to_text_model(model_name, device)
+        if resolve_cleaning_mode(self.defaults.cleaning_mode) == "speechbrain":
+            get_speechbrain_enhancer()
+
+    def start(self):
+        os.makedirs(self.work_dir, exist_ok=True)
+        self._stopping.clear()
+        for worker_number in range(1, self.job_workers + 1):
+            thread = threading.Thread(target=self._work, name=f"serve-worker-{worker_number}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=None):
+        """Let running jobs finish, fail the ones still waiting and stop the workers."""
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def build_job_args(self, request):
+        """
+        Validate a job request and build the arguments read by process_input and generate_output.
+
+        :param request: dict with an "input" path and optionally any other key of JOB_REQUEST_KEYS.
+        :return: argparse.Namespace.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("A job must be a JSON object.")
+
+        unknown_keys = sorted(set(request) - set(JOB_REQUEST_KEYS))
+        if unknown_keys:
+            raise ValueError(
+                f"Unsupported job field(s): {', '.join(unknown_keys)}. Supported fields are: {', '.join(JOB_REQUEST_KEYS)}."
+            )
+
+        for key, value in request.items():
+            expected_type, type_name = JOB_FIELD_TYPES[key]
+            if value is not None and not isinstance(value, expected_type):
+                raise ValueError(f"Job field {key} must be a {type_name}, not {json.dumps(value)}.")
+
+        input_path = request.get("input")
+        if not input_path or not os.path.isfile(input_path):
+            raise ValueError(f"Input file does not exist: {input_path}")
+        if request.get("checkpoints") and request.get("segments"):
+            raise ValueError("Cannot specify both checkpoints and segments simultaneously.")
+        if request.get("auto_checkpoints") and (request.get("checkpoints") or request.get("segments")):
+            raise ValueError("Cannot specify automatic checkpoints together with checkpoints or segments.")
+
+        cleaning_mode = request.get("cleaning_mode") or self.defaults.cleaning_mode
+        if cleaning_mode is not None:
+            validate_cleaning_mode(cleaning_mode)
+
+        output_path = request.get("output") or default_output_path(input_path, self.defaults.output_dir)
+        return Namespace(
+            input=input_path,
+            output=validate_output(output_path),
+            checkpoints=request.get("checkpoints"),
+            auto_checkpoints=request.get("auto_checkpoints"),
+            segments=request.get("segments"),
+            skip_silence=bool(request.get("skip_silence")),
+            long_form=bool(request.get("long_form")),
+            language=request.get("language") or self.defaults.language,
+            model=self.defaults.model,
+            device=self.defaults.device,
+            cleaning_mode=cleaning_mode,
+            save_cleaning_mode=False,
+            no_transcription_cache=self.defaults.no_transcription_cache,
+            workers=self.defaults.workers,
+            merge=False,
+        )
+
+    def submit(self, request):
+        """
+        Queue a job and return its status.
+
+        :raises ValueError: if the request is invalid.
+        :raises QueueFullError: if max_queue_depth jobs are already waiting.
+        """
+        job_args = self.build_job_args(request)
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "input": job_args.input,
+            "output": job_args.output,
+            "progress": 0.0,
+            "segments_completed": 0,
+            "segments_total": None,
+            "error": None,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        with self._jobs_lock:
+            try:
+                self._queue.put_nowait(job_id)
+            except queue.Full:
+                raise QueueFullError(
+                    f"The job queue is full ({self.max_queue_depth} waiting job(s)). Retry once queued jobs have started."
+                ) from None
+            self._jobs[job_id] = job
+            self._job_args[job_id] = job_args
+            self._forget_old_jobs()
+            logging.info(f"Queued job {job_id} for {job_args.input}")
+            return dict(job)
+
+    def get_job(self, job_id):
+        with self._jobs_lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_jobs(self):
+        with self._jobs_lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def read_result(self, job_id):
+        """
+        Return the job status and, once the job succeeded, the content of its SRT file.
+
+        :return: tuple, (job dict or None if the job is unknown, SRT text or None).
+        """
+        job = self.get_job(job_id)
+        if job is None or job["status"] != "succeeded":
+            return job, None
+
+        with open(job["output"], 'r', encoding='utf-8') as file:
+            return job, file.read()
+
+    def describe(self):
+        with self._jobs_lock:
+            statuses = [job["status"] for job in self._jobs.values()]
+        return {
+            "version": APP_VERSION,
+            "job_workers": self.job_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "queued": statuses.count("queued"),
+            "running": sum(1 for status in statuses if status not in FINISHED_JOB_STATUSES and status != "queued"),
+            "finished": sum(1 for status in statuses if status in FINISHED_JOB_STATUSES),
+        }
+
+    def _update_job(self, job_id, **changes):
+        with self._jobs_lock:
+            self._jobs[job_id].update(changes)
+
+    def _forget_old_jobs(self):
+        finished_ids = [job_id for job_id, job in self._jobs.items() if job["status"] in FINISHED_JOB_STATUSES]
+        for job_id in finished_ids[:max(0, len(finished_ids) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._jobs_lock:
+                job_args = self._job_args.pop(job_id)
+
+            if self._stopping.is_set():
+                self._update_job(job_id, status="failed", error="The service stopped before the job started.", finished_at=time.time())
+                continue
+            self._run_job(job_id, job_args)
+
+    def _run_job(self, job_id, job_args):
+        self._update_job(job_id, status="preparing", started_at=time.time())
+        work_dir = os.path.join(self.work_dir, SERVE_JOB_DIR_TEMPLATE.format(job_id))
+
+        def report_progress(segments_completed, segments_total):
+            self._update_job(
+                job_id,
+                segments_completed=segments_completed,
+                segments_total=segments_total,
+                progress=round(segments_completed / segments_total, 4),
+            )
+
+        srt_writer = None
+        try:
+            cleaning_mode = resolve_cleaning_mode(job_args.cleaning_mode)
+            prepared_audio = prepare_transcription_audio(job_args.input, cleaning_mode, already_resolved=True, work_dir=work_dir)
+            srt_writer = open_srt_writer(job_args)
+
+            with self._transcription_lock:
+                self._update_job(job_id, status="transcribing")
+                process_input(
+                    job_args,
+                    prepared_audio=prepared_audio,
+                    progress_callback=report_progress,
+                    work_dir=work_dir,
+                    on_segment_result=srt_writer.add_segment_result,
+                )
+
+            self._update_job(job_id, status="writing")
+            generate_output(job_args, srt_writer=srt_writer)
+
+            if not os.path.isfile(job_args.output):
+                raise RuntimeError(f"No subtitles were written to {job_args.output}.")
+        except (Exception, SystemExit) as e:
+            logging.error(f"Job {job_id} for {job_args.input} failed: {str(e)}", exc_info=True)
+            self._update_job(job_id, status="failed", error=str(e) or type(e).__name__, finished_at=time.time())
+        else:
+            logging.info(f"Job {job_id} wrote {job_args.output}")
+            self._update_job(job_id, status="succeeded", progress=1.0, finished_at=time.time())
+        finally:
+            if srt_writer is not None:
+                srt_writer.close()
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+class JobRequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    HTTP API of the transcription service.
+
+    POST /jobs queues a job, GET /jobs lists them, GET /jobs/<id> returns the status and progress of one job,
+    GET /jobs/<id>/srt returns its subtitles once it succeeded and GET /health describes the service.
+    """
+
+    server_version = f"SubtitlesGenerator/{APP_VERSION}"
+
+    def do_GET(self):
+        service = self.server.service
+        route = self.get_route()
+
+        if route == ["health"]:
+            self.send_json(200, service.describe())
+        elif route == ["jobs"]:
+            self.send_json(200, {"jobs": service.list_jobs()})
+        elif len(route) == 2 and route[0] == "jobs":
+            job = service.get_job(route[1])
+            if job is None:
+                self.send_json(404, {"error": f"Unknown job: {route[1]}"})
+            else:
+                self.send_json(200, job)
+        elif len(route) == 3 and route[0] == "jobs" and route[2] == "srt":
+            try:
+                job, srt_content = service.read_result(route[1])
+            except OSError as e:
+                self.send_json(500, {"error": f"Could not read the subtitles of job {route[1]}. Original error: {e}"})
+                return
+
+            if job is None:
+                self.send_json(404, {"error": f"Unknown job: {route[1]}"})
+            elif srt_content is None:
+                self.send_json(409, {"error": f"Job {route[1]} has no subtitles yet.", "job": job})
+            else:
+                self.send_body(200, srt_content.encode("utf-8"), "application/x-subrip; charset=utf-8")
+        else:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        if self.get_route() != ["jobs"]:
+            self.send_json(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            request = json.loads(body or b"{}")
+            job = self.server.service.submit(request)
+        except QueueFullError as e:
+            self.send_json(503, {"error": str(e)}, {"Retry-After": str(QUEUE_FULL_RETRY_AFTER_SECONDS)})
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+        else:
+            self.send_json(202, job, {"Location": f"/jobs/{job['id']}"})
+
+    def get_route(self):
+        return [part for part in urllib.parse.urlsplit(self.path).path.split("/") if part]
+
+    def send_json(self, status_code, payload, headers=None):
+        self.send_body(status_code, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json", headers)
+
+    def send_body(self, status_code, body, content_type, headers=None):
+        self.send_response(status_code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket clients have no address.
+        return self.client_address[0] if self.client_address else "unix-socket"
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()} - {format % args}")
+
+class UnixSocketHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def create_server(service, host="127.0.0.1", port=8765, socket_path=None):
+    """
+    Create the HTTP server of the service, on a TCP address or on a Unix socket when socket_path is given.
+
+    A stale socket file left by a previous run at socket_path is replaced.
+    """
+    if socket_path:
+        if os.path.exists(socket_path) and stat.S_ISSOCK(os.stat(socket_path).st_mode):
+            os.remove(socket_path)
+        server = UnixSocketHTTPServer(socket_path, JobRequestHandler)
+    else:
+        server = http.server.ThreadingHTTPServer((host, port), JobRequestHandler)
+
+    server.service = service
+    return server
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    serve_args = serve_execution_args()
+    service_work_dir = create_run_workspace(serve_args.workspace_root)
+    service = TranscriptionService(serve_args, serve_args.job_workers, serve_args.max_queue_depth, service_work_dir)
+    server = None
+
+    try:
+        service.warm_up()
+        service.start()
+        server = create_server(service, serve_args.host, serve_args.port, serve_args.socket)
+        address = serve_args.socket or f"http://{serve_args.host}:{serve_args.port}"
+        logging.info(f"Transcription service listening on {address} with {serve_args.job_workers} job worker(s).")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stopping the transcription service...")
+    except Exception as e:
+        logging.error(f"An error occurred while running the transcription service: {str(e)}", exc_info=True)
+    finally:
+        if server is not None:
+            server.server_close()
+        service.stop()
+
+        if serve_args.socket and os.path.exists(serve_args.socket):
+            os.remove(serve_args.socket)
+        remove_workspace(service_work_dir)
+
+        logging.info("Clean exit.")
@@ -90,4 +90,22 @@ def test_update_app_config_preserves_existing_nested_values(tmp_path):
     assert updated_config["speechbrain_strategy_settings"] == {
         "model_source": "speechbrain/metricgan-plus-voicebank",
         "validate_runtime_before_launch": False,
+        "chunk_seconds": 30,
+        "overlap_seconds": 1,
+        "torch_threads": None,
+    }
+
+
+def test_load_app_config_merges_transcription_settings(tmp_path):
+    config_path = tmp_path / "app-config.json"
+    config_path.write_text(json.dumps({"transcription_settings": {"model_name": "small"}}), encoding="utf-8")
+
+    config = app_config_module.load_app_config(
+        config_path=str(config_path),
+        legacy_cleaning_settings_path=None,
+    )
+
+    assert config["transcription_settings"] == {
+        "model_name": "small",
+        "device": None,
     }
@@ -0,0 +1,197 @@
+import array
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from basic_cleaning import (  # noqa: E402
+    BlockCompressor,
+    apply_basic_cleaning_chain,
+    build_filter_sections,
+    iter_basic_cleaning_chunks,
+)
+
+SAMPLE_RATE = 16000
+DEFAULT_SETTINGS = {
+    "high_pass_cutoff_hz": 120,
+    "low_pass_cutoff_hz": 7600,
+    "apply_dynamic_range_compression": True,
+    "apply_normalization": True,
+}
+
+
+# Per-sample ports of pydub.effects (mono, 16-bit) used as the reference. The suite stubs pydub, so the
+# reference cannot come from the installed package.
+def reference_high_pass_filter(samples, cutoff):
+    rc = 1.0 / (cutoff * 2 * math.pi)
+    alpha = rc / (rc + 1.0 / SAMPLE_RATE)
+    filtered = list(samples)
+    last_value = samples[0]
+    for index in range(1, len(samples)):
+        last_value = alpha * (last_value + samples[index] - samples[index - 1])
+        filtered[index] = int(min(max(last_value, -32768), 32767))
+    return filtered
+
+
+def reference_low_pass_filter(samples, cutoff):
+    rc = 1.0 / (cutoff * 2 * math.pi)
+    alpha = (1.0 / SAMPLE_RATE) / (rc + 1.0 / SAMPLE_RATE)
+    filtered = list(samples)
+    last_value = samples[0]
+    for index in range(1, len(samples)):
+        last_value = last_value + alpha * (samples[index] - last_value)
+        filtered[index] = int(last_value)
+    return filtered
+
+
+def audioop_mul(sample, factor):
+    return int(math.floor(min(max(sample * factor, -32768), 32767)))
+
+
+def reference_compress_dynamic_range(samples, threshold=-20.0, ratio=4.0, attack=5.0, release=50.0):
+    threshold_rms = 32768 * 10 ** (threshold / 20)
+    look_frames = int(SAMPLE_RATE * attack / 1000)
+    attack_frames = SAMPLE_RATE * attack / 1000
+    release_frames = SAMPLE_RATE * release / 1000
+    squares = [0]
+    for sample in samples:
+        squares.append(squares[-1] + sample * sample)
+
+    output = []
+    attenuation = 0.0
+    for index, sample in enumerate(samples):
+        window_start = max(0, index - look_frames)
+        window_size = index - window_start
+        rms_now = int(math.sqrt((squares[index] - squares[window_start]) / window_size)) if window_size else 0
+        db_over_threshold = max(20 * math.log10(rms_now / threshold_rms), 0) if rms_now else 0.0
+        max_attenuation = (1 - 1.0 / ratio) * db_over_threshold
+        if rms_now > threshold_rms and attenuation <= max_attenuation:
+            attenuation = min(attenuation + max_attenuation / attack_frames, max_attenuation)
+        else:
+            attenuation = max(attenuation - max_attenuation / release_frames, 0)
+        output.append(audioop_mul(sample, 10 ** (-attenuation / 20)) if attenuation != 0.0 else sample)
+    return output
+
+
+def reference_normalize(samples, headroom=0.1):
+    peak = max(abs(sample) for sample in samples)
+    if peak == 0:
+        return list(samples)
+    factor = 32768 * 10 ** (-headroom / 20) / peak
+    return [audioop_mul(sample, factor) for sample in samples]
+
+
+def reference_basic_cleaning(samples, settings):
+    cleaned = list(samples)
+    if settings.get("high_pass_cutoff_hz") is not None:
+        cleaned = reference_high_pass_filter(cleaned, settings["high_pass_cutoff_hz"])
+    if settings.get("low_pass_cutoff_hz") is not None:
+        cleaned = reference_low_pass_filter(cleaned, settings["low_pass_cutoff_hz"])
+    if settings.get("apply_dynamic_range_compression", True):
+        cleaned = reference_compress_dynamic_range(cleaned)
+    if settings.get("apply_normalization", True):
+        cleaned = reference_normalize(cleaned)
+    return cleaned
+
+
+def synthetic_speech_like_samples(seconds=1.0, seed=7):
+    # Loud and quiet tone bursts over low-level noise, with a DC offset for the high-pass filter to remove.
+    generator = np.random.default_rng(seed)
+    time_axis = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    envelope = np.where((time_axis % 0.25) < 0.12, 0.7, 0.05)
+    signal = envelope * np.sin(2 * np.pi * 440 * time_axis) + 0.02 * generator.standard_normal(time_axis.shape) + 0.05
+    return np.clip(np.round(signal * 32767), -32768, 32767).astype(np.int16)
+
+
+def assert_close_to_reference(samples, settings, max_abs_tolerance, rms_tolerance):
+    expected = np.asarray(reference_basic_cleaning(samples.tolist(), settings), dtype=np.float64)
+    actual = apply_basic_cleaning_chain(samples, SAMPLE_RATE, settings, chunk_frames=4000).astype(np.float64)
+
+    difference = actual - expected
+    assert np.max(np.abs(difference)) <= max_abs_tolerance
+    assert np.sqrt(np.mean(difference ** 2)) <= rms_tolerance
+
+
+def test_filters_match_pydub_one_pole_filters_within_rounding():
+    samples = synthetic_speech_like_samples(0.5)
+    settings = dict(DEFAULT_SETTINGS, apply_dynamic_range_compression=False, apply_normalization=False)
+
+    # pydub truncates to integers between the two filters; the float chain does not.
+    assert_close_to_reference(samples, settings, max_abs_tolerance=2, rms_tolerance=2)
+
+
+def test_compression_matches_pydub_within_tolerance():
+    samples = synthetic_speech_like_samples(1.0)
+    settings = dict(DEFAULT_SETTINGS, apply_normalization=False)
+
+    # The envelope is evaluated every quarter attack window instead of every sample, so gains differ slightly
+    # around burst onsets (at most about 3% of full scale) and by about 0.15 dB while compressing.
+    assert_close_to_reference(samples, settings, max_abs_tolerance=1100, rms_tolerance=100)
+
+
+def test_full_chain_matches_pydub_within_tolerance():
+    samples = synthetic_speech_like_samples(1.0)
+
+    # Normalization scales by the onset peak, which carries the compressor difference into the whole signal.
+    assert_close_to_reference(samples, DEFAULT_SETTINGS, max_abs_tolerance=1400, rms_tolerance=500)
+
+
+def test_chain_without_any_step_returns_input_unchanged():
+    samples = synthetic_speech_like_samples(0.1)
+    settings = {
+        "high_pass_cutoff_hz": None,
+        "low_pass_cutoff_hz": None,
+        "apply_dynamic_range_compression": False,
+        "apply_normalization": False,
+    }
+
+    np.testing.assert_array_equal(apply_basic_cleaning_chain(samples, SAMPLE_RATE, settings), samples)
+
+
+def test_chain_result_does_not_depend_on_chunk_size():
+    samples = synthetic_speech_like_samples(0.6)
+
+    whole = apply_basic_cleaning_chain(samples, SAMPLE_RATE, DEFAULT_SETTINGS, chunk_frames=len(samples))
+    chunked = apply_basic_cleaning_chain(samples, SAMPLE_RATE, DEFAULT_SETTINGS, chunk_frames=1000)
+
+    np.testing.assert_allclose(chunked.astype(np.int32), whole.astype(np.int32), atol=1)
+
+
+def test_chain_streams_bounded_chunks_equal_to_the_collected_result():
+    samples = synthetic_speech_like_samples(0.6)
+
+    chunks = list(iter_basic_cleaning_chunks(samples, SAMPLE_RATE, DEFAULT_SETTINGS, chunk_frames=1000))
+
+    assert all(chunk.dtype == np.int16 and len(chunk) <= 1000 for chunk in chunks)
+    np.testing.assert_array_equal(
+        np.concatenate(chunks), apply_basic_cleaning_chain(samples, SAMPLE_RATE, DEFAULT_SETTINGS, chunk_frames=1000)
+    )
+
+
+def test_chain_handles_silence_and_empty_input():
+    silence = np.zeros(800, dtype=np.int16)
+
+    np.testing.assert_array_equal(apply_basic_cleaning_chain(silence, SAMPLE_RATE, DEFAULT_SETTINGS), silence)
+    assert apply_basic_cleaning_chain(np.zeros(0, dtype=np.int16), SAMPLE_RATE, DEFAULT_SETTINGS).shape == (0,)
+
+
+def test_build_filter_sections_skips_disabled_filters():
+    assert build_filter_sections(SAMPLE_RATE) == []
+    assert len(build_filter_sections(SAMPLE_RATE, high_pass_cutoff_hz=120)) == 1
+    assert len(build_filter_sections(SAMPLE_RATE, 120, 7600)) == 2
+
+
+def test_block_compressor_holds_attenuation_while_below_threshold():
+    compressor = BlockCompressor(SAMPLE_RATE)
+    loud = np.full((1600, 1), 0.8, dtype=np.float32)
+    quiet = np.full((1600, 1), 0.01, dtype=np.float32)
+
+    loud_gain = compressor.process(loud)
+    quiet_gain = compressor.process(quiet)
+
+    assert loud_gain[0] > 0.95
+    assert loud_gain[-1] < 0.5
+    assert quiet_gain[-1] < 0.5
+    assert quiet_gain[-1] == pytest.approx(quiet_gain[200], rel=1e-6)
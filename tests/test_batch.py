@@ -0,0 +1,186 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import batch as batch_module
+
+
+def build_batch_args(**overrides):
+    batch_args = SimpleNamespace(
+        inputs=None,
+        manifest=None,
+        output_dir=None,
+        summary="batch-summary.json",
+        checkpoints=None,
+        auto_checkpoints=None,
+        segments=None,
+        skip_silence=False,
+        long_form=False,
+        language=None,
+        model=None,
+        device=None,
+        cleaning_mode=None,
+        no_transcription_cache=False,
+        workers=1,
+    )
+    for key, value in overrides.items():
+        setattr(batch_args, key, value)
+    return batch_args
+
+
+def test_collect_input_paths_accepts_directory_and_glob(tmp_path):
+    for name in ("b.mp3", "a.wav", "c.mp4"):
+        (tmp_path / name).write_bytes(b"data")
+    (tmp_path / "nested").mkdir()
+
+    assert batch_module.collect_input_paths(str(tmp_path)) == [str(tmp_path / name) for name in ("a.wav", "b.mp3", "c.mp4")]
+    assert batch_module.collect_input_paths(str(tmp_path / "*.mp3")) == [str(tmp_path / "b.mp3")]
+
+
+def test_load_manifest_skips_blank_lines_and_rejects_entries_without_input(tmp_path):
+    manifest_path = tmp_path / "manifest.jsonl"
+    manifest_path.write_text('{"input": "a.mp3", "language": "es"}\n\n{"input": "b.mp3"}\n', encoding="utf-8")
+
+    assert batch_module.load_manifest(str(manifest_path)) == [{"input": "a.mp3", "language": "es"}, {"input": "b.mp3"}]
+
+    manifest_path.write_text('{"input": "a.mp3"}\n{"output": "b.srt"}\n', encoding="utf-8")
+    with pytest.raises(ValueError, match="Manifest line 2"):
+        batch_module.load_manifest(str(manifest_path))
+
+
+def test_build_job_args_applies_manifest_overrides_and_default_output(tmp_path):
+    batch_args = build_batch_args(language="en", auto_checkpoints="5m", output_dir=str(tmp_path))
+
+    default_job = batch_module.build_job_args(batch_args, {"input": "/media/talk.mp4"})
+    manifest_job = batch_module.build_job_args(
+        batch_args, {"input": "/media/talk.mp4", "output": "/out/talk.srt", "language": "es", "segments": "00:10-00:50"}
+    )
+
+    assert default_job.output == os.path.join(str(tmp_path), "talk.srt")
+    assert default_job.language == "en"
+    assert default_job.auto_checkpoints == "5m"
+    assert manifest_job.output == "/out/talk.srt"
+    assert manifest_job.language == "es"
+    assert manifest_job.segments == "00:10-00:50"
+    assert manifest_job.auto_checkpoints is None
+
+
+class FakeSrtWriter:
+    def __init__(self, job_args):
+        self.output = job_args.output
+        self.segment_results = []
+        self.closed = False
+
+    def add_segment_result(self, segment_result):
+        self.segment_results.append(segment_result)
+
+    def close(self):
+        self.closed = True
+
+
+def test_run_batch_prepares_next_input_while_current_one_is_transcribed(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(batch_module, "open_srt_writer", FakeSrtWriter)
+    second_ingestion_started = threading.Event()
+    calls = []
+
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
+        calls.append(("prepare", input_path, cleaning_mode, work_dir))
+        if input_path == "b.mp3":
+            second_ingestion_started.set()
+        return f"{input_path}.wav", input_path
+
+    def fake_process_input(job_args, prepared_audio=None, work_dir=None, on_segment_result=None):
+        if job_args.input == "a.mp3":
+            assert second_ingestion_started.wait(timeout=5), "the next input should be prepared during transcription"
+        calls.append(("process", job_args.input, prepared_audio, work_dir))
+        on_segment_result({"start_ms": 0, "end_ms": 1000, "result": {"segments": [], "input": job_args.input}})
+
+    def fake_generate_output(job_args, srt_writer=None):
+        assert srt_writer.output == job_args.output
+        calls.append(("output", job_args.output, srt_writer.segment_results[0]["result"]["input"]))
+
+    monkeypatch.setattr(batch_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
+    monkeypatch.setattr(batch_module, "process_input", fake_process_input)
+    monkeypatch.setattr(batch_module, "generate_output", fake_generate_output)
+
+    jobs = [batch_module.build_job_args(build_batch_args(), {"input": name}) for name in ("a.mp3", "b.mp3")]
+    results = batch_module.run_batch(jobs, "basic")
+
+    assert [result["status"] for result in results] == ["succeeded", "succeeded"]
+    assert ("prepare", "a.mp3", "basic", os.path.join(f"{tmp_path}{os.sep}", "batch_job_0")) in calls
+    assert ("prepare", "b.mp3", "basic", os.path.join(f"{tmp_path}{os.sep}", "batch_job_1")) in calls
+    first_work_dir = os.path.join(f"{tmp_path}{os.sep}", "batch_job_0")
+    second_work_dir = os.path.join(f"{tmp_path}{os.sep}", "batch_job_1")
+    assert [call for call in calls if call[0] != "prepare"] == [
+        ("process", "a.mp3", ("a.mp3.wav", "a.mp3"), first_work_dir),
+        ("output", os.path.join(".", "a.srt"), "a.mp3"),
+        ("process", "b.mp3", ("b.mp3.wav", "b.mp3"), second_work_dir),
+        ("output", os.path.join(".", "b.srt"), "b.mp3"),
+    ]
+
+
+def test_run_batch_reports_failures_and_continues(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    srt_writers = []
+    monkeypatch.setattr(batch_module, "open_srt_writer", lambda job_args: srt_writers.append(FakeSrtWriter(job_args)) or srt_writers[-1])
+
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
+        if input_path == "missing.mp3":
+            raise SystemExit(1)
+        os.makedirs(work_dir, exist_ok=True)
+        return "working.wav", input_path
+
+    def fake_process_input(job_args, prepared_audio=None, work_dir=None, on_segment_result=None):
+        with open(os.path.join(work_dir, "speech_recognition_result_segment_000000_000010.json"), "w", encoding="utf-8") as file:
+            file.write("{}")
+        if job_args.input == "broken.mp3":
+            raise RuntimeError("decoder crashed")
+
+    monkeypatch.setattr(batch_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
+    monkeypatch.setattr(batch_module, "process_input", fake_process_input)
+    monkeypatch.setattr(batch_module, "generate_output", lambda job_args, srt_writer=None: None)
+
+    jobs = [batch_module.build_job_args(build_batch_args(), {"input": name}) for name in ("missing.mp3", "broken.mp3", "good.mp3")]
+    results = batch_module.run_batch(jobs, "off")
+
+    assert [(result["input"], result["status"], result["error"]) for result in results] == [
+        ("missing.mp3", "failed", "1"),
+        ("broken.mp3", "failed", "decoder crashed"),
+        ("good.mp3", "succeeded", None),
+    ]
+    assert os.listdir(tmp_path) == []
+    # The writer of the failed transcription is closed too, keeping its partial subtitles.
+    assert [(writer.output, writer.closed) for writer in srt_writers] == [
+        (os.path.join(".", "broken.srt"), True),
+        (os.path.join(".", "good.srt"), True),
+    ]
+
+
+def test_write_batch_summary_counts_statuses(tmp_path):
+    summary_path = tmp_path / "summary.json"
+    results = [
+        {"input": "a.mp3", "output": "a.srt", "status": "succeeded", "error": None, "seconds": 1.5},
+        {"input": "b.mp3", "output": "b.srt", "status": "failed", "error": "boom", "seconds": 0.1},
+    ]
+
+    batch_module.write_batch_summary(results, str(summary_path))
+
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert (summary["total"], summary["succeeded"], summary["failed"]) == (2, 1, 1)
+    assert summary["files"] == results
+
+
+def test_batch_execution_args_requires_inputs_or_manifest(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["batch.py", "--inputs", "media/*.mp3", "--language", "es", "--auto-checkpoints"])
+
+    args = batch_module.batch_execution_args()
+
+    assert (args.inputs, args.manifest, args.language, args.auto_checkpoints) == ("media/*.mp3", None, "es", "5m")
+
+    monkeypatch.setattr("sys.argv", ["batch.py", "--language", "es"])
+    with pytest.raises(SystemExit):
+        batch_module.batch_execution_args()
@@ -44,4 +44,8 @@ def test_save_cleaning_settings_writes_expected_fields(tmp_path):
         "auto_apply_cleaning_mode": True,
         "basic_strategy_settings": app_config_module.APP_CONFIG_DEFAULTS["basic_strategy_settings"],
         "speechbrain_strategy_settings": app_config_module.APP_CONFIG_DEFAULTS["speechbrain_strategy_settings"],
+        "transcription_settings": app_config_module.APP_CONFIG_DEFAULTS["transcription_settings"],
+        "audio_cache_settings": app_config_module.APP_CONFIG_DEFAULTS["audio_cache_settings"],
+        "transcription_cache_settings": app_config_module.APP_CONFIG_DEFAULTS["transcription_cache_settings"],
+        "workspace_settings": app_config_module.APP_CONFIG_DEFAULTS["workspace_settings"],
     }
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from file_cache import FileCache, hash_file, hash_key
+
+
+def set_mtime(file_path, timestamp):
+    os.utime(file_path, (timestamp, timestamp))
+
+
+def test_hash_key_is_stable_across_dict_ordering():
+    first_key = hash_key("input-hash", "basic", {"high_pass_cutoff_hz": 120, "apply_normalization": True})
+    second_key = hash_key("input-hash", "basic", {"apply_normalization": True, "high_pass_cutoff_hz": 120})
+
+    assert first_key == second_key
+    assert first_key != hash_key("input-hash", "basic", {"apply_normalization": False, "high_pass_cutoff_hz": 120})
+
+
+def test_hash_file_reads_content_in_chunks(tmp_path):
+    first_path = tmp_path / "first.bin"
+    second_path = tmp_path / "second.bin"
+    first_path.write_bytes(b"abc" * 1000)
+    second_path.write_bytes(b"abc" * 1000)
+
+    assert hash_file(str(first_path), chunk_size=7) == hash_file(str(second_path))
+
+
+def test_file_cache_restores_stored_file_at_destination(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_size_bytes=1024)
+    source_path = tmp_path / "working.wav"
+    source_path.write_bytes(b"working")
+    destination_path = tmp_path / "restored.wav"
+    destination_path.write_bytes(b"stale")
+
+    cache.store_file("key", str(source_path), ".wav")
+    source_path.unlink()
+
+    assert cache.restore("key", str(destination_path), ".wav") == str(destination_path)
+    assert destination_path.read_bytes() == b"working"
+    assert cache.restore("missing", str(tmp_path / "other.wav"), ".wav") is None
+
+
+def test_file_cache_evicts_least_recently_used_entries_by_size(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_size_bytes=10)
+    cache.store_bytes("first", b"1111")
+    cache.store_bytes("second", b"2222")
+    set_mtime(cache.path_for("first"), 1000)
+    set_mtime(cache.path_for("second"), 2000)
+
+    assert cache.read_bytes("first") == b"1111"
+    cache.store_bytes("third", b"3333")
+
+    assert cache.read_bytes("second") is None
+    assert cache.read_bytes("first") == b"1111"
+    assert cache.read_bytes("third") == b"3333"
+    assert cache.size() == 8
+
+
+def test_file_cache_ignores_partially_written_entries(tmp_path):
+    cache = FileCache(str(tmp_path / "cache"), max_size_bytes=0)
+    os.makedirs(cache.cache_dir)
+    (tmp_path / "cache" / "entry.123.tmp").write_bytes(b"partial")
+
+    assert cache.entries() == []
+    assert cache.evict() == []
+
+
+def test_file_cache_rejects_negative_size_limit(tmp_path):
+    with pytest.raises(ValueError, match="cannot be negative"):
+        FileCache(str(tmp_path), max_size_bytes=-1)
@@ -1,5 +1,9 @@
 import json
 import os
+import random
+from types import SimpleNamespace
+
+import pytest
 
 import generate_output
 
@@ -10,41 +14,56 @@ def _write_segments_file(tmp_dir, filename, segments):
     return file_path
 
 
-def test_create_srt_content_applies_offsets_and_merges_consecutive_segments(tmp_path, monkeypatch):
-    monkeypatch.setattr(generate_output, "TMP_DIR", f"{tmp_path}{os.sep}")
-
-    _write_segments_file(
-        tmp_path,
-        "speech_recognition_result_segment_000000_000003.json",
-        [
-            {"start": 0.0, "end": 1.0, "text": "Hello"},
-            {"start": 1.0, "end": 2.0, "text": "Hello"},
-            {"start": 2.0, "end": 3.5, "text": "World"},
-        ],
-    )
-    _write_segments_file(
-        tmp_path,
-        "speech_recognition_result_segment_000010_000011.json",
-        [{"start": 0.0, "end": 1.0, "text": "Again"}],
+def test_create_srt_content_from_results_orders_results_and_keeps_the_last_one_per_range():
+    segment_results = [
+        {"start_ms": 10500, "end_ms": 11000, "result": {"segments": [{"start": 0.0, "end": 0.5, "text": "Later"}]}},
+        {"start_ms": 0, "end_ms": 3000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "Stale"}]}},
+        {
+            "start_ms": 0,
+            "end_ms": 3000,
+            "result": {
+                "segments": [
+                    {"start": 0.0, "end": 1.0, "text": "Hello"},
+                    {"start": 1.0, "end": 2.0, "text": "Hello"},
+                ]
+            },
+        },
+    ]
+
+    srt_content = generate_output.create_srt_content_from_results(segment_results)
+
+    assert srt_content == (
+        "1\n00:00:00,000 --> 00:00:02,000\nHello\n\n"
+        "2\n00:00:10,500 --> 00:00:11,000\nLater\n\n"
     )
+    assert segment_results[0]["result"]["segments"][0]["start"] == 0.0
+
+
+def test_generate_output_writes_segment_results_without_reading_the_work_dir(tmp_path):
+    output_path = tmp_path / "output.srt"
+    args = SimpleNamespace(input=str(tmp_path / "input.mp3"), output=str(output_path), merge=False)
+    segment_results = [{"start_ms": 2000, "end_ms": 4000, "result": {"segments": [{"start": 0.5, "end": 1.0, "text": "Hi"}]}}]
+
+    generate_output.generate_output(args, segment_results=segment_results)
+
+    assert output_path.read_text(encoding="utf-8") == "1\n00:00:02,500 --> 00:00:03,000\nHi"
+
 
-    srt_content = generate_output.create_srt_content(
-        [
-            "speech_recognition_result_segment_000000_000003.json",
-            "speech_recognition_result_segment_000010_000011.json",
-        ]
-    )
 
-    subtitles = generate_output.parse_srt(srt_content)
+def test_create_srt_content_from_results_keeps_exact_times_far_into_long_inputs():
+    segment_results = [
+        {
+            "start_ms": 36000070 + index * 1000,
+            "end_ms": 36000070 + (index + 1) * 1000,
+            "result": {"segments": [{"start": 0.01, "end": 0.29, "text": f"Line {index}"}]},
+        }
+        for index in range(5000)
+    ]
 
-    assert [subtitle.text for subtitle in subtitles] == ["Hello", "World", "Again"]
-    assert [subtitle.index for subtitle in subtitles] == ["1", "2", "3"]
-    assert subtitles[0].time_to_str(subtitles[0].start) == "00:00:00,000"
-    assert subtitles[0].time_to_str(subtitles[0].end) == "00:00:02,000"
-    assert subtitles[1].time_to_str(subtitles[1].start) == "00:00:02,000"
-    assert subtitles[1].time_to_str(subtitles[1].end) == "00:00:03,500"
-    assert subtitles[2].time_to_str(subtitles[2].start) == "00:00:10,000"
-    assert subtitles[2].time_to_str(subtitles[2].end) == "00:00:11,000"
+    subtitles = generate_output.create_srt_content_from_results(segment_results).split("\n\n")
+
+    assert subtitles[0] == "1\n10:00:00,080 --> 10:00:00,360\nLine 0"
+    assert subtitles[4999] == "5000\n11:23:19,080 --> 11:23:19,360\nLine 4999"
 
 
 def test_merge_srt_content_replaces_overlaps_and_reindexes():
@@ -74,47 +93,110 @@ def test_merge_srt_content_replaces_overlaps_and_reindexes():
     assert subtitles[0].time_to_str(subtitles[0].end) == "00:00:04,500"
 
 
-def test_process_directory_writes_srt_output(tmp_path, monkeypatch):
-    monkeypatch.setattr(generate_output, "TMP_DIR", f"{tmp_path}{os.sep}")
-    _write_segments_file(
-        tmp_path,
-        "speech_recognition_result_segment_000000_000002.json",
-        [{"start": 0.0, "end": 2.0, "text": "Line one"}],
-    )
+def legacy_merge_srt_content(srt1_content, srt2_content):
+    """The original quadratic merge, kept as the reference for the merge semantics."""
+    merged_subtitles = generate_output.parse_srt(srt1_content)
+    for sub2 in generate_output.parse_srt(srt2_content):
+        merged_subtitles = [sub for sub in merged_subtitles if not (sub.start < sub2.end and sub2.start < sub.end)]
+        merged_subtitles = sorted(merged_subtitles + [sub2], key=lambda sub: sub.start)
+        for i, sub in enumerate(merged_subtitles, start=1):
+            sub.index = i
+    return "\n\n".join(sub.to_srt_block() for sub in merged_subtitles)
+
+
+def build_random_srt(rng, cue_count, prefix):
+    entries = []
+    for index in range(1, cue_count + 1):
+        # A coarse grid produces plenty of ties, touching cues, zero-length cues and overlaps.
+        start_ms = rng.randrange(0, 40) * 250
+        end_ms = start_ms + rng.choice([0, 250, 500, 1000, 3000])
+        entries.append(generate_output.build_subtitle_entry(index, start_ms, end_ms, f"{prefix} {index}"))
+    return "".join(entries)
+
 
+@pytest.mark.parametrize("seed", range(100))
+def test_merge_srt_content_matches_the_original_merge_semantics(seed):
+    rng = random.Random(seed)
+    existing_srt = build_random_srt(rng, rng.randrange(0, 30), "Existing")
+    new_srt = build_random_srt(rng, rng.randrange(0, 15), "New")
+
+    assert generate_output.merge_srt_content(existing_srt, new_srt) == legacy_merge_srt_content(existing_srt, new_srt)
+
+
+def test_srt_stream_writer_writes_cues_to_a_partial_file_before_renaming_it(tmp_path):
+    output_path = tmp_path / "output.srt"
+    partial_path = tmp_path / "output.srt.partial"
+    segment_results = [
+        {"start_ms": 0, "end_ms": 3000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "Hello"}, {"start": 1.0, "end": 2.0, "text": "World"}]}},
+        {"start_ms": 3000, "end_ms": 6000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "World"}, {"start": 1.5, "end": 2.5, "text": "Bye"}]}},
+        {"start_ms": 3000, "end_ms": 6000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "Repeated"}]}},
+        {"start_ms": 6000, "end_ms": 9000, "result": {"segments": []}},
+    ]
+    writer = generate_output.SrtStreamWriter(str(output_path))
+
+    writer.add_segment_result(segment_results[0])
+    # The first cue is final, the second may still be continued by the next segment.
+    assert partial_path.read_text(encoding="utf-8") == "1\n00:00:00,000 --> 00:00:01,000\nHello"
+    for segment_result in segment_results[1:]:
+        writer.add_segment_result(segment_result)
+    assert not output_path.exists()
+
+    writer.commit()
+    writer.close()
+
+    assert not partial_path.exists()
+    assert writer.cue_count == 3
+    assert output_path.read_text(encoding="utf-8") == generate_output.create_srt_content_from_results(segment_results[:2] + segment_results[3:]).strip()
+
+
+def test_srt_stream_writer_merges_into_existing_output_on_commit(tmp_path):
     output_path = tmp_path / "output.srt"
+    output_path.write_text("1\n00:00:00,000 --> 00:00:01,000\nKeep\n\n2\n00:00:01,000 --> 00:00:02,000\nOld\n", encoding="utf-8")
+    writer = generate_output.SrtStreamWriter(str(output_path), merge_subtitles=True)
 
-    generate_output.process_directory(str(output_path))
+    writer.add_segment_result({"start_ms": 1000, "end_ms": 2000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "Replacement"}]}})
+    assert "Old" in output_path.read_text(encoding="utf-8")
+    writer.commit()
 
-    assert output_path.read_text(encoding="utf-8") == (
-        "1\n"
-        "00:00:00,000 --> 00:00:02,000\n"
-        "Line one"
-    )
+    subtitles = generate_output.read_srt_file(str(output_path))
+    assert [subtitle.text for subtitle in subtitles] == ["Keep", "Replacement"]
+    assert not (tmp_path / "output.srt.partial").exists()
 
 
-def test_process_directory_merges_into_existing_output(tmp_path, monkeypatch):
-    monkeypatch.setattr(generate_output, "TMP_DIR", f"{tmp_path}{os.sep}")
-    _write_segments_file(
-        tmp_path,
-        "speech_recognition_result_segment_000001_000002.json",
-        [{"start": 0.0, "end": 1.0, "text": "Replacement"}],
-    )
+def test_srt_stream_writer_keeps_the_partial_file_of_an_unfinished_run(tmp_path, caplog):
+    output_path = tmp_path / "output.srt"
+    output_path.write_text("previous subtitles", encoding="utf-8")
+    writer = generate_output.SrtStreamWriter(str(output_path))
+
+    writer.add_segment_result({"start_ms": 0, "end_ms": 2000, "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "One"}, {"start": 1.0, "end": 2.0, "text": "Two"}]}})
+    writer.close()
+
+    assert output_path.read_text(encoding="utf-8") == "previous subtitles"
+    assert (tmp_path / "output.srt.partial").read_text(encoding="utf-8") == "1\n00:00:00,000 --> 00:00:01,000\nOne"
+    assert "output.srt.partial" in caplog.text
+
 
+@pytest.mark.parametrize("segment_results", [[], [{"start_ms": 0, "end_ms": 2000, "result": {"segments": []}}]])
+def test_srt_stream_writer_leaves_no_partial_file_when_a_run_fails_before_any_cue(tmp_path, caplog, segment_results):
     output_path = tmp_path / "output.srt"
-    output_path.write_text(
-        "1\n"
-        "00:00:00,000 --> 00:00:01,000\n"
-        "Keep\n\n"
-        "2\n"
-        "00:00:01,000 --> 00:00:02,000\n"
-        "Old\n",
-        encoding="utf-8",
-    )
+    writer = generate_output.SrtStreamWriter(str(output_path))
+    if not segment_results:
+        # Failures before the first segment, such as a missing input, never create the partial file.
+        assert not (tmp_path / "output.srt.partial").exists()
 
-    generate_output.process_directory(str(output_path), merge_subtitles=True)
+    for segment_result in segment_results:
+        writer.add_segment_result(segment_result)
+    writer.close()
 
-    subtitles = generate_output.parse_srt(output_path.read_text(encoding="utf-8"))
+    assert list(tmp_path.iterdir()) == []
+    assert "Subtitles were not completed" not in caplog.text
 
-    assert [subtitle.index for subtitle in subtitles] == ["1", "2"]
-    assert [subtitle.text for subtitle in subtitles] == ["Keep", "Replacement"]
+
+def test_write_srt_output_replaces_the_output_without_leaving_a_partial_file(tmp_path):
+    output_path = tmp_path / "output.srt"
+    output_path.write_text("old", encoding="utf-8")
+
+    generate_output.write_srt_output(str(output_path), "1\n00:00:00,000 --> 00:00:01,000\nNew\n\n")
+
+    assert output_path.read_text(encoding="utf-8") == "1\n00:00:00,000 --> 00:00:01,000\nNew"
+    assert os.listdir(tmp_path) == ["output.srt"]
@@ -2,7 +2,11 @@ import logging
 
 import pytest
 
-from generate_output import convert_to_srt_time, extract_time_from_filename, validate_output
+from generate_output import (
+    convert_to_srt_time,
+    format_srt_time,
+    validate_output,
+)
 
 
 def test_validate_output_returns_default_file_for_directory(tmp_path):
@@ -45,11 +49,6 @@ def test_convert_to_srt_time(time_in_seconds, expected):
     assert convert_to_srt_time(time_in_seconds) == expected
 
 
-def test_extract_time_from_filename_returns_segment_start_offset():
-    filename = "speech_recognition_result_segment_010203_010303.json"
-
-    assert extract_time_from_filename(filename) == 3723
-
-
-def test_extract_time_from_filename_returns_none_for_invalid_names():
-    assert extract_time_from_filename("invalid.json") is None
+def test_format_srt_time_formats_integer_milliseconds():
+    assert format_srt_time(90002500) == "25:00:02,500"
+    assert format_srt_time(0) == "00:00:00,000"
@@ -0,0 +1,23 @@
+from interval_overlap import find_kept_intervals
+
+
+def test_find_kept_intervals_drops_base_intervals_overlapped_by_replacements():
+    base_intervals = [(0, 2), (2, 4), (5, 6), (6, 6)]
+
+    kept_base, kept_replacements = find_kept_intervals(base_intervals, [(1, 3), (6, 7)])
+
+    # (5, 6) only touches the replacement starting at 6, and the zero-length (6, 6) is not inside (6, 7).
+    assert kept_base == [2, 3]
+    assert kept_replacements == [0, 1]
+
+
+def test_find_kept_intervals_lets_later_replacements_win():
+    kept_base, kept_replacements = find_kept_intervals([], [(0, 5), (10, 12), (4, 6), (11, 11), (20, 25)])
+
+    assert kept_base == []
+    # (0, 5) is replaced by (4, 6), and (10, 12) by the zero-length (11, 11) inside it.
+    assert kept_replacements == [2, 3, 4]
+
+
+def test_find_kept_intervals_keeps_everything_without_replacements():
+    assert find_kept_intervals([(3, 4), (0, 1)], []) == ([0, 1], [])
@@ -0,0 +1,69 @@
+from long_form import TranscriptContext, plan_transcription_windows, reconcile_window_result
+
+
+def build_word(text, start, end):
+    return {"text": text, "start": start, "end": end, "confidence": 0.9}
+
+
+def test_plan_transcription_windows_tiles_each_segment_with_seams_in_the_overlaps():
+    windows = plan_transcription_windows([(0, 70000), (100000, 110000)], 30000, 5000)
+
+    assert windows == [
+        (0, 30000, 0, 27500),
+        (25000, 55000, 27500, 52500),
+        (50000, 70000, 52500, 70000),
+        (100000, 110000, 100000, 110000),
+    ]
+
+
+def test_reconcile_window_result_keeps_seam_words_once_and_rebases_times():
+    result = {
+        "text": " one two three four",
+        "segments": [
+            {
+                "start": 1.0,
+                "end": 4.0,
+                "text": " one two three",
+                "words": [build_word("one", 1.0, 1.5), build_word("two", 2.0, 2.9), build_word("three", 3.2, 4.0)],
+            },
+            {"start": 4.5, "end": 5.0, "text": " four", "words": [build_word("four", 4.5, 5.0)]},
+        ],
+    }
+
+    # The window starts at 10 s and owns 12 s to 13 s of the timeline.
+    reconciled = reconcile_window_result(result, 10000, 20000, 12000, 13000)
+
+    assert reconciled["segments"] == [
+        {"start": 0.0, "end": 0.9, "text": " two", "words": [build_word("two", 0.0, 0.9)]}
+    ]
+    assert reconciled["text"] == " two"
+
+
+def test_reconcile_window_result_keeps_everything_at_window_edges_and_uses_midpoints_without_words():
+    result = {
+        "segments": [
+            {"start": 0.0, "end": 2.0, "text": " early"},
+            {"start": 8.0, "end": 10.5, "text": " late"},
+        ]
+    }
+
+    assert [segment["text"] for segment in reconcile_window_result(result, 0, 10000, 0, 10000)["segments"]] == [" early", " late"]
+    assert [segment["text"] for segment in reconcile_window_result(result, 0, 10000, 5000, 10000)["segments"]] == [" late"]
+    assert [segment["text"] for segment in reconcile_window_result(result, 0, 10000, 0, 5000)["segments"]] == [" early"]
+
+
+def test_transcript_context_prompts_with_the_bounded_words_before_a_window():
+    context = TranscriptContext(max_words=3)
+    context.add_result(
+        {
+            "segments": [
+                {"start": 0.0, "end": 3.0, "text": " a b c", "words": [build_word("a", 0.0, 1.0), build_word("b", 1.0, 2.0), build_word("c", 2.0, 3.0)]},
+                {"start": 3.0, "end": 5.0, "text": " d e"},
+            ]
+        },
+        offset_ms=10000,
+    )
+
+    assert TranscriptContext(max_words=3).build_prompt(0) is None
+    assert context.build_prompt(12000) == "a b"
+    assert context.build_prompt(20000) == "c d e"
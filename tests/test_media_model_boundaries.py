@@ -1,13 +1,21 @@
+import contextlib
 import json
 import logging
 import os
+import shutil
+import threading
+import time
 import types
+import wave
 from pathlib import Path
 
 import pytest
 from pydub.exceptions import CouldntDecodeError
 
+import basic_cleaning as basic_cleaning_module
 import process_input as process_input_module
+import run_journal as run_journal_module
+import stage_metrics as stage_metrics_module
 
 
 class FakeAudioSegmentSlice:
@@ -243,6 +251,7 @@ def test_extract_audio_logs_and_reraises_errors(monkeypatch, caplog):
 
 def test_prepare_working_audio_normalizes_audio_input_to_wav(tmp_path, monkeypatch):
     monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: None)
 
     source_audio = FakeExportableAudio()
     normalized_audio = object()
@@ -271,6 +280,7 @@ def test_prepare_working_audio_normalizes_audio_input_to_wav(tmp_path, monkeypat
 def test_prepare_working_audio_creates_tmp_dir_before_writing_audio(tmp_path, monkeypatch):
     tmp_dir = tmp_path / "missing" / "tmp"
     monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_dir}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: None)
 
     source_audio = FakeExportableAudio()
     normalized_audio = object()
@@ -300,6 +310,7 @@ def test_prepare_working_audio_creates_tmp_dir_before_writing_audio(tmp_path, mo
 
 def test_prepare_working_audio_extracts_video_to_wav(tmp_path, monkeypatch):
     monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: None)
 
     calls = {}
     normalized_audio = object()
@@ -741,16 +752,143 @@ def test_apply_speechbrain_audio_cleaning_reports_enhancement_failure(monkeypatc
     assert isinstance(exc_info.value.__cause__, RuntimeError)
 
 
+def test_apply_speechbrain_audio_cleaning_loads_the_enhancer_once_per_process(tmp_path, monkeypatch, caplog):
+    loaded_enhancers = []
+
+    class FakeEnhancer:
+        def enhance_file(self, input_path, output_path):
+            Path(output_path).write_text("enhanced audio", encoding="utf-8")
+
+    def fake_load_speechbrain_enhancer():
+        loaded_enhancers.append(FakeEnhancer())
+        return loaded_enhancers[-1]
+
+    monkeypatch.setattr(process_input_module, "load_speechbrain_enhancer", fake_load_speechbrain_enhancer)
+
+    with caplog.at_level(logging.INFO):
+        for run_number in range(2):
+            process_input_module.apply_speechbrain_audio_cleaning("working.wav", str(tmp_path / f"cleaned_{run_number}.wav"))
+
+    assert len(loaded_enhancers) == 1
+    assert "Reusing cached SpeechBrain enhancer." in caplog.text
+    assert (tmp_path / "cleaned_1.wav").exists()
+
+
+def test_apply_speechbrain_audio_cleaning_enhances_one_input_at_a_time(tmp_path, monkeypatch):
+    active = []
+    overlaps = []
+
+    class FakeEnhancer:
+        def enhance_file(self, input_path, output_path):
+            active.append(input_path)
+            overlaps.append(len(active) > 1)
+            time.sleep(0.05)
+            Path(output_path).write_text("enhanced audio", encoding="utf-8")
+            active.remove(input_path)
+
+    monkeypatch.setattr(process_input_module, "load_speechbrain_enhancer", lambda: FakeEnhancer())
+    threads = [
+        threading.Thread(
+            target=process_input_module.apply_speechbrain_audio_cleaning,
+            args=(f"working_{index}.wav", str(tmp_path / f"cleaned_{index}.wav")),
+        )
+        for index in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert overlaps == [False, False, False]
+
+
+def test_apply_speechbrain_audio_cleaning_enhances_working_audio_in_overlapping_chunks(tmp_path, monkeypatch, caplog):
+    np = pytest.importorskip("numpy")
+    working_audio_path = tmp_path / "working.wav"
+    cleaned_audio_path = tmp_path / "cleaned.wav"
+    samples = (np.sin(np.arange(5000) / 5.0) * 8000).astype(np.int16)
+    with wave.open(str(working_audio_path), "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(process_input_module.TRANSCRIPTION_SAMPLE_RATE)
+        output_file.writeframes(samples.tobytes())
+
+    calls = {"enhanced_lengths": [], "threads": None}
+
+    class FakeTensor:
+        def __init__(self, array):
+            self.array = array
+
+        def unsqueeze(self, _dim):
+            return FakeTensor(self.array[None, :])
+
+        def detach(self):
+            return self
+
+        def cpu(self):
+            return self
+
+        def numpy(self):
+            return self.array
+
+    class FakeTorch:
+        @staticmethod
+        def set_num_threads(thread_count):
+            calls["threads"] = thread_count
+
+        @staticmethod
+        def set_num_interop_threads(_thread_count):
+            raise RuntimeError("inter-op threads already set")
+
+        @staticmethod
+        def from_numpy(array):
+            return FakeTensor(array)
+
+        @staticmethod
+        def tensor(values):
+            return values
+
+        @staticmethod
+        def no_grad():
+            return contextlib.nullcontext()
+
+    class FakeEnhancer:
+        def enhance_batch(self, noisy, lengths):
+            calls["enhanced_lengths"].append(noisy.array.shape[1])
+            return noisy
+
+        def enhance_file(self, input_path, output_path):
+            raise AssertionError("memory-mapped working audio should be enhanced in chunks")
+
+    monkeypatch.setattr(process_input_module.importlib, "import_module", lambda module_name: FakeTorch)
+    monkeypatch.setattr(process_input_module, "load_speechbrain_enhancer", lambda: FakeEnhancer())
+
+    strategy_settings = {"chunk_seconds": 0.125, "overlap_seconds": 0.025, "torch_threads": 3}
+    with caplog.at_level(logging.INFO):
+        process_input_module.apply_speechbrain_audio_cleaning(
+            str(working_audio_path),
+            str(cleaned_audio_path),
+            process_input_module.open_working_audio(str(working_audio_path)),
+            strategy_settings,
+        )
+
+    cleaned_audio = process_input_module.open_working_audio(str(cleaned_audio_path))
+    assert calls["threads"] == 3
+    assert calls["enhanced_lengths"] == [2000, 2000, 1800]
+    assert "SpeechBrain enhanced chunk 3/3." in caplog.text
+    np.testing.assert_allclose(np.asarray(cleaned_audio.samples), samples, atol=1)
+
+
 def test_prepare_transcription_audio_applies_cleaning_after_working_audio_creation(monkeypatch):
     calls = {}
     working_audio = object()
     cleaned_audio = object()
 
-    def fake_prepare_working_audio(input_path):
+    def fake_prepare_working_audio(input_path, media_probe=None, work_dir=None):
         calls["prepare_working_audio"] = input_path
         return "working.wav", working_audio
 
-    def fake_apply_audio_cleaning(working_audio_path, cleaning_mode=None, received_audio=None, already_resolved=False):
+    def fake_apply_audio_cleaning(working_audio_path, cleaning_mode=None, received_audio=None, already_resolved=False, work_dir=None):
         calls["apply_audio_cleaning"] = (working_audio_path, cleaning_mode, received_audio, already_resolved)
         return "cleaned.wav", cleaned_audio
 
@@ -826,8 +964,8 @@ def test_process_audio_segments_exports_transcribes_and_writes_json(tmp_path, mo
 
     temp_audio_1 = os.path.join(process_input_module.TMP_DIR, "temp_segment_1.wav")
     temp_audio_2 = os.path.join(process_input_module.TMP_DIR, "temp_segment_2.wav")
-    output_json_1 = tmp_path / "result_000000_000002.json"
-    output_json_2 = tmp_path / "result_000002_000004.json"
+    output_json_1 = tmp_path / "result_000000.000_000002.000.json"
+    output_json_2 = tmp_path / "result_000002.000_000004.000.json"
 
     assert input_audio.segment_requests == [(0, 2000), (2000, 4000)]
     assert input_audio.exported_paths == [(temp_audio_1, "wav"), (temp_audio_2, "wav")]
@@ -869,7 +1007,7 @@ def test_process_audio_segments_wraps_transcription_failures(tmp_path, monkeypat
 
     assert isinstance(exc_info.value.__cause__, RuntimeError)
     assert str(exc_info.value.__cause__) == "transcription failed"
-    assert not (tmp_path / "result_000000_000002.json").exists()
+    assert not (tmp_path / "result_000000.000_000002.000.json").exists()
     assert not (tmp_path / "temp_segment_1.wav").exists()
 
 
@@ -931,7 +1069,7 @@ def test_process_audio_segments_cleans_partial_json_when_write_fails(tmp_path, m
             f"{tmp_path}{os.sep}result_{{}}.json",
         )
 
-    assert not (tmp_path / "result_000000_000002.json").exists()
+    assert not (tmp_path / "result_000000.000_000002.000.json").exists()
     assert not (tmp_path / "temp_segment_1.wav").exists()
 
 
@@ -948,4 +1086,865 @@ def test_process_audio_segments_cleans_partial_temp_file_when_export_fails(tmp_p
         )
 
     assert not (tmp_path / "temp_segment_1.wav").exists()
-    assert not (tmp_path / "result_000000_000002.json").exists()
+    assert not (tmp_path / "result_000000.000_000002.000.json").exists()
+
+
+class FakeWorkingAudioSegment:
+    def __init__(self, raw_data):
+        self.raw_data = raw_data
+        self.conversions = []
+
+    def set_frame_rate(self, frame_rate):
+        self.conversions.append(("frame_rate", frame_rate))
+        return self
+
+    def set_channels(self, channels):
+        self.conversions.append(("channels", channels))
+        return self
+
+    def set_sample_width(self, sample_width):
+        self.conversions.append(("sample_width", sample_width))
+        return self
+
+    def __getitem__(self, item):
+        raise AssertionError("segments should not be sliced from the AudioSegment when the sample buffer is available")
+
+
+def test_load_transcription_samples_decodes_working_audio_to_float32_mono():
+    np = pytest.importorskip("numpy")
+    working_audio = FakeWorkingAudioSegment(np.array([0, 16384, -32768], dtype=np.int16).tobytes())
+
+    samples = process_input_module.load_transcription_samples(working_audio)
+
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+    assert working_audio.conversions == [
+        ("frame_rate", process_input_module.TRANSCRIPTION_SAMPLE_RATE),
+        ("channels", 1),
+        ("sample_width", 2),
+    ]
+
+
+def test_load_transcription_samples_returns_none_when_audio_cannot_be_converted(caplog):
+    with caplog.at_level(logging.INFO):
+        assert process_input_module.load_transcription_samples(object()) is None
+
+    assert "temporary WAV files will be used instead" in caplog.text
+
+
+def test_process_audio_segments_hands_sample_views_to_whisper_without_temp_files(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.arange(4 * sample_rate, dtype=np.float32)
+    transcribed_audio = []
+    progress = []
+
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "load_audio",
+        lambda file_path: (_ for _ in ()).throw(AssertionError("whisper.load_audio should not be used for in-memory segments")),
+    )
+
+    def fake_transcribe(model, audio, language=None):
+        transcribed_audio.append(audio)
+        return {"segments": []}
+
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", fake_transcribe)
+
+    process_input_module.process_audio_segments(
+        FakeWorkingAudioSegment(b""),
+        [(0, 1500), (1500, 4000)],
+        "en",
+        "fake-model",
+        f"{tmp_path}{os.sep}result_{{}}.json",
+        input_samples=samples,
+        progress_callback=lambda completed, total: progress.append((completed, total)),
+    )
+
+    assert progress == [(1, 2), (2, 2)]
+    assert [len(audio) for audio in transcribed_audio] == [int(1.5 * sample_rate), int(2.5 * sample_rate)]
+    assert all(np.shares_memory(audio, samples) for audio in transcribed_audio)
+    assert transcribed_audio[1][0] == int(1.5 * sample_rate)
+    assert not any(path.name.startswith("temp_segment_") for path in tmp_path.iterdir())
+    assert (tmp_path / "result_000000.000_000001.500.json").exists()
+    assert (tmp_path / "result_000001.500_000004.000.json").exists()
+
+
+def test_process_audio_segments_returns_results_without_writing_json_when_checkpointing_is_disabled(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+
+    samples = np.zeros(3 * process_input_module.TRANSCRIPTION_SAMPLE_RATE, dtype=np.float32)
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "transcribe",
+        lambda model, audio, language=None: {"segments": [{"start": 0.0, "end": 0.5, "text": f"{len(audio)} samples"}]},
+    )
+
+    segment_results = process_input_module.process_audio_segments(
+        FakeWorkingAudioSegment(b""),
+        [(0, 1000), (1000, 3000)],
+        "en",
+        "fake-model",
+        None,
+        input_samples=samples,
+    )
+
+    assert segment_results == [
+        {"start_ms": 0, "end_ms": 1000, "result": {"segments": [{"start": 0.0, "end": 0.5, "text": "16000 samples"}]}},
+        {"start_ms": 1000, "end_ms": 3000, "result": {"segments": [{"start": 0.0, "end": 0.5, "text": "32000 samples"}]}},
+    ]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_process_audio_segments_skips_journaled_segments_and_journals_the_others(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+
+    samples = np.zeros(3 * process_input_module.TRANSCRIPTION_SAMPLE_RATE, dtype=np.float32)
+    transcribed = []
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "transcribe",
+        lambda model, audio, language=None: transcribed.append(len(audio)) or {"segments": [{"start": 0.0, "end": 0.5, "text": "new"}]},
+    )
+    journal_path = str(tmp_path / "output.srt.journal.jsonl")
+    journal = process_input_module.RunJournal(journal_path, "config")
+    journal.record(0, 1000, {"segments": [{"start": 0.0, "end": 0.5, "text": "journaled"}]})
+    journal.close()
+
+    run_journal = process_input_module.RunJournal(journal_path, "config", resume=True)
+    progress = []
+    segment_results = process_input_module.process_audio_segments(
+        FakeWorkingAudioSegment(b""),
+        [(0, 1000), (1000, 3000)],
+        "en",
+        "fake-model",
+        None,
+        input_samples=samples,
+        progress_callback=lambda completed, total: progress.append((completed, total)),
+        run_journal=run_journal,
+    )
+    run_journal.close()
+
+    assert transcribed == [2 * process_input_module.TRANSCRIPTION_SAMPLE_RATE]
+    assert progress == [(1, 2), (2, 2)]
+    assert [result["result"]["segments"][0]["text"] for result in segment_results] == ["journaled", "new"]
+    assert sorted(run_journal_module.read_run_journal(journal_path, "config")) == [(0, 1000), (1000, 3000)]
+
+
+def test_process_audio_segments_records_per_segment_stages(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", lambda model, audio, language=None: {"segments": []})
+    samples = np.zeros(2 * process_input_module.TRANSCRIPTION_SAMPLE_RATE, dtype=np.float32)
+
+    recorder = stage_metrics_module.start_stage_metrics()
+    try:
+        process_input_module.process_audio_segments(
+            FakeWorkingAudioSegment(b""), [(0, 1000), (1000, 2000)], "en", "fake-model", f"{tmp_path}{os.sep}result_{{}}.json", input_samples=samples
+        )
+    finally:
+        stage_metrics_module.stop_stage_metrics()
+
+    assert [span["path"] for span in recorder.build_report()["stages"]] == [
+        "segment",
+        "segment/export",
+        "segment/cache_lookup",
+        "segment/export",
+        "segment/decode",
+        "segment/json_write",
+    ] * 2
+    assert [span["attributes"] for span in recorder.spans if span["name"] == "segment"] == [
+        {"number": 1, "start_ms": 0, "end_ms": 1000},
+        {"number": 2, "start_ms": 1000, "end_ms": 2000},
+    ]
+
+
+class InProcessExecutor:
+    """Synchronous stand-in for ProcessPoolExecutor that runs the worker initializer in the test process."""
+
+    instances = []
+
+    def __init__(self, max_workers=None, mp_context=None, initializer=None, initargs=()):
+        self.max_workers = max_workers
+        self.initargs = initargs
+        self.shutdown_calls = []
+        initializer(*initargs)
+        InProcessExecutor.instances.append(self)
+
+    def submit(self, function, *args):
+        future = process_input_module.concurrent.futures.Future()
+        try:
+            future.set_result(function(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append((wait, cancel_futures))
+
+
+def test_process_audio_segments_in_parallel_loads_model_once_per_worker_and_writes_ordered_json(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "transcription_worker_state", {})
+    InProcessExecutor.instances = []
+
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.arange(3 * sample_rate, dtype=np.float32)
+    loaded_models = []
+    transcribed = []
+
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: samples)
+    monkeypatch.setattr(process_input_module.concurrent.futures, "ProcessPoolExecutor", InProcessExecutor)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: loaded_models.append((model_name, device)) or "fake-model")
+
+    def fake_transcribe(model, audio, language=None):
+        transcribed.append((model, int(audio[0]), len(audio), language))
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": f"from {int(audio[0])}"}]}
+
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", fake_transcribe)
+
+    segment_results = process_input_module.process_audio_segments_in_parallel(
+        object(),
+        [(0, 1000), (1000, 2000), (2000, 3000)],
+        "es",
+        "tiny",
+        f"{tmp_path}{os.sep}result_{{}}.json",
+        workers=8,
+    )
+
+    executor = InProcessExecutor.instances[0]
+    assert executor.max_workers == 3
+    assert executor.initargs[0] == "tiny"
+    assert loaded_models == [("tiny", "cpu")]
+    assert transcribed == [
+        ("fake-model", 0, sample_rate, "es"),
+        ("fake-model", sample_rate, sample_rate, "es"),
+        ("fake-model", 2 * sample_rate, sample_rate, "es"),
+    ]
+    assert sorted(path.name for path in tmp_path.glob("result_*.json")) == [
+        "result_000000.000_000001.000.json",
+        "result_000001.000_000002.000.json",
+        "result_000002.000_000003.000.json",
+    ]
+    assert json.loads((tmp_path / "result_000001.000_000002.000.json").read_text(encoding="utf-8"))["segments"][0]["text"] == f"from {sample_rate}"
+    assert [(result["start_ms"], result["end_ms"]) for result in segment_results] == [(0, 1000), (1000, 2000), (2000, 3000)]
+    assert segment_results[1]["result"]["segments"][0]["text"] == f"from {sample_rate}"
+    assert executor.shutdown_calls == [(True, True)]
+    assert not (tmp_path / process_input_module.TRANSCRIPTION_SAMPLES_FILENAME).exists()
+
+
+def test_process_audio_segments_in_parallel_reports_failing_segment(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "transcription_worker_state", {})
+
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: np.zeros(32000, dtype=np.float32))
+    monkeypatch.setattr(process_input_module.concurrent.futures, "ProcessPoolExecutor", InProcessExecutor)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+
+    def fake_transcribe(model, audio, language=None):
+        raise RuntimeError("transcription failed")
+
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", fake_transcribe)
+
+    with pytest.raises(RuntimeError, match="audio segment #1: transcription failed"):
+        process_input_module.process_audio_segments_in_parallel(
+            object(),
+            [(0, 1000), (1000, 2000)],
+            "en",
+            "tiny",
+            f"{tmp_path}{os.sep}result_{{}}.json",
+            workers=2,
+        )
+
+    assert not list(tmp_path.glob("result_*.json"))
+    assert not (tmp_path / process_input_module.TRANSCRIPTION_SAMPLES_FILENAME).exists()
+
+
+def test_process_audio_segments_in_parallel_requires_sample_buffer(monkeypatch):
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: None)
+
+    with pytest.raises(RuntimeError, match="Parallel transcription requires the in-memory sample buffer"):
+        process_input_module.process_audio_segments_in_parallel(object(), [(0, 1000), (1000, 2000)], "en", "tiny", "result_{}.json", workers=2)
+
+
+class FakeFfmpegProcess:
+    def __init__(self, chunks, return_code=0, stderr_output=b""):
+        self.stdout = FakeFfmpegStdout(chunks)
+        self.return_code = return_code
+        self.stderr_output = stderr_output
+        self.killed = False
+
+    def wait(self):
+        return self.return_code
+
+    def kill(self):
+        self.killed = True
+
+
+class FakeFfmpegStdout:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.read_sizes = []
+        self.closed = False
+
+    def read(self, size):
+        self.read_sizes.append(size)
+        return self.chunks.pop(0) if self.chunks else b""
+
+    def close(self):
+        self.closed = True
+
+
+def install_fake_ffmpeg(monkeypatch, process):
+    commands = []
+
+    def fake_popen(command, stdout=None, stderr=None):
+        commands.append(command)
+        stderr.write(process.stderr_output)
+        return process
+
+    monkeypatch.setattr(process_input_module.subprocess, "Popen", fake_popen)
+    return commands
+
+
+def test_stream_audio_to_working_wav_writes_chunks_into_16khz_mono_wav(tmp_path, monkeypatch):
+    process = FakeFfmpegProcess([b"\x01\x00\x02\x00", b"\x03\x00"])
+    commands = install_fake_ffmpeg(monkeypatch, process)
+    output_path = tmp_path / "working.wav"
+
+    bytes_written = process_input_module.stream_audio_to_working_wav("input.mp3", str(output_path), ffmpeg_path="ffmpeg")
+
+    header = process_input_module.read_wav_header(str(output_path))
+    assert bytes_written == 6
+    assert header.sample_rate == process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    assert header.channels == 1
+    assert header.frame_count == 3
+    assert commands[0][:5] == ["ffmpeg", "-nostdin", "-v", "error", "-i"]
+    assert commands[0][5] == "input.mp3"
+    assert commands[0][commands[0].index("-ac") + 1] == "1"
+    assert process.stdout.read_sizes == [process_input_module.INGESTION_CHUNK_SIZE] * 3
+    assert process.stdout.closed is True
+
+
+def test_stream_audio_to_working_wav_reports_decode_errors_and_removes_partial_output(tmp_path, monkeypatch):
+    process = FakeFfmpegProcess([b"\x01\x00"], return_code=1, stderr_output=b"Invalid data found when processing input")
+    install_fake_ffmpeg(monkeypatch, process)
+    output_path = tmp_path / "working.wav"
+
+    with pytest.raises(RuntimeError, match="Invalid data found when processing input"):
+        process_input_module.stream_audio_to_working_wav("broken.mp3", str(output_path), ffmpeg_path="ffmpeg")
+
+    assert not output_path.exists()
+
+
+def test_prepare_working_audio_streams_audio_input_without_pydub_decoding(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(process_input_module, "is_video_file", lambda input_path: False)
+    monkeypatch.setattr(
+        process_input_module,
+        "validate_audio_file",
+        lambda file_path: (_ for _ in ()).throw(AssertionError("streaming ingestion should not decode with pydub")),
+    )
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"mp3")
+    streamed = []
+
+    def fake_stream(source_path, output_path, ffmpeg_path=None):
+        streamed.append((source_path, output_path))
+        with wave.open(output_path, "wb") as output_file:
+            output_file.setnchannels(1)
+            output_file.setsampwidth(2)
+            output_file.setframerate(process_input_module.TRANSCRIPTION_SAMPLE_RATE)
+            output_file.writeframes(b"\x00\x00" * 32000)
+        return 64000
+
+    monkeypatch.setattr(process_input_module, "stream_audio_to_working_wav", fake_stream)
+
+    working_audio_path, working_audio = process_input_module.prepare_working_audio(str(input_path))
+
+    assert working_audio_path == os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME)
+    assert streamed == [(str(input_path), working_audio_path)]
+    assert isinstance(working_audio, process_input_module.WorkingAudio)
+    assert len(working_audio) == 2000
+
+
+def test_prepare_working_audio_extracts_video_audio_directly_with_ffmpeg(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(process_input_module, "is_video_file", lambda input_path: True)
+    monkeypatch.setattr(
+        process_input_module,
+        "extract_audio",
+        lambda video_path, audio_path: (_ for _ in ()).throw(AssertionError("MoviePy extraction should not run when FFmpeg is available")),
+    )
+    input_path = tmp_path / "input.mp4"
+    input_path.write_bytes(b"mp4")
+    streamed = []
+
+    def fake_stream(source_path, output_path, ffmpeg_path=None):
+        streamed.append((source_path, output_path))
+        with wave.open(output_path, "wb") as output_file:
+            output_file.setnchannels(1)
+            output_file.setsampwidth(2)
+            output_file.setframerate(process_input_module.TRANSCRIPTION_SAMPLE_RATE)
+            output_file.writeframes(b"\x00\x00" * 16000)
+        return 32000
+
+    monkeypatch.setattr(process_input_module, "stream_audio_to_working_wav", fake_stream)
+
+    working_audio_path, working_audio = process_input_module.prepare_working_audio(str(input_path))
+
+    assert streamed == [(str(input_path), working_audio_path)]
+    assert len(working_audio) == 1000
+    assert sorted(os.listdir(tmp_path)) == ["input.mp4", process_input_module.WORKING_AUDIO_FILENAME]
+
+
+def test_stream_audio_to_working_wav_maps_only_first_audio_stream_and_reports_throughput(tmp_path, monkeypatch, caplog):
+    process = FakeFfmpegProcess([b"\x00\x00" * 8])
+    commands = install_fake_ffmpeg(monkeypatch, process)
+    input_path = tmp_path / "input.avi"
+    input_path.write_bytes(b"a" * 4096)
+
+    with caplog.at_level(logging.INFO):
+        process_input_module.stream_audio_to_working_wav(str(input_path), str(tmp_path / "working.wav"), ffmpeg_path="ffmpeg")
+
+    command = commands[0]
+    assert command[command.index("-map") + 1] == "0:a:0"
+    assert "-vn" in command
+    assert "FFmpeg streamed 4096 input bytes into 16 PCM bytes" in caplog.text
+    assert "MiB/s" in caplog.text
+
+
+def test_prepare_working_audio_streaming_rejects_missing_input(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: "/usr/bin/ffmpeg")
+
+    with pytest.raises(SystemExit) as exc_info:
+        process_input_module.prepare_working_audio(str(tmp_path / "missing.mp3"))
+
+    assert exc_info.value.code == 1
+    assert "does not exist" in caplog.text
+
+
+def test_apply_audio_cleaning_reopens_cleaned_file_as_working_audio_view(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    working_audio = process_input_module.WorkingAudio.__new__(process_input_module.WorkingAudio)
+    reopened_audio = object()
+    calls = {}
+
+    monkeypatch.setattr(
+        process_input_module.WorkingAudio,
+        "to_audio_segment",
+        lambda self: (_ for _ in ()).throw(AssertionError("basic cleaning should read the memory-mapped samples")),
+    )
+    monkeypatch.setattr(
+        process_input_module,
+        "apply_basic_audio_cleaning",
+        lambda source_audio, output_path: calls.setdefault("apply_basic_audio_cleaning", (source_audio, output_path)),
+    )
+    monkeypatch.setattr(process_input_module, "open_working_audio", lambda file_path: calls.setdefault("open_working_audio", file_path) and reopened_audio)
+    monkeypatch.setattr(
+        process_input_module,
+        "validate_audio_file",
+        lambda file_path: (_ for _ in ()).throw(AssertionError("cleaned audio should be reopened as a memory-mapped view")),
+    )
+
+    cleaned_audio_path, cleaned_audio = process_input_module.apply_audio_cleaning("working.wav", "basic", working_audio, already_resolved=True)
+
+    assert cleaned_audio is reopened_audio
+    assert calls["apply_basic_audio_cleaning"] == (working_audio, cleaned_audio_path)
+    assert calls["open_working_audio"] == cleaned_audio_path
+
+
+def test_apply_basic_audio_cleaning_writes_vectorized_result_for_working_audio(tmp_path):
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("scipy")
+    working_audio_path = tmp_path / "working.wav"
+    cleaned_audio_path = tmp_path / "cleaned.wav"
+    samples = (np.sin(np.arange(3200) / 4.0) * 8000).astype(np.int16)
+    with wave.open(str(working_audio_path), "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(process_input_module.TRANSCRIPTION_SAMPLE_RATE)
+        output_file.writeframes(samples.tobytes())
+    strategy_settings = {"high_pass_cutoff_hz": 120, "low_pass_cutoff_hz": 7600}
+
+    process_input_module.apply_basic_audio_cleaning(
+        process_input_module.open_working_audio(str(working_audio_path)),
+        str(cleaned_audio_path),
+        strategy_settings=strategy_settings,
+    )
+
+    cleaned_audio = process_input_module.open_working_audio(str(cleaned_audio_path))
+    expected_samples = basic_cleaning_module.apply_basic_cleaning_chain(
+        samples, process_input_module.TRANSCRIPTION_SAMPLE_RATE, strategy_settings
+    )
+    np.testing.assert_array_equal(np.asarray(cleaned_audio.samples), expected_samples)
+
+
+def test_apply_basic_audio_cleaning_falls_back_to_pydub_without_numpy(tmp_path, monkeypatch):
+    working_audio = process_input_module.WorkingAudio.__new__(process_input_module.WorkingAudio)
+    exported = []
+
+    class DecodedAudio:
+        def export(self, output_path, format=None):
+            exported.append((output_path, format))
+
+    def raise_import_error(*_args):
+        raise ImportError("No module named 'scipy'")
+
+    monkeypatch.setattr(process_input_module, "apply_vectorized_basic_audio_cleaning", raise_import_error)
+    monkeypatch.setattr(process_input_module.WorkingAudio, "to_audio_segment", lambda self: DecodedAudio())
+
+    output_path = str(tmp_path / "cleaned.wav")
+    process_input_module.apply_basic_audio_cleaning(working_audio, output_path, strategy_settings={})
+
+    assert exported == [(output_path, process_input_module.WORKING_AUDIO_FORMAT)]
+
+
+def test_process_audio_segments_converts_memory_mapped_int16_samples_per_segment(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    transcribed_audio = []
+
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "transcribe",
+        lambda model, audio, language=None: transcribed_audio.append(audio) or {"segments": []},
+    )
+
+    samples = np.full(process_input_module.TRANSCRIPTION_SAMPLE_RATE, 16384, dtype=np.int16)
+    process_input_module.process_audio_segments(
+        object(),
+        [(0, 500)],
+        "en",
+        "fake-model",
+        f"{tmp_path}{os.sep}result_{{}}.json",
+        input_samples=samples,
+    )
+
+    assert transcribed_audio[0].dtype == np.float32
+    assert len(transcribed_audio[0]) == process_input_module.TRANSCRIPTION_SAMPLE_RATE // 2
+    assert float(transcribed_audio[0][0]) == 0.5
+
+
+def install_fake_transcription_audio_stages(tmp_path, monkeypatch, calls):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}tmp{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: None)
+    monkeypatch.setattr(process_input_module, "validate_audio_file", lambda file_path: ("loaded", Path(file_path).read_bytes()))
+
+    def fake_prepare_working_audio(input_path, media_probe=None, work_dir=None):
+        calls.append("prepare_working_audio")
+        os.makedirs(process_input_module.TMP_DIR, exist_ok=True)
+        working_audio_path = os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME)
+        Path(working_audio_path).write_bytes(b"working:" + Path(input_path).read_bytes())
+        return working_audio_path, ("loaded", Path(working_audio_path).read_bytes())
+
+    def fake_apply_audio_cleaning(working_audio_path, cleaning_mode=None, working_audio=None, already_resolved=False, work_dir=None):
+        calls.append(("apply_audio_cleaning", cleaning_mode))
+        cleaned_audio_path = os.path.join(
+            process_input_module.TMP_DIR,
+            process_input_module.PREPROCESSED_AUDIO_FILENAME_TEMPLATE.format(cleaning_mode),
+        )
+        Path(cleaned_audio_path).write_bytes(b"cleaned:" + working_audio[1])
+        return cleaned_audio_path, ("loaded", Path(cleaned_audio_path).read_bytes())
+
+    monkeypatch.setattr(process_input_module, "prepare_working_audio", fake_prepare_working_audio)
+    monkeypatch.setattr(process_input_module, "apply_audio_cleaning", fake_apply_audio_cleaning)
+
+
+def test_prepare_transcription_audio_reuses_cached_cleaned_audio_across_runs(tmp_path, monkeypatch):
+    calls = []
+    install_fake_transcription_audio_stages(tmp_path, monkeypatch, calls)
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"input")
+
+    first_path, first_audio = process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+    shutil.rmtree(process_input_module.TMP_DIR)
+    second_path, second_audio = process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+
+    assert calls == ["prepare_working_audio", ("apply_audio_cleaning", "basic")]
+    assert second_path == first_path
+    assert second_audio == first_audio == ("loaded", b"cleaned:working:input")
+
+
+def test_prepare_transcription_audio_reuses_working_audio_when_strategy_settings_change(tmp_path, monkeypatch):
+    calls = []
+    install_fake_transcription_audio_stages(tmp_path, monkeypatch, calls)
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"input")
+
+    process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+    process_input_module.save_cleaning_settings("basic", basic_strategy_settings={"high_pass_cutoff_hz": 200})
+    process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+
+    assert calls == [
+        "prepare_working_audio",
+        ("apply_audio_cleaning", "basic"),
+        ("apply_audio_cleaning", "basic"),
+    ]
+
+
+def test_prepare_transcription_audio_misses_cache_when_input_content_changes(tmp_path, monkeypatch):
+    calls = []
+    install_fake_transcription_audio_stages(tmp_path, monkeypatch, calls)
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"input")
+
+    process_input_module.prepare_transcription_audio(str(input_path), "off", already_resolved=True)
+    input_path.write_bytes(b"edited")
+    _, working_audio = process_input_module.prepare_transcription_audio(str(input_path), "off", already_resolved=True)
+
+    assert calls == [
+        "prepare_working_audio",
+        ("apply_audio_cleaning", "off"),
+        "prepare_working_audio",
+        ("apply_audio_cleaning", "off"),
+    ]
+    assert working_audio == ("loaded", b"cleaned:working:edited")
+
+
+def test_prepare_transcription_audio_skips_cache_when_disabled(tmp_path, monkeypatch):
+    calls = []
+    install_fake_transcription_audio_stages(tmp_path, monkeypatch, calls)
+    monkeypatch.setattr(process_input_module, "load_app_config", lambda: {"audio_cache_settings": {"enabled": False}})
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"input")
+
+    process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+    process_input_module.prepare_transcription_audio(str(input_path), "basic", already_resolved=True)
+
+    assert calls.count("prepare_working_audio") == 2
+    assert not os.path.exists(process_input_module.AUDIO_CACHE_DIR)
+
+
+def test_process_audio_segments_reuses_cached_results_for_identical_segment_audio(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    transcribed = []
+
+    def fake_transcribe(model, audio, language=None):
+        first_sample = round(float(audio[0]) * 32768)
+        transcribed.append((first_sample, language))
+        return {"segments": [{"start": 0.0, "end": 1.0, "text": f"from {first_sample}"}]}
+
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", fake_transcribe)
+
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.arange(2 * sample_rate, dtype=np.int16)
+    transcription_cache = process_input_module.get_transcription_cache()
+    output_json_template = f"{tmp_path}{os.sep}result_{{}}.json"
+
+    def run(segments, audio_language="en", model_name="tiny"):
+        process_input_module.process_audio_segments(
+            object(),
+            segments,
+            audio_language,
+            "fake-model",
+            output_json_template,
+            input_samples=samples,
+            transcription_cache=transcription_cache,
+            model_name=model_name,
+        )
+
+    run([(0, 1000), (1000, 2000)])
+    cached_json = (tmp_path / "result_000001.000_000002.000.json").read_text(encoding="utf-8")
+    (tmp_path / "result_000001.000_000002.000.json").unlink()
+    run([(1000, 2000)])
+    run([(1000, 2000)], audio_language="es")
+    run([(1000, 2000)], model_name="small")
+
+    assert transcribed == [(0, "en"), (sample_rate, "en"), (sample_rate, "es"), (sample_rate, "en")]
+    assert json.loads(cached_json)["segments"][0]["text"] == f"from {sample_rate}"
+
+
+def test_process_audio_segments_in_parallel_only_submits_uncached_segments(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "transcription_worker_state", {})
+    InProcessExecutor.instances = []
+
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.arange(3 * sample_rate, dtype=np.float32)
+    transcribed = []
+    transcription_cache = process_input_module.get_transcription_cache()
+    output_json_template = f"{tmp_path}{os.sep}result_{{}}.json"
+
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: samples)
+    monkeypatch.setattr(process_input_module.concurrent.futures, "ProcessPoolExecutor", InProcessExecutor)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "transcribe",
+        lambda model, audio, language=None: transcribed.append(int(audio[0])) or {"segments": []},
+    )
+
+    process_input_module.process_audio_segments_in_parallel(
+        object(), [(0, 1000)], "en", "tiny", output_json_template, workers=2, transcription_cache=transcription_cache
+    )
+    process_input_module.process_audio_segments_in_parallel(
+        object(), [(0, 1000), (1000, 2000), (2000, 3000)], "en", "tiny", output_json_template, workers=4, transcription_cache=transcription_cache
+    )
+    process_input_module.process_audio_segments_in_parallel(
+        object(), [(1000, 2000), (2000, 3000)], "en", "tiny", output_json_template, workers=4, transcription_cache=transcription_cache
+    )
+
+    assert transcribed == [0, sample_rate, 2 * sample_rate]
+    assert [executor.max_workers for executor in InProcessExecutor.instances] == [1, 2]
+    assert len(list(tmp_path.glob("result_*.json"))) == 3
+
+
+def test_process_audio_segments_in_parallel_delivers_cached_and_new_results_in_segment_order(tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}")
+    monkeypatch.setattr(process_input_module, "transcription_worker_state", {})
+
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.arange(3 * sample_rate, dtype=np.float32)
+    transcription_cache = process_input_module.get_transcription_cache()
+
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: samples)
+    monkeypatch.setattr(process_input_module.concurrent.futures, "ProcessPoolExecutor", InProcessExecutor)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "transcribe",
+        lambda model, audio, language=None: {"segments": [{"start": 0.0, "end": 1.0, "text": f"from {int(audio[0])}"}]},
+    )
+
+    # Only the middle segment is cached, so it is ready before the segment in front of it is transcribed.
+    process_input_module.process_audio_segments_in_parallel(
+        object(), [(1000, 2000)], "en", "tiny", None, workers=2, transcription_cache=transcription_cache
+    )
+    delivered = []
+    segment_results = process_input_module.process_audio_segments_in_parallel(
+        object(),
+        [(0, 1000), (1000, 2000), (2000, 3000)],
+        "en",
+        "tiny",
+        None,
+        workers=4,
+        transcription_cache=transcription_cache,
+        on_segment_result=delivered.append,
+    )
+
+    assert segment_results == []
+    assert [(result["start_ms"], result["end_ms"]) for result in delivered] == [(0, 1000), (1000, 2000), (2000, 3000)]
+    assert delivered[1]["result"]["segments"][0]["text"] == f"from {sample_rate}"
+
+
+def test_transcription_cache_key_ignores_non_sample_audio():
+    assert process_input_module.build_transcription_cache_key("temp_segment_1.wav", "tiny", "en") is None
+
+
+def test_transcription_cache_key_does_not_import_whisper(monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    def fail_lazy_import(name):
+        raise AssertionError(f"{name} was imported to build a cache key")
+
+    monkeypatch.setattr(process_input_module, "lazy_import", fail_lazy_import)
+    samples = np.zeros(1600, dtype=np.int16)
+
+    cache_key = process_input_module.build_transcription_cache_key(samples, "tiny", "en")
+
+    assert cache_key == process_input_module.build_transcription_cache_key(samples.copy(), "tiny", "en")
+    assert cache_key != process_input_module.build_transcription_cache_key(samples, "base", "en")
+
+
+def write_working_format_wav(file_path, frame_count):
+    with wave.open(str(file_path), "wb") as output_file:
+        output_file.setnchannels(1)
+        output_file.setsampwidth(2)
+        output_file.setframerate(process_input_module.TRANSCRIPTION_SAMPLE_RATE)
+        output_file.writeframes(b"\x00\x00" * frame_count)
+
+
+def test_is_video_file_sniffs_container_header_without_libmagic(tmp_path, monkeypatch):
+    class FailingMagic:
+        def __init__(self, mime=True):
+            raise AssertionError("libmagic should only be used for unrecognized containers")
+
+    monkeypatch.setattr(process_input_module.magic, "Magic", FailingMagic)
+    avi_path = tmp_path / "input.avi"
+    avi_path.write_bytes(b"RIFF" + b"\x04\x00\x00\x00" + b"AVI ")
+    wav_path = tmp_path / "input.wav"
+    write_working_format_wav(wav_path, 160)
+
+    assert process_input_module.is_video_file(str(avi_path)) is True
+    assert process_input_module.is_video_file(str(wav_path)) is False
+
+
+def test_detect_mime_type_reuses_one_libmagic_instance(monkeypatch):
+    created = []
+
+    class CountingMagic:
+        def __init__(self, mime=True):
+            created.append(mime)
+
+        def from_file(self, file_path):
+            return "video/x-flv"
+
+    monkeypatch.setattr(process_input_module.magic, "Magic", CountingMagic)
+
+    assert process_input_module.detect_mime_type("first.flv") == "video/x-flv"
+    assert process_input_module.detect_mime_type("second.flv") == "video/x-flv"
+    assert created == [True]
+
+
+def test_prepare_transcription_audio_probes_input_once_and_passes_probe_along(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_input_module, "load_app_config", lambda: {"audio_cache_settings": {"enabled": False}})
+    monkeypatch.setattr(
+        process_input_module,
+        "is_video_file",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("the input should not be probed again")),
+    )
+    input_path = tmp_path / "input.avi"
+    input_path.write_bytes(b"RIFF" + b"\x04\x00\x00\x00" + b"AVI ")
+    probes = []
+    received = {}
+    original_probe_input_media = process_input_module.probe_input_media
+
+    def counting_probe_input_media(file_path):
+        probes.append(file_path)
+        return original_probe_input_media(file_path)
+
+    def fake_prepare_working_audio(path, media_probe=None, work_dir=None):
+        received["media_probe"] = media_probe
+        return "working.wav", object()
+
+    monkeypatch.setattr(process_input_module, "probe_input_media", counting_probe_input_media)
+    monkeypatch.setattr(process_input_module, "prepare_working_audio", fake_prepare_working_audio)
+    monkeypatch.setattr(process_input_module, "apply_audio_cleaning", lambda path, mode, audio, already_resolved=False, work_dir=None: (path, audio))
+
+    process_input_module.prepare_transcription_audio(str(input_path), "off", already_resolved=True)
+
+    assert probes == [str(input_path)]
+    assert received["media_probe"].container == "avi"
+    assert received["media_probe"].is_video
+
+
+def test_prepare_working_audio_copies_inputs_already_in_working_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path}{os.sep}tmp{os.sep}")
+    monkeypatch.setattr(process_input_module, "find_ffmpeg", lambda: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(
+        process_input_module,
+        "stream_audio_to_working_wav",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("working-format input should not be decoded again")),
+    )
+    input_path = tmp_path / "input.wav"
+    write_working_format_wav(input_path, 8000)
+    media_probe = process_input_module.probe_input_media(str(input_path))
+
+    working_audio_path, working_audio = process_input_module.prepare_working_audio(str(input_path), media_probe)
+
+    assert Path(working_audio_path).read_bytes() == input_path.read_bytes()
+    assert os.stat(working_audio_path).st_ino != os.stat(input_path).st_ino
+    assert len(working_audio) == 500
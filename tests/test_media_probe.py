@@ -0,0 +1,228 @@
+import struct
+import wave
+
+from media_probe import UNKNOWN_MEDIA_PROBE, probe_media
+
+
+def riff_chunk(chunk_id, payload):
+    return chunk_id + struct.pack("<I", len(payload)) + payload + (b"\x00" if len(payload) % 2 else b"")
+
+
+def riff_list(list_type, *chunks):
+    return riff_chunk(b"LIST", list_type + b"".join(chunks))
+
+
+def mp4_box(box_type, payload):
+    return struct.pack(">I", len(payload) + 8) + box_type + payload
+
+
+def ebml_element(element_id, payload):
+    # Two-byte EBML size, enough for the small elements built here.
+    size = len(payload)
+    return element_id + bytes([0x40 | (size >> 8), size & 0xFF]) + payload
+
+
+def ogg_page(header_type, granule_position, serial_number, payload):
+    return (
+        b"OggS"
+        + struct.pack("<BBqIII", 0, header_type, granule_position, serial_number, 0, 0)
+        + bytes([1, len(payload)])
+        + payload
+    )
+
+
+def test_probe_media_reads_pcm_wav_header(tmp_path):
+    wav_path = tmp_path / "input.wav"
+    with wave.open(str(wav_path), "wb") as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(44100)
+        wav_file.writeframes(b"\x00" * 4 * 22050)
+
+    media_probe = probe_media(str(wav_path))
+
+    assert media_probe.container == "wav"
+    assert media_probe.is_audio
+    assert media_probe.codecs == ("pcm_s16le",)
+    assert media_probe.duration_ms == 500
+    assert (media_probe.sample_rate, media_probe.channels) == (44100, 2)
+    assert media_probe.mime_type == "audio/x-wav"
+
+
+def test_probe_media_reads_avi_stream_headers(tmp_path):
+    avih = struct.pack("<10I", 40000, 0, 0, 0, 250, 0, 2, 0, 640, 480)
+    video_stream = riff_list(b"strl", riff_chunk(b"strh", b"vids" + b"H264" + b"\x00" * 48), riff_chunk(b"strf", struct.pack("<IiiHH4s", 40, 640, 480, 1, 24, b"H264")))
+    audio_stream = riff_list(b"strl", riff_chunk(b"strh", b"auds" + b"\x00" * 52), riff_chunk(b"strf", struct.pack("<HHIIHH", 0x55, 2, 48000, 16000, 1, 0)))
+    body = b"AVI " + riff_list(b"hdrl", riff_chunk(b"avih", avih), video_stream, audio_stream) + riff_list(b"movi")
+    avi_path = tmp_path / "input.avi"
+    avi_path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+    media_probe = probe_media(str(avi_path))
+
+    assert media_probe.container == "avi"
+    assert media_probe.is_video
+    assert media_probe.codecs == ("h264", "mp3")
+    assert media_probe.duration_ms == 10000
+    assert (media_probe.sample_rate, media_probe.channels) == (48000, 2)
+
+
+def test_probe_media_estimates_cbr_mp3_duration_after_id3_tag(tmp_path):
+    id3_tag = b"ID3\x03\x00\x00" + bytes([0, 0, 0, 20]) + b"\x00" * 20
+    frame_header = b"\xff\xfb\x90\x64"
+    mp3_path = tmp_path / "input.mp3"
+    mp3_path.write_bytes(id3_tag + frame_header + b"\x00" * (32000 - len(frame_header)))
+
+    media_probe = probe_media(str(mp3_path))
+
+    assert media_probe.container == "mp3"
+    assert media_probe.codecs == ("mp3",)
+    assert media_probe.duration_ms == 2000
+    assert (media_probe.sample_rate, media_probe.channels) == (44100, 2)
+    assert media_probe.mime_type == "audio/mpeg"
+
+
+def test_probe_media_uses_xing_frame_count_for_vbr_mp3(tmp_path):
+    frame = bytearray(b"\xff\xfb\x90\xc4" + b"\x00" * 413)
+    frame[4 + 17:4 + 17 + 12] = b"Xing" + struct.pack(">II", 1, 441)
+    mp3_path = tmp_path / "vbr.mp3"
+    mp3_path.write_bytes(bytes(frame) * 3)
+
+    media_probe = probe_media(str(mp3_path))
+
+    assert media_probe.channels == 1
+    assert media_probe.duration_ms == 11520
+
+
+def test_probe_media_reads_adts_aac_header(tmp_path):
+    aac_path = tmp_path / "input.aac"
+    aac_path.write_bytes(b"\xff\xf1\x50\x80" + b"\x00" * 64)
+
+    media_probe = probe_media(str(aac_path))
+
+    assert media_probe.container == "aac"
+    assert (media_probe.sample_rate, media_probe.channels) == (44100, 2)
+
+
+def test_probe_media_reads_flac_stream_info(tmp_path):
+    stream_info = (16000 << 44) | (0 << 41) | (15 << 36) | 48000
+    flac_path = tmp_path / "input.flac"
+    flac_path.write_bytes(b"fLaC" + b"\x80\x00\x00\x22" + b"\x00" * 10 + stream_info.to_bytes(8, "big") + b"\x00" * 16)
+
+    media_probe = probe_media(str(flac_path))
+
+    assert media_probe.container == "flac"
+    assert media_probe.duration_ms == 3000
+    assert (media_probe.sample_rate, media_probe.channels) == (16000, 1)
+
+
+def test_probe_media_reads_mp4_moov_after_media_data(tmp_path):
+    mvhd = mp4_box(b"mvhd", b"\x00" * 12 + struct.pack(">II", 1000, 65000) + b"\x00" * 80)
+    video_track = mp4_box(
+        b"trak",
+        mp4_box(
+            b"mdia",
+            mp4_box(b"hdlr", b"\x00" * 8 + b"vide" + b"\x00" * 12)
+            + mp4_box(b"minf", mp4_box(b"stbl", mp4_box(b"stsd", struct.pack(">II", 0, 1) + mp4_box(b"avc1", b"\x00" * 78)))),
+        ),
+    )
+    audio_entry = mp4_box(b"mp4a", b"\x00" * 16 + struct.pack(">HHHHI", 2, 16, 0, 0, 44100 << 16))
+    audio_track = mp4_box(
+        b"trak",
+        mp4_box(
+            b"mdia",
+            mp4_box(b"hdlr", b"\x00" * 8 + b"soun" + b"\x00" * 12)
+            + mp4_box(b"minf", mp4_box(b"stbl", mp4_box(b"stsd", struct.pack(">II", 0, 1) + audio_entry))),
+        ),
+    )
+    mp4_path = tmp_path / "input.mp4"
+    mp4_path.write_bytes(
+        mp4_box(b"ftyp", b"isom" + b"\x00\x00\x02\x00" + b"isommp41")
+        + mp4_box(b"mdat", b"\x00" * 200000)
+        + mp4_box(b"moov", mvhd + video_track + audio_track)
+    )
+
+    media_probe = probe_media(str(mp4_path))
+
+    assert media_probe.container == "mp4"
+    assert media_probe.is_video
+    assert media_probe.codecs == ("avc1", "mp4a")
+    assert media_probe.duration_ms == 65000
+    assert (media_probe.sample_rate, media_probe.channels) == (44100, 2)
+    assert media_probe.mime_type == "video/mp4"
+
+
+def test_probe_media_classifies_audio_only_m4a(tmp_path):
+    m4a_path = tmp_path / "input.m4a"
+    m4a_path.write_bytes(mp4_box(b"ftyp", b"M4A " + b"\x00\x00\x00\x00"))
+
+    media_probe = probe_media(str(m4a_path))
+
+    assert media_probe.container == "m4a"
+    assert media_probe.is_audio
+    assert media_probe.duration_ms is None
+
+
+def test_probe_media_reads_webm_info_and_tracks(tmp_path):
+    ebml_header = ebml_element(b"\x1a\x45\xdf\xa3", ebml_element(b"\x42\x82", b"webm"))
+    info = ebml_element(
+        b"\x15\x49\xa9\x66",
+        ebml_element(b"\x2a\xd7\xb1", struct.pack(">I", 1000000)) + ebml_element(b"\x44\x89", struct.pack(">d", 4250.0)),
+    )
+    audio_track = ebml_element(
+        b"\xae",
+        ebml_element(b"\x83", b"\x02")
+        + ebml_element(b"\x86", b"A_OPUS")
+        + ebml_element(b"\xe1", ebml_element(b"\xb5", struct.pack(">d", 48000.0)) + ebml_element(b"\x9f", b"\x02")),
+    )
+    tracks = ebml_element(b"\x16\x54\xae\x6b", audio_track)
+    cluster = ebml_element(b"\x1f\x43\xb6\x75", b"\x00" * 16)
+    webm_path = tmp_path / "input.webm"
+    webm_path.write_bytes(ebml_header + ebml_element(b"\x18\x53\x80\x67", info + tracks + cluster))
+
+    media_probe = probe_media(str(webm_path))
+
+    assert media_probe.container == "webm"
+    assert media_probe.is_audio
+    assert media_probe.codecs == ("A_OPUS",)
+    assert media_probe.duration_ms == 4250
+    assert (media_probe.sample_rate, media_probe.channels) == (48000, 2)
+
+
+def test_probe_media_reads_opus_duration_from_last_ogg_page(tmp_path):
+    opus_head = b"OpusHead" + struct.pack("<BBHIhB", 1, 2, 312, 48000, 0, 0)
+    ogg_path = tmp_path / "input.ogg"
+    ogg_path.write_bytes(
+        ogg_page(0x02, 0, 7, opus_head)
+        + ogg_page(0x00, 0, 7, b"OpusTags")
+        + ogg_page(0x00, 96000, 7, b"\x00" * 32)
+        + ogg_page(0x04, 144312, 7, b"\x00" * 32)
+    )
+
+    media_probe = probe_media(str(ogg_path))
+
+    assert media_probe.container == "ogg"
+    assert media_probe.codecs == ("opus",)
+    assert media_probe.duration_ms == 3000
+    assert media_probe.channels == 2
+
+
+def test_probe_media_falls_back_to_mime_detector_for_unknown_containers(tmp_path):
+    unknown_path = tmp_path / "input.bin"
+    unknown_path.write_bytes(b"\x00" * 64)
+    detected_paths = []
+
+    media_probe = probe_media(str(unknown_path), mime_type_detector=lambda file_path: detected_paths.append(file_path) or "video/x-flv")
+
+    assert detected_paths == [str(unknown_path)]
+    assert media_probe.is_video
+    assert media_probe.mime_type == "video/x-flv"
+    assert probe_media(str(unknown_path)) == UNKNOWN_MEDIA_PROBE
+
+
+def test_probe_media_does_not_call_mime_detector_for_recognized_containers(tmp_path):
+    flac_path = tmp_path / "input.flac"
+    flac_path.write_bytes(b"fLaC" + b"\x80\x00\x00\x22" + b"\x00" * 34)
+
+    media_probe = probe_media(str(flac_path), mime_type_detector=lambda file_path: (_ for _ in ()).throw(AssertionError("libmagic should not run")))
+
+    assert media_probe.container == "flac"
@@ -0,0 +1,69 @@
+import pytest
+
+from model_cache import ModelCache
+
+
+def test_model_cache_loads_once_and_reuses_cached_model():
+    cache = ModelCache(max_entries=2)
+    load_calls = []
+
+    def loader():
+        load_calls.append("tiny")
+        return object()
+
+    first_model, first_loaded = cache.get_or_load(("tiny", "cpu", "float32"), loader)
+    second_model, second_loaded = cache.get_or_load(("tiny", "cpu", "float32"), loader)
+
+    assert first_loaded is True
+    assert second_loaded is False
+    assert second_model is first_model
+    assert load_calls == ["tiny"]
+
+
+def test_model_cache_evicts_least_recently_used_model():
+    cache = ModelCache(max_entries=2)
+
+    cache.get_or_load(("tiny", "cpu", "float32"), object)
+    cache.get_or_load(("base", "cpu", "float32"), object)
+    cache.get_or_load(("tiny", "cpu", "float32"), object)
+    cache.get_or_load(("small", "cuda", "float16"), object)
+
+    assert cache.keys() == [("tiny", "cpu", "float32"), ("small", "cuda", "float16")]
+    assert ("base", "cpu", "float32") not in cache
+
+
+def test_model_cache_keeps_devices_and_precisions_apart():
+    cache = ModelCache(max_entries=3)
+
+    cpu_model, _ = cache.get_or_load(("tiny", "cpu", "float32"), object)
+    cuda_model, cuda_loaded = cache.get_or_load(("tiny", "cuda", "float16"), object)
+
+    assert cuda_loaded is True
+    assert cuda_model is not cpu_model
+    assert len(cache) == 2
+
+
+def test_model_cache_does_not_store_failed_loads():
+    cache = ModelCache()
+
+    def failing_loader():
+        raise RuntimeError("download failed")
+
+    with pytest.raises(RuntimeError, match="download failed"):
+        cache.get_or_load(("tiny", "cpu", "float32"), failing_loader)
+
+    assert len(cache) == 0
+
+
+def test_model_cache_clear_drops_models():
+    cache = ModelCache()
+    cache.get_or_load(("tiny", "cpu", "float32"), object)
+
+    cache.clear()
+
+    assert len(cache) == 0
+
+
+def test_model_cache_rejects_empty_capacity():
+    with pytest.raises(ValueError, match="at least one model"):
+        ModelCache(max_entries=0)
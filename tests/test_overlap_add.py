@@ -0,0 +1,44 @@
+import pytest
+
+from overlap_add import OverlapAddWriter, plan_overlap_chunks
+
+
+def test_plan_overlap_chunks_overlaps_consecutive_windows():
+    assert plan_overlap_chunks(25, 10, 2) == [(0, 10), (8, 18), (16, 25)]
+
+
+def test_plan_overlap_chunks_returns_single_window_for_short_input():
+    assert plan_overlap_chunks(4, 10, 2) == [(0, 4)]
+    assert plan_overlap_chunks(0, 10, 2) == []
+
+
+@pytest.mark.parametrize("chunk_frames, overlap_frames", [(0, 0), (10, 10), (10, -1)])
+def test_plan_overlap_chunks_rejects_invalid_sizes(chunk_frames, overlap_frames):
+    with pytest.raises(ValueError):
+        plan_overlap_chunks(100, chunk_frames, overlap_frames)
+
+
+def test_overlap_add_writer_reconstructs_unprocessed_windows_exactly():
+    np = pytest.importorskip("numpy")
+    signal = np.sin(np.arange(1000, dtype=np.float32) / 7.0)
+    written = []
+
+    writer = OverlapAddWriter(written.append, overlap_frames=32)
+    for start, end in plan_overlap_chunks(len(signal), 200, 32):
+        writer.add(signal[start:end])
+
+    assert writer.finish() == len(signal)
+    np.testing.assert_allclose(np.concatenate(written), signal, atol=1e-6)
+    assert max(len(frames) for frames in written) <= 200
+
+
+def test_overlap_add_writer_crossfades_between_windows():
+    np = pytest.importorskip("numpy")
+    written = []
+
+    writer = OverlapAddWriter(written.append, overlap_frames=3)
+    writer.add(np.zeros(6))
+    writer.add(np.ones(6))
+    writer.finish()
+
+    np.testing.assert_allclose(np.concatenate(written), [0, 0, 0, 0.25, 0.5, 0.75, 1, 1, 1])
@@ -1,6 +1,7 @@
-import json
 import logging
-import os
+import subprocess
+import sys
+from pathlib import Path
 
 import pytest
 
@@ -31,24 +32,46 @@ def test_subtitle_parse_time_range_rejects_invalid_ranges():
         Subtitle.parse_time_range("not-a-time-range")
 
 
-def test_create_srt_content_keeps_original_times_when_filename_has_no_offset(tmp_path, monkeypatch, caplog):
-    monkeypatch.setattr(generate_output, "TMP_DIR", f"{tmp_path}{os.sep}")
-    input_file = tmp_path / "custom_name.json"
-    input_file.write_text(
-        json.dumps({"segments": [{"start": 1.0, "end": 2.5, "text": "No offset"}]}),
-        encoding="utf-8",
+@pytest.mark.parametrize(
+    ("timestamp", "expected_ms"),
+    [
+        ("01:02:03,456", 3723456),
+        ("01:02:03.456", 3723456),
+        ("123:00:00,001", 442800001),
+        ("0:00:01,5", 1500),
+        (" 00:00:02 ", 2000),
+    ],
+)
+def test_parse_srt_time_reads_integer_milliseconds(timestamp, expected_ms):
+    assert generate_output.parse_srt_time(timestamp) == expected_ms
+
+
+@pytest.mark.parametrize("timestamp", ["", "00:01", "aa:00:00,000", "00:00:01,-50"])
+def test_parse_srt_time_rejects_invalid_timestamps(timestamp):
+    with pytest.raises(ValueError, match="Invalid SRT timestamp"):
+        generate_output.parse_srt_time(timestamp)
+
+
+def test_iter_srt_cues_tolerates_crlf_bom_and_irregular_blank_lines(tmp_path):
+    srt_path = tmp_path / "irregular.srt"
+    srt_path.write_bytes(
+        "\ufeff1\r\n00:00:01,000 --> 00:00:02,000\r\nFirst\r\n\r\n\r\n   \r\n"
+        "2\r\n00:00:03,000 --> 00:00:04,000 X1:40 X2:600\r\nSecond\r\nline\r\n\r\n"
+        "00:00:05,000 --> 25:00:00,000\r\nNo index".encode("utf-8")
     )
 
-    with caplog.at_level(logging.INFO):
-        srt_content = generate_output.create_srt_content([input_file.name])
+    subtitles = generate_output.read_srt_file(str(srt_path))
 
-    subtitles = generate_output.parse_srt(srt_content)
+    assert [(subtitle.index, subtitle.start, subtitle.end, subtitle.text) for subtitle in subtitles] == [
+        ("1", 1000, 2000, "First"),
+        ("2", 3000, 4000, "Second\nline"),
+        ("3", 5000, 90000000, "No index"),
+    ]
 
-    assert len(subtitles) == 1
-    assert subtitles[0].text == "No offset"
-    assert Subtitle.time_to_str(subtitles[0].start) == "00:00:01,000"
-    assert Subtitle.time_to_str(subtitles[0].end) == "00:00:02,500"
-    assert "does not match the expected format" in caplog.text
+
+def test_iter_srt_cues_rejects_cues_without_a_time_range():
+    with pytest.raises(ValueError, match="Invalid SRT cue"):
+        generate_output.parse_srt("1\n\n2\n00:00:01,000 --> 00:00:02,000\nText\n")
 
 
 def test_validate_and_order_checkpoints_warns_when_sorting(caplog):
@@ -69,19 +92,42 @@ def test_parse_segments_warns_for_out_of_order_and_overlapping_ranges(caplog):
     assert "Overlapping segments detected" in caplog.text
 
 
-def test_process_directory_logs_errors_when_content_generation_fails(tmp_path, monkeypatch, caplog):
-    monkeypatch.setattr(generate_output, "TMP_DIR", f"{tmp_path}{os.sep}")
-    (tmp_path / "speech_recognition_result_segment_000000_000001.json").write_text("{}", encoding="utf-8")
+def test_parse_segments_rejects_a_range_given_twice():
+    with pytest.raises(ValueError, match="Segment 3 repeats segment 1"):
+        process_input_module.parse_segments("00:10-00:15,00:01-00:05,00:10-00:15", 30000)
+
+
+HEAVY_MODULES = ("torch", "whisper_timestamped", "pydub", "magic")
+STARTUP_PROBE = """
+import runpy, sys
+sys.argv = ["main.py"] + sys.argv[1:]
+try:
+    runpy.run_path("main.py", run_name="__main__")
+except SystemExit:
+    pass
+print(",".join(sorted(name for name in sys.modules if name.split(".")[0] in {heavy_modules!r})))
+"""
 
-    def fake_create_srt_content(_json_files):
-        raise RuntimeError("boom")
 
-    monkeypatch.setattr(generate_output, "create_srt_content", fake_create_srt_content)
+@pytest.mark.parametrize("arguments", [["--version"], ["--no-such-option"]])
+def test_main_version_and_argument_errors_do_not_import_heavy_modules(arguments):
+    repo_root = Path(__file__).resolve().parents[1]
+
+    completed = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE.format(heavy_modules=HEAVY_MODULES), *arguments],
+        cwd=repo_root,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
 
-    output_path = tmp_path / "output.srt"
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ""
 
-    with caplog.at_level(logging.ERROR):
-        generate_output.process_directory(str(output_path))
 
-    assert not output_path.exists()
-    assert "An error occurred while processing speech recognition JSON files: boom" in caplog.text
+def test_process_input_imports_heavy_modules_on_first_use():
+    assert process_input_module.whisper is sys.modules["whisper_timestamped"]
+    assert process_input_module.lazy_import("AudioSegment") is sys.modules["pydub"].AudioSegment
+    assert process_input_module.lazy_import("audio_effects") is sys.modules["pydub.effects"]
+    with pytest.raises(AttributeError):
+        process_input_module.no_such_attribute
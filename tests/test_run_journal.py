@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import run_journal as run_journal_module
+
+
+def test_run_journal_records_segments_durably_as_json_lines(tmp_path):
+    journal_path = tmp_path / "output.srt.journal.jsonl"
+    journal = run_journal_module.RunJournal(str(journal_path), "config-a")
+
+    journal.record(0, 1000, {"segments": [{"start": 0.0, "end": 1.0, "text": "Hola"}]})
+    journal.record(0, 1000, {"segments": []})
+    # Records are on disk before the journal is closed.
+    records = [json.loads(line) for line in journal_path.read_text(encoding="utf-8").splitlines()]
+    journal.close()
+
+    assert records == [
+        {"start_ms": 0, "end_ms": 1000, "config": "config-a", "result": {"segments": [{"start": 0.0, "end": 1.0, "text": "Hola"}]}}
+    ]
+    assert journal.lookup(0, 1000) == records[0]["result"]
+    assert journal.lookup(1000, 2000) is None
+
+
+def test_run_journal_resumes_matching_records_and_drops_torn_and_stale_lines(tmp_path, caplog):
+    journal_path = tmp_path / "output.srt.journal.jsonl"
+    journal_path.write_text(
+        '{"start_ms": 0, "end_ms": 1000, "config": "config-a", "result": {"segments": []}}\n'
+        '{"start_ms": 1000, "end_ms": 2000, "config": "config-b", "result": {"segments": []}}\n'
+        '{"start_ms": 2000, "end_ms": 3000, "config": "config-a", "res',
+        encoding="utf-8",
+    )
+
+    journal = run_journal_module.RunJournal(str(journal_path), "config-a", resume=True)
+    journal.record(2000, 3000, {"segments": []})
+    journal.close()
+
+    assert [(record["start_ms"], record["config"]) for record in map(json.loads, journal_path.read_text(encoding="utf-8").splitlines())] == [
+        (0, "config-a"),
+        (2000, "config-a"),
+    ]
+    assert "1 unreadable record(s)" in caplog.text
+    assert "different input or settings" in caplog.text
+    assert not (tmp_path / "output.srt.journal.jsonl.partial").exists()
+
+
+def test_run_journal_starts_over_unless_resuming(tmp_path):
+    journal_path = tmp_path / "output.srt.journal.jsonl"
+    journal_path.write_text('{"start_ms": 0, "end_ms": 1000, "config": "config-a", "result": {"segments": []}}\n', encoding="utf-8")
+
+    journal = run_journal_module.RunJournal(str(journal_path), "config-a")
+    journal.close()
+
+    assert journal.lookup(0, 1000) is None
+    assert journal_path.read_text(encoding="utf-8") == ""
+
+    run_journal_module.remove_run_journal(str(journal_path))
+    run_journal_module.remove_run_journal(str(journal_path))
+    assert not journal_path.exists()
+    assert run_journal_module.read_run_journal(str(journal_path), "config-a") == {}
+
+
+def test_run_journal_reports_unwritable_locations(tmp_path):
+    with pytest.raises(RuntimeError, match="Original error"):
+        run_journal_module.RunJournal(str(tmp_path / "missing" / "output.srt.journal.jsonl"), "config-a")
@@ -77,6 +77,108 @@ def test_execution_args_rejects_saving_without_explicit_cleaning_mode(monkeypatc
         execution_args()
 
 
+def test_execution_args_parses_worker_count(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--workers", "4"])
+
+    args = execution_args()
+
+    assert args.workers == 4
+
+
+def test_execution_args_defaults_to_single_worker(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3"])
+
+    assert execution_args().workers == 1
+
+
+def test_execution_args_parses_no_transcription_cache_flag(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--no-transcription-cache"])
+
+    assert execution_args().no_transcription_cache is True
+
+
+@pytest.mark.parametrize("argv, expected", [([], None), (["--auto-checkpoints"], "5m"), (["--auto-checkpoints", "45s"], "45s")])
+def test_execution_args_parses_auto_checkpoints(monkeypatch, argv, expected):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", *argv])
+
+    assert execution_args().auto_checkpoints == expected
+
+
+def test_execution_args_rejects_auto_checkpoints_with_checkpoints(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--auto-checkpoints", "--checkpoints", "5m"])
+
+    with pytest.raises(SystemExit):
+        execution_args()
+
+
+def test_execution_args_parses_skip_silence_flag(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--skip-silence"])
+
+    assert execution_args().skip_silence is True
+
+
+def test_execution_args_parses_long_form_flag(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--long-form"])
+
+    assert execution_args().long_form is True
+
+
+def test_execution_args_rejects_non_positive_worker_count(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--workers", "0"])
+
+    with pytest.raises(SystemExit):
+        execution_args()
+
+
+def test_execution_args_parses_model_and_device(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "--input", "input.mp3", "--model", "small", "--device", "cuda"])
+
+    args = execution_args()
+
+    assert args.model == "small"
+    assert args.device == "cuda"
+
+
+def test_resolve_transcription_settings_prefers_arguments_over_saved_settings(monkeypatch):
+    monkeypatch.setattr(
+        process_input_module,
+        "load_app_config",
+        lambda: {"transcription_settings": {"model_name": "base", "device": "cpu"}},
+    )
+
+    assert process_input_module.resolve_transcription_settings(SimpleNamespace(model="medium", device="cuda")) == ("medium", "cuda")
+    assert process_input_module.resolve_transcription_settings(SimpleNamespace(model=None, device=None)) == ("base", "cpu")
+
+
+def test_resolve_transcription_settings_defaults_to_tiny_model():
+    assert process_input_module.resolve_transcription_settings(SimpleNamespace()) == ("tiny", None)
+
+
+def test_load_speech_to_text_model_reuses_cached_model_and_reports_load_time(monkeypatch, caplog):
+    load_calls = []
+
+    def fake_load_model(model_name, device=None):
+        load_calls.append((model_name, device))
+        return {"name": model_name, "device": device}
+
+    monkeypatch.setattr(process_input_module.whisper, "load_model", fake_load_model)
+
+    with caplog.at_level(logging.INFO):
+        first_model = process_input_module.load_speech_to_text_model("base", "cpu")
+        second_model = process_input_module.load_speech_to_text_model("base", "cpu")
+        other_device_model = process_input_module.load_speech_to_text_model("base", "cuda")
+
+    assert second_model is first_model
+    assert other_device_model is not first_model
+    assert load_calls == [("base", "cpu"), ("base", "cuda")]
+    assert caplog.text.count("Speech recognition model load time") == 2
+    assert "Reusing cached speech recognition model." in caplog.text
+    assert process_input_module.speech_to_text_model_cache.keys() == [
+        ("base", "cpu", "float32"),
+        ("base", "cuda", "float16"),
+    ]
+
+
 def test_process_input_uses_checkpoint_flow_for_audio_input(tmp_path, monkeypatch):
     tmp_dir = tmp_path / "tmp"
     monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_dir}{os.sep}")
@@ -92,11 +194,11 @@ def test_process_input_uses_checkpoint_flow_for_audio_input(tmp_path, monkeypatc
     def fail_parse_segments(*_args, **_kwargs):
         raise AssertionError("parse_segments should not be used when checkpoints are provided")
 
-    def fake_load_model(model_name):
-        calls["load_model"] = model_name
+    def fake_load_model(model_name, device=None):
+        calls["load_model"] = (model_name, device)
         return "fake-model"
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["process_audio_segments"] = (
             input_audio,
             segments_to_process,
@@ -105,7 +207,7 @@ def test_process_input_uses_checkpoint_flow_for_audio_input(tmp_path, monkeypatc
             output_json_template,
         )
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
@@ -122,14 +224,153 @@ def test_process_input_uses_checkpoint_flow_for_audio_input(tmp_path, monkeypatc
     assert tmp_dir.exists()
     assert calls["prepare_transcription_audio"] == ("input.mp3", "basic", True)
     assert calls["generate_segments"] == ("30s", 65000)
-    assert calls["load_model"] == "tiny"
+    assert calls["load_model"] == ("tiny", "cpu")
     assert calls["process_audio_segments"] == (
         fake_audio,
         expected_segments,
         "en",
         "fake-model",
-        os.path.join(process_input_module.TMP_DIR, "speech_recognition_result_segment_{}.json"),
+        None,
+    )
+
+
+def test_process_input_keeps_every_intermediate_file_in_the_given_workspace(tmp_path, monkeypatch):
+    shared_tmp_dir = tmp_path / "tmp"
+    work_dir = f"{tmp_path / 'run_1'}{os.sep}"
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{shared_tmp_dir}{os.sep}")
+    calls = {}
+
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
+        calls["prepare_work_dir"] = work_dir
+        return os.path.join(work_dir, process_input_module.WORKING_AUDIO_FILENAME), FakeAudio(5000)
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        calls["output_json_template"] = output_json_template
+        calls["segments_work_dir"] = kwargs["work_dir"]
+
+    monkeypatch.setattr(process_input_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(input="input.mp3", checkpoints=None, segments=None, language=None, cleaning_mode="off")
+    process_input_module.process_input(args, work_dir=work_dir)
+
+    assert calls["prepare_work_dir"] == work_dir
+    assert calls["segments_work_dir"] == work_dir
+    assert calls["output_json_template"] is None
+    assert os.path.isdir(work_dir)
+    assert not shared_tmp_dir.exists()
+
+
+def test_process_input_checkpoints_segment_results_to_the_requested_directory(tmp_path, monkeypatch):
+    results_dir = tmp_path / "results"
+    calls = {}
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
+        calls["output_json_template"] = output_json_template
+        return [{"start_ms": 0, "end_ms": 5000, "result": {"segments": []}}]
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(5000)),
+    )
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(
+        input="input.mp3", checkpoints=None, segments=None, language=None, cleaning_mode="off", segment_results_dir=str(results_dir)
+    )
+    segment_results = process_input_module.process_input(args, work_dir=f"{tmp_path / 'run_1'}{os.sep}")
+
+    assert segment_results == [{"start_ms": 0, "end_ms": 5000, "result": {"segments": []}}]
+    assert calls["output_json_template"] == os.path.join(str(results_dir), "speech_recognition_result_segment_{}.json")
+    assert results_dir.is_dir()
+
+
+def test_process_input_transcribes_requested_segments_in_timeline_order(tmp_path, monkeypatch, caplog):
+    calls = {}
+    delivered = []
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        calls["segments_to_process"] = segments_to_process
+        for segment_start, segment_end in segments_to_process:
+            kwargs["on_segment_result"]({"start_ms": segment_start, "end_ms": segment_end, "result": {"segments": []}})
+        return []
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(20000)),
+    )
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(input="input.mp3", checkpoints=None, segments="00:10-00:15,00:01-00:05", language=None, cleaning_mode="off")
+    with caplog.at_level(logging.INFO):
+        segment_results = process_input_module.process_input(args, work_dir=f"{tmp_path / 'run_1'}{os.sep}", on_segment_result=delivered.append)
+
+    assert calls["segments_to_process"] == [(1000, 5000), (10000, 15000)]
+    assert [(result["start_ms"], result["end_ms"]) for result in delivered] == [(1000, 5000), (10000, 15000)]
+    assert segment_results == []
+    assert "timeline order" in caplog.text
+
+
+def test_process_input_resumes_from_the_run_journal_without_loading_the_model(tmp_path, monkeypatch):
+    journal_path = str(tmp_path / "output.srt.journal.jsonl")
+    loaded_models = []
+    journal_lookups = []
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        run_journal = kwargs["run_journal"]
+        journal_lookups.append([run_journal.lookup(*segment) for segment in segments_to_process])
+        for segment_start, segment_end in segments_to_process:
+            run_journal.record(segment_start, segment_end, {"segments": []})
+        return []
+
+    (tmp_path / "input.mp3").write_bytes(b"media")
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(5000)),
     )
+    monkeypatch.setattr(process_input_module, "load_speech_to_text_model", lambda model_name, device=None: loaded_models.append(model_name) or "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(input=str(tmp_path / "input.mp3"), checkpoints=None, segments=None, language=None, cleaning_mode="off", resume=False)
+    process_input_module.process_input(args, work_dir=f"{tmp_path / 'run_1'}{os.sep}", run_journal_path=journal_path)
+    args.resume = True
+    process_input_module.process_input(args, work_dir=f"{tmp_path / 'run_2'}{os.sep}", run_journal_path=journal_path)
+    args.language = "es"
+    process_input_module.process_input(args, work_dir=f"{tmp_path / 'run_3'}{os.sep}", run_journal_path=journal_path)
+
+    # The second run finds the first one's segment; the third one uses another language and starts over.
+    assert journal_lookups == [[None], [{"segments": []}], [None]]
+    assert len(loaded_models) == 2
+
+
+def test_build_run_config_hash_tracks_segmentation_and_cleaning_settings_without_importing_whisper(tmp_path, monkeypatch):
+    input_path = tmp_path / "input.mp3"
+    input_path.write_bytes(b"audio")
+    cleaning_settings = {"basic_strategy_settings": {"high_pass_cutoff_hz": 80}}
+
+    def fail_lazy_import(name):
+        raise AssertionError(f"{name} was imported")
+
+    monkeypatch.setattr(process_input_module, "lazy_import", fail_lazy_import)
+    monkeypatch.setattr(process_input_module, "load_cleaning_settings", lambda: cleaning_settings)
+
+    def build_hash(**kwargs):
+        return process_input_module.build_run_config_hash(str(input_path), "basic", "tiny", "en", **kwargs)
+
+    baseline_hash = build_hash()
+    assert build_hash() == baseline_hash
+    assert build_hash(skip_silence=True) != baseline_hash
+    assert build_hash(auto_checkpoints="5m") != build_hash(auto_checkpoints="30s")
+    assert build_hash(long_form=True) != baseline_hash
+
+    cleaning_settings["basic_strategy_settings"]["high_pass_cutoff_hz"] = 120
+    assert build_hash() != baseline_hash
 
 
 def test_process_input_uses_video_extraction_and_default_full_range(tmp_path, monkeypatch):
@@ -145,7 +386,7 @@ def test_process_input_uses_video_extraction_and_default_full_range(tmp_path, mo
     def fail_parse_segments(*_args, **_kwargs):
         raise AssertionError("parse_segments should not be used without segments")
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["process_audio_segments"] = (
             input_audio,
             segments_to_process,
@@ -154,14 +395,14 @@ def test_process_input_uses_video_extraction_and_default_full_range(tmp_path, mo
             output_json_template,
         )
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
     monkeypatch.setattr(process_input_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
     monkeypatch.setattr(process_input_module, "generate_segments_from_checkpoints", fail_generate_segments)
     monkeypatch.setattr(process_input_module, "parse_segments", fail_parse_segments)
-    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
     monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
 
     args = SimpleNamespace(input="input.mp4", checkpoints=None, segments=None, language="es")
@@ -174,7 +415,7 @@ def test_process_input_uses_video_extraction_and_default_full_range(tmp_path, mo
         [(0, 42000)],
         "es",
         "fake-model",
-        os.path.join(process_input_module.TMP_DIR, "speech_recognition_result_segment_{}.json"),
+        None,
     )
 
 
@@ -194,11 +435,11 @@ def test_process_input_uses_saved_cleaning_mode_when_no_explicit_selection(tmp_p
         },
     )
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["process_audio_segments"] = (
             input_audio,
             segments_to_process,
@@ -208,7 +449,7 @@ def test_process_input_uses_saved_cleaning_mode_when_no_explicit_selection(tmp_p
         )
 
     monkeypatch.setattr(process_input_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
-    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
     monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
 
     args = SimpleNamespace(
@@ -228,7 +469,7 @@ def test_process_input_uses_saved_cleaning_mode_when_no_explicit_selection(tmp_p
         [(0, 42000)],
         "en",
         "fake-model",
-        os.path.join(process_input_module.TMP_DIR, "speech_recognition_result_segment_{}.json"),
+        None,
     )
 
 
@@ -248,12 +489,12 @@ def test_process_input_resolves_cleaning_mode_once_and_reuses_it_for_persistence
         calls["events"].append("save_cleaning_settings")
         calls["save_cleaning_settings"] = (default_cleaning_mode, preselect_saved_cleaning_mode)
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["events"].append("prepare_transcription_audio")
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["events"].append("process_audio_segments")
         calls["process_audio_segments"] = (
             input_audio,
@@ -274,7 +515,7 @@ def test_process_input_resolves_cleaning_mode_once_and_reuses_it_for_persistence
     )
     monkeypatch.setattr(process_input_module, "save_cleaning_settings", fake_save_cleaning_settings)
     monkeypatch.setattr(process_input_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
-    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
     monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
 
     args = SimpleNamespace(
@@ -297,7 +538,7 @@ def test_process_input_resolves_cleaning_mode_once_and_reuses_it_for_persistence
         [(0, 42000)],
         "en",
         "fake-model",
-        os.path.join(process_input_module.TMP_DIR, "speech_recognition_result_segment_{}.json"),
+        None,
     )
 
 
@@ -307,7 +548,7 @@ def test_process_input_does_not_persist_cleaning_mode_when_preprocessing_fails(t
 
     calls = {}
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         raise RuntimeError("SpeechBrain enhancement is unavailable")
 
@@ -344,11 +585,11 @@ def test_process_input_continues_when_persisting_cleaning_mode_fails(tmp_path, m
     calls = {}
     fake_audio = FakeAudio(42000)
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["process_audio_segments"] = (
             input_audio,
             segments_to_process,
@@ -359,7 +600,7 @@ def test_process_input_continues_when_persisting_cleaning_mode_fails(tmp_path, m
 
     monkeypatch.setattr(process_input_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
     monkeypatch.setattr(process_input_module, "save_cleaning_settings", lambda *_args, **_kwargs: (_ for _ in ()).throw(OSError("disk full")))
-    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
     monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
 
     args = SimpleNamespace(
@@ -380,7 +621,7 @@ def test_process_input_continues_when_persisting_cleaning_mode_fails(tmp_path, m
         [(0, 42000)],
         "en",
         "fake-model",
-        os.path.join(process_input_module.TMP_DIR, "speech_recognition_result_segment_{}.json"),
+        None,
     )
     assert "Could not persist cleaning mode 'basic': disk full" in caplog.text
     assert any(
@@ -395,7 +636,7 @@ def test_process_input_uses_explicit_segments(monkeypatch):
     fake_audio = FakeAudio(99000)
     expected_segments = [(1000, 5000)]
 
-    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False):
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
         calls["prepare_transcription_audio"] = (input_path, cleaning_mode, already_resolved)
         return (os.path.join(process_input_module.TMP_DIR, process_input_module.WORKING_AUDIO_FILENAME), fake_audio)
 
@@ -410,11 +651,11 @@ def test_process_input_uses_explicit_segments(monkeypatch):
         calls["parse_segments"] = (segments, total_duration_ms)
         return expected_segments
 
-    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template):
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **_kwargs):
         calls["process_audio_segments"] = (segments_to_process, audio_language)
 
     monkeypatch.setattr(process_input_module, "parse_segments", fake_parse_segments)
-    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
     monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
 
     args = SimpleNamespace(input="input.mp3", checkpoints=None, segments="00:01-00:05", language=None)
@@ -426,6 +667,49 @@ def test_process_input_uses_explicit_segments(monkeypatch):
     assert calls["process_audio_segments"] == (expected_segments, "en")
 
 
+def test_process_input_dispatches_multiple_segments_to_worker_pool(tmp_path, monkeypatch):
+    tmp_dir = tmp_path / "tmp"
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_dir}{os.sep}")
+
+    calls = {}
+    fake_audio = FakeAudio(65000)
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", fake_audio),
+    )
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "load_model",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("the parent process should not load the model for parallel runs")),
+    )
+    monkeypatch.setattr(
+        process_input_module,
+        "process_audio_segments",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("serial processing should not run with several workers")),
+    )
+
+    def fake_process_audio_segments_in_parallel(input_audio, segments_to_process, audio_language, model_name, output_json_template, workers, device=None, **_kwargs):
+        calls["parallel"] = (input_audio, segments_to_process, audio_language, model_name, output_json_template, workers, device)
+
+    monkeypatch.setattr(process_input_module, "process_audio_segments_in_parallel", fake_process_audio_segments_in_parallel)
+
+    args = SimpleNamespace(input="input.mp3", checkpoints="30s", segments=None, language=None, workers=4, model="small", device="cuda:1")
+
+    process_input_module.process_input(args)
+
+    assert calls["parallel"] == (
+        fake_audio,
+        [(0, 30000), (30000, 60000), (60000, 65000)],
+        "en",
+        "small",
+        None,
+        4,
+        "cuda:1",
+    )
+
+
 def test_process_input_rejects_missing_input_path():
     args = SimpleNamespace(input=None, checkpoints=None, segments=None, language=None)
 
@@ -440,6 +724,153 @@ def test_process_input_rejects_checkpoints_and_segments_together():
         process_input_module.process_input(args)
 
 
+def test_process_input_rejects_auto_checkpoints_with_explicit_segments():
+    args = SimpleNamespace(input="input.mp3", checkpoints=None, segments="00:01-00:05", auto_checkpoints="5m", language=None)
+
+    with pytest.raises(ValueError, match="Cannot specify automatic checkpoints"):
+        process_input_module.process_input(args)
+
+
+def test_process_input_uses_auto_checkpoints_and_hands_samples_to_transcription(monkeypatch):
+    calls = {}
+    fake_audio = FakeAudio(120000)
+    fake_samples = object()
+    expected_segments = [(2000, 40000), (55000, 90000)]
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", fake_audio),
+    )
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: fake_samples)
+
+    def fake_generate_auto_segments(input_samples, total_duration_ms, target_pattern):
+        calls["generate_auto_segments"] = (input_samples, total_duration_ms, target_pattern)
+        return expected_segments
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        calls["process_audio_segments"] = (segments_to_process, kwargs["input_samples"])
+
+    monkeypatch.setattr(process_input_module, "generate_auto_segments", fake_generate_auto_segments)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(input="input.mp3", checkpoints=None, segments=None, auto_checkpoints="30s", language=None)
+
+    process_input_module.process_input(args)
+
+    assert calls["generate_auto_segments"] == (fake_samples, 120000, "30s")
+    assert calls["process_audio_segments"] == (expected_segments, fake_samples)
+
+
+def test_process_input_long_form_prompts_each_window_and_keeps_seam_words_once(tmp_path, monkeypatch, caplog):
+    np = pytest.importorskip("numpy")
+    # Every sample holds its own position in seconds, so the fake model knows where each window starts.
+    timeline_samples = (np.arange(70 * 16000) / 16000).astype(np.float32)
+    prompts = []
+
+    def fake_transcribe(model, audio, language=None, initial_prompt=None):
+        prompts.append(initial_prompt)
+        window_start = int(round(float(audio[0])))
+        words = [
+            {"text": f"w{window_start + second}", "start": second + 0.2, "end": second + 0.8}
+            for second in range(len(audio) // 16000)
+        ]
+        return {"segments": [{"start": words[0]["start"], "end": words[-1]["end"], "text": "", "words": words}]}
+
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: timeline_samples)
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module.whisper, "transcribe", fake_transcribe)
+
+    args = SimpleNamespace(
+        input="input.mp3",
+        checkpoints=None,
+        segments=None,
+        language=None,
+        cleaning_mode="off",
+        long_form=True,
+        no_transcription_cache=True,
+        workers=2,
+    )
+    delivered = []
+    with caplog.at_level(logging.INFO):
+        process_input_module.process_input(
+            args, prepared_audio=("working.wav", FakeAudio(70000)), work_dir=str(tmp_path), on_segment_result=delivered.append
+        )
+
+    assert [(result["start_ms"], result["end_ms"]) for result in delivered] == [(0, 27500), (27500, 52500), (52500, 70000)]
+    words = [
+        (result["start_ms"] + round(word["start"] * 1000), word["text"])
+        for result in delivered
+        for segment in result["result"]["segments"]
+        for word in segment["words"]
+    ]
+    assert [text for _start_ms, text in words] == [f"w{second}" for second in range(70)]
+    assert [start_ms for start_ms, _text in words] == [second * 1000 + 200 for second in range(70)]
+    # Each window is prompted with the words that end before its audio starts.
+    assert prompts == [None, " ".join(f"w{second}" for second in range(25)), " ".join(f"w{second}" for second in range(50))]
+    assert "--workers is ignored" in caplog.text
+
+
+def test_process_input_skips_transcription_when_auto_checkpoints_find_no_speech(monkeypatch, caplog):
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(60000)),
+    )
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: object())
+    monkeypatch.setattr(process_input_module, "generate_auto_segments", lambda *_args: [])
+    monkeypatch.setattr(
+        process_input_module.whisper,
+        "load_model",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(AssertionError("no model is needed without speech")),
+    )
+
+    args = SimpleNamespace(input="input.mp3", checkpoints=None, segments=None, auto_checkpoints="5m", language=None)
+
+    with caplog.at_level(logging.WARNING):
+        process_input_module.process_input(args)
+
+    assert "No speech was detected" in caplog.text
+
+
+def test_process_input_trims_segments_to_speech_when_skipping_silence(monkeypatch, caplog):
+    np = pytest.importorskip("numpy")
+    calls = {}
+    sample_rate = process_input_module.TRANSCRIPTION_SAMPLE_RATE
+    samples = np.zeros(20 * sample_rate, dtype=np.int16)
+    samples[3 * sample_rate:5 * sample_rate] = 8000
+    samples[15 * sample_rate:16 * sample_rate] = 8000
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(20000)),
+    )
+    monkeypatch.setattr(process_input_module, "load_transcription_samples", lambda input_audio: samples)
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        calls["process_audio_segments"] = (segments_to_process, kwargs["input_samples"])
+
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(input="input.mp3", checkpoints="10s", segments=None, skip_silence=True, language=None)
+
+    with caplog.at_level(logging.INFO):
+        process_input_module.process_input(args)
+
+    # Speech spans keep their padding but are no longer widened to whole seconds.
+    assert calls["process_audio_segments"][0] == [(2800, 5200), (14800, 16200)]
+    assert calls["process_audio_segments"][1] is samples
+    assert "skipped 00:00:16 of 00:00:20 (81.0%)" in caplog.text
+
+
+def test_generate_auto_segments_rejects_invalid_target():
+    with pytest.raises(ValueError, match="Invalid automatic checkpoint target"):
+        process_input_module.generate_auto_segments(object(), 60000, "5x")
+
+
 def test_generate_output_uses_input_directory_when_output_is_missing(monkeypatch):
     calls = {}
 
@@ -447,18 +878,18 @@ def test_generate_output_uses_input_directory_when_output_is_missing(monkeypatch
         calls["validate_output"] = path
         return "resolved-output.srt"
 
-    def fake_process_directory(output_path, merge_subtitles):
-        calls["process_directory"] = (output_path, merge_subtitles)
+    def fake_process_segment_results(output_path, segment_results, merge_subtitles):
+        calls["process_segment_results"] = (output_path, segment_results, merge_subtitles)
 
     monkeypatch.setattr(generate_output_module, "validate_output", fake_validate_output)
-    monkeypatch.setattr(generate_output_module, "process_directory", fake_process_directory)
+    monkeypatch.setattr(generate_output_module, "process_segment_results", fake_process_segment_results)
 
     args = SimpleNamespace(input=os.path.join("folder", "input.mp3"), output=None, merge=True)
 
-    generate_output_module.generate_output(args)
+    generate_output_module.generate_output(args, segment_results=[])
 
     assert calls["validate_output"] == "folder"
-    assert calls["process_directory"] == ("resolved-output.srt", True)
+    assert calls["process_segment_results"] == ("resolved-output.srt", [], True)
 
 
 def test_generate_output_uses_explicit_output_path(monkeypatch):
@@ -468,22 +899,30 @@ def test_generate_output_uses_explicit_output_path(monkeypatch):
         calls["validate_output"] = path
         return path
 
-    def fake_process_directory(output_path, merge_subtitles):
-        calls["process_directory"] = (output_path, merge_subtitles)
+    def fake_process_segment_results(output_path, segment_results, merge_subtitles):
+        calls["process_segment_results"] = (output_path, segment_results, merge_subtitles)
 
     monkeypatch.setattr(generate_output_module, "validate_output", fake_validate_output)
-    monkeypatch.setattr(generate_output_module, "process_directory", fake_process_directory)
+    monkeypatch.setattr(generate_output_module, "process_segment_results", fake_process_segment_results)
 
     args = SimpleNamespace(input="input.mp3", output="custom-output.srt", merge=False)
 
-    generate_output_module.generate_output(args)
+    generate_output_module.generate_output(args, segment_results=[])
 
     assert calls["validate_output"] == "custom-output.srt"
-    assert calls["process_directory"] == ("custom-output.srt", False)
+    assert calls["process_segment_results"] == ("custom-output.srt", [], False)
 
 
-def test_main_runs_pipeline_and_cleans_tmp_dir(tmp_path, monkeypatch):
-    tmp_dir = tmp_path / "tmp"
+def test_generate_output_requires_segment_results_or_a_writer():
+    args = SimpleNamespace(input="input.mp3", output="custom-output.srt", merge=False)
+
+    with pytest.raises(ValueError, match="segment results"):
+        generate_output_module.generate_output(args)
+
+
+def test_main_runs_pipeline_in_its_own_workspace_and_removes_only_it(tmp_path, monkeypatch):
+    workspace_root = tmp_path / "workspaces"
+    other_run_workspace = workspace_root / "run_other"
     calls = []
 
     class FakeChronometer:
@@ -496,22 +935,53 @@ def test_main_runs_pipeline_and_cleans_tmp_dir(tmp_path, monkeypatch):
         def print_duration(self):
             calls.append("print_duration")
 
-    monkeypatch.setattr(config, "TMP_DIR", f"{tmp_dir}{os.sep}")
     monkeypatch.setattr(modules, "Chronometer", FakeChronometer)
 
-    args = SimpleNamespace(version=False)
+    args = SimpleNamespace(version=False, workspace_root=str(workspace_root))
     monkeypatch.setattr(modules, "execution_args", lambda: args)
-    monkeypatch.setattr(process_input_module, "process_input", lambda received_args: calls.append(("process_input", received_args)))
-    monkeypatch.setattr(generate_output_module, "generate_output", lambda received_args: calls.append(("generate_output", received_args)))
 
-    tmp_dir.mkdir()
+    segment_result = {"start_ms": 0, "end_ms": 1000, "result": {"segments": []}}
+
+    class FakeSrtWriter:
+        def __init__(self):
+            self.output_path = str(tmp_path / "output.srt")
+            self.segment_results = []
+            self.committed = False
+
+        def add_segment_result(self, received_segment_result):
+            self.segment_results.append(received_segment_result)
+
+        def close(self):
+            calls.append("close_srt_writer")
+
+    srt_writer = FakeSrtWriter()
+    monkeypatch.setattr(generate_output_module, "open_srt_writer", lambda received_args: srt_writer)
+
+    def fake_process_input(received_args, work_dir=None, on_segment_result=None, run_journal_path=None):
+        assert os.path.isdir(work_dir)
+        assert run_journal_path == str(tmp_path / "output.srt.journal.jsonl")
+        calls.append(("process_input", received_args, work_dir))
+        on_segment_result(segment_result)
+
+    monkeypatch.setattr(process_input_module, "process_input", fake_process_input)
+    monkeypatch.setattr(
+        generate_output_module,
+        "generate_output",
+        lambda received_args, srt_writer=None: calls.append(("generate_output", received_args, srt_writer.segment_results)),
+    )
+
+    other_run_workspace.mkdir(parents=True)
     runpy.run_module("main", run_name="__main__")
 
-    assert not tmp_dir.exists()
+    work_dir = calls[1][2]
+    assert os.path.dirname(os.path.normpath(work_dir)) == str(workspace_root)
+    assert not os.path.exists(work_dir)
+    assert other_run_workspace.is_dir()
     assert calls == [
         "start",
-        ("process_input", args),
-        ("generate_output", args),
+        ("process_input", args, work_dir),
+        ("generate_output", args, [segment_result]),
+        "close_srt_writer",
         "stop",
         "print_duration",
     ]
@@ -552,3 +1022,40 @@ def test_main_version_mode_skips_pipeline(tmp_path, monkeypatch, caplog):
 
     assert calls == ["start", "stop", "print_duration"]
     assert f"Version {config.APP_VERSION}" in caplog.text
+
+
+@pytest.mark.parametrize("no_transcription_cache", [False, True])
+def test_process_input_passes_transcription_cache_unless_disabled(tmp_path, monkeypatch, no_transcription_cache):
+    monkeypatch.setattr(process_input_module, "TMP_DIR", f"{tmp_path / 'tmp'}{os.sep}")
+    calls = {}
+
+    def fake_process_audio_segments(input_audio, segments_to_process, audio_language, speech_to_text_model, output_json_template, **kwargs):
+        calls["kwargs"] = kwargs
+
+    monkeypatch.setattr(
+        process_input_module,
+        "prepare_transcription_audio",
+        lambda input_path, cleaning_mode, already_resolved=False, work_dir=None: ("working.wav", FakeAudio(5000)),
+    )
+    monkeypatch.setattr(process_input_module.whisper, "load_model", lambda model_name, device=None: "fake-model")
+    monkeypatch.setattr(process_input_module, "process_audio_segments", fake_process_audio_segments)
+
+    args = SimpleNamespace(
+        input="input.mp3",
+        checkpoints=None,
+        segments=None,
+        language=None,
+        model="base",
+        no_transcription_cache=no_transcription_cache,
+    )
+
+    process_input_module.process_input(args)
+
+    assert calls["kwargs"]["model_name"] == "base"
+    if no_transcription_cache:
+        assert calls["kwargs"]["transcription_cache"] is None
+    else:
+        assert calls["kwargs"]["transcription_cache"].cache_dir == os.path.join(
+            process_input_module.AUDIO_CACHE_DIR,
+            process_input_module.TRANSCRIPTION_CACHE_DIRNAME,
+        )
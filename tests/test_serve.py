@@ -0,0 +1,281 @@
+import http.client
+import json
+import os
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import serve as serve_module
+
+
+def build_serve_defaults(**overrides):
+    defaults = SimpleNamespace(
+        output_dir=None,
+        language=None,
+        model=None,
+        device=None,
+        cleaning_mode=None,
+        no_transcription_cache=False,
+        workers=1,
+    )
+    for key, value in overrides.items():
+        setattr(defaults, key, value)
+    return defaults
+
+
+@pytest.fixture
+def isolated_tmp_dir(tmp_path, monkeypatch):
+    tmp_dir = f"{tmp_path / 'tmp'}{os.sep}"
+    monkeypatch.setattr(serve_module, "TMP_DIR", tmp_dir)
+    return tmp_dir
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    calls = []
+    release_transcription = threading.Event()
+    release_transcription.set()
+
+    def fake_prepare_transcription_audio(input_path, cleaning_mode, already_resolved=False, work_dir=None):
+        calls.append(("prepare", input_path, cleaning_mode, work_dir))
+        if "broken" in input_path:
+            raise RuntimeError("Could not decode the input.")
+        return f"{input_path}.wav", input_path
+
+    def fake_process_input(args, prepared_audio=None, progress_callback=None, work_dir=None, on_segment_result=None):
+        calls.append(("process", args.input, prepared_audio, work_dir))
+        release_transcription.wait(5)
+        progress_callback(1, 2)
+        on_segment_result({"start_ms": 0, "end_ms": 600, "result": {"segments": [{"start": 0.0, "end": 0.6, "text": "Hello"}]}})
+        progress_callback(2, 2)
+        on_segment_result(
+            {"start_ms": 600, "end_ms": 1000, "result": {"segments": [{"start": 0.0, "end": 0.4, "text": os.path.basename(args.input)}]}}
+        )
+
+    def fake_generate_output(args, srt_writer=None):
+        calls.append(("generate", args.input, args.output))
+        srt_writer.commit()
+
+    monkeypatch.setattr(serve_module, "prepare_transcription_audio", fake_prepare_transcription_audio)
+    monkeypatch.setattr(serve_module, "process_input", fake_process_input)
+    monkeypatch.setattr(serve_module, "generate_output", fake_generate_output)
+    return SimpleNamespace(calls=calls, release_transcription=release_transcription)
+
+
+def wait_for_job(service, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = service.get_job(job_id)
+        if job["status"] in serve_module.FINISHED_JOB_STATUSES:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} did not finish in time.")
+
+
+def test_build_job_args_validates_requests_and_applies_defaults(tmp_path):
+    input_path = tmp_path / "talk.mp4"
+    input_path.write_bytes(b"media")
+    service = serve_module.TranscriptionService(build_serve_defaults(language="es", cleaning_mode="basic", output_dir=str(tmp_path)))
+
+    job_args = service.build_job_args({"input": str(input_path), "segments": "00:10-00:50", "cleaning_mode": "off"})
+
+    assert job_args.output == str(tmp_path / "talk.srt")
+    assert job_args.language == "es"
+    assert job_args.cleaning_mode == "off"
+    assert job_args.segments == "00:10-00:50"
+    assert job_args.merge is False
+
+    with pytest.raises(ValueError, match="Unsupported job field"):
+        service.build_job_args({"input": str(input_path), "merge": True})
+    with pytest.raises(ValueError, match="Input file does not exist"):
+        service.build_job_args({"input": str(tmp_path / "missing.mp4")})
+    with pytest.raises(ValueError, match="Unsupported cleaning mode"):
+        service.build_job_args({"input": str(input_path), "cleaning_mode": "loud"})
+    with pytest.raises(ValueError, match="automatic checkpoints"):
+        service.build_job_args({"input": str(input_path), "auto_checkpoints": "5m", "checkpoints": "1m"})
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("auto_checkpoints", True), ("segments", 30), ("checkpoints", ["1m"]), ("skip_silence", "false"), ("long_form", 1), ("input", 5)],
+)
+def test_build_job_args_rejects_fields_of_the_wrong_type(tmp_path, field, value):
+    input_path = tmp_path / "talk.mp4"
+    input_path.write_bytes(b"media")
+    service = serve_module.TranscriptionService(build_serve_defaults())
+
+    with pytest.raises(ValueError, match=f"Job field {field} must be a"):
+        service.build_job_args({"input": str(input_path), field: value})
+
+    job_args = service.build_job_args({"input": str(input_path), field: None} if field != "input" else {"input": str(input_path)})
+    assert job_args.input == str(input_path)
+
+
+def test_submit_rejects_jobs_beyond_the_max_queue_depth(tmp_path):
+    input_path = tmp_path / "talk.mp3"
+    input_path.write_bytes(b"media")
+    service = serve_module.TranscriptionService(build_serve_defaults(), max_queue_depth=2)
+
+    service.submit({"input": str(input_path)})
+    service.submit({"input": str(input_path)})
+
+    with pytest.raises(serve_module.QueueFullError, match="queue is full"):
+        service.submit({"input": str(input_path)})
+    assert service.describe()["queued"] == 2
+
+
+def test_service_runs_jobs_and_reports_progress_and_results(tmp_path, isolated_tmp_dir, fake_pipeline):
+    inputs = []
+    for name in ("a.mp3", "broken.mp3"):
+        (tmp_path / name).write_bytes(b"media")
+        inputs.append(str(tmp_path / name))
+    service = serve_module.TranscriptionService(build_serve_defaults(cleaning_mode="off"), job_workers=2)
+    service.start()
+
+    try:
+        succeeded_job = wait_for_job(service, service.submit({"input": inputs[0]})["id"])
+        failed_job = wait_for_job(service, service.submit({"input": inputs[1]})["id"])
+    finally:
+        service.stop()
+
+    assert succeeded_job["status"] == "succeeded"
+    assert succeeded_job["progress"] == 1.0
+    assert (succeeded_job["segments_completed"], succeeded_job["segments_total"]) == (2, 2)
+    assert service.read_result(succeeded_job["id"])[1].endswith("00:00:01,000\na.mp3")
+    assert failed_job["status"] == "failed"
+    assert failed_job["error"] == "Could not decode the input."
+    assert service.read_result(failed_job["id"]) == (failed_job, None)
+
+    job_work_dir = os.path.join(isolated_tmp_dir, serve_module.SERVE_JOB_DIR_TEMPLATE.format(succeeded_job["id"]))
+    assert [call[-1] for call in fake_pipeline.calls if call[1] == inputs[0] and call[0] != "generate"] == [job_work_dir] * 2
+    assert not os.path.exists(job_work_dir)
+
+
+def test_service_transcribes_one_job_at_a_time(tmp_path, isolated_tmp_dir, fake_pipeline):
+    inputs = []
+    for name in ("a.mp3", "b.mp3"):
+        (tmp_path / name).write_bytes(b"media")
+        inputs.append(str(tmp_path / name))
+    fake_pipeline.release_transcription.clear()
+    service = serve_module.TranscriptionService(build_serve_defaults(cleaning_mode="off"), job_workers=2)
+    service.start()
+
+    try:
+        job_ids = [service.submit({"input": input_path})["id"] for input_path in inputs]
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            call_names = [call[0] for call in fake_pipeline.calls]
+            if call_names.count("prepare") == 2 and call_names.count("process") == 1:
+                break
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        # Both inputs were prepared, but only one job reached the shared transcription stage.
+        assert [call[0] for call in fake_pipeline.calls].count("process") == 1
+        assert sorted(service.get_job(job_id)["status"] for job_id in job_ids) == ["preparing", "transcribing"]
+
+        fake_pipeline.release_transcription.set()
+        finished_jobs = [wait_for_job(service, job_id) for job_id in job_ids]
+    finally:
+        fake_pipeline.release_transcription.set()
+        service.stop()
+
+    assert [job["status"] for job in finished_jobs] == ["succeeded", "succeeded"]
+
+
+def request_json(connection, method, path, payload=None):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+    response = connection.getresponse()
+    content = response.read()
+    return response, content
+
+
+def test_http_api_submits_jobs_and_serves_status_and_subtitles(tmp_path, isolated_tmp_dir, fake_pipeline):
+    input_path = tmp_path / "talk.mp3"
+    input_path.write_bytes(b"media")
+    service = serve_module.TranscriptionService(build_serve_defaults(cleaning_mode="off"), max_queue_depth=1)
+    server = serve_module.create_server(service, "127.0.0.1", 0)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    try:
+        response, content = request_json(connection, "POST", "/jobs", {"input": str(input_path)})
+        assert response.status == 202
+        job = json.loads(content)
+        assert response.getheader("Location") == f"/jobs/{job['id']}"
+
+        # The workers are not started yet, so the single queue slot is taken.
+        response, content = request_json(connection, "POST", "/jobs", {"input": str(input_path)})
+        assert response.status == 503
+        assert response.getheader("Retry-After") == str(serve_module.QUEUE_FULL_RETRY_AFTER_SECONDS)
+
+        response, content = request_json(connection, "GET", f"/jobs/{job['id']}/srt")
+        assert response.status == 409
+
+        service.start()
+        wait_for_job(service, job["id"])
+
+        response, content = request_json(connection, "GET", f"/jobs/{job['id']}")
+        assert json.loads(content)["status"] == "succeeded"
+        response, content = request_json(connection, "GET", f"/jobs/{job['id']}/srt")
+        assert response.status == 200
+        assert response.getheader("Content-Type").startswith("application/x-subrip")
+        assert content.decode("utf-8").endswith("00:00:01,000\ntalk.mp3")
+
+        response, content = request_json(connection, "POST", "/jobs", {"input": str(tmp_path / "missing.mp3")})
+        assert response.status == 400
+        response, content = request_json(connection, "GET", "/jobs/unknown")
+        assert response.status == 404
+        response, content = request_json(connection, "GET", "/health")
+        assert json.loads(content)["finished"] == 1
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are not available on this platform.")
+def test_http_api_can_listen_on_a_unix_socket(tmp_path):
+    socket_path = str(tmp_path / "serve.sock")
+    service = serve_module.TranscriptionService(build_serve_defaults())
+    server = serve_module.create_server(service, socket_path=socket_path)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    class UnixSocketConnection(http.client.HTTPConnection):
+        def connect(self):
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(socket_path)
+
+    connection = UnixSocketConnection("localhost", timeout=5)
+    try:
+        response, content = request_json(connection, "GET", "/health")
+        assert response.status == 200
+        assert json.loads(content)["max_queue_depth"] == 16
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_serve_execution_args_bounds_the_worker_pool_and_queue(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["serve.py", "--socket", "/tmp/subtitles.sock", "--job-workers", "2", "--max-queue-depth", "4"])
+
+    args = serve_module.serve_execution_args()
+
+    assert (args.socket, args.job_workers, args.max_queue_depth, args.port) == ("/tmp/subtitles.sock", 2, 4, 8765)
+
+    monkeypatch.setattr("sys.argv", ["serve.py", "--max-queue-depth", "0"])
+    with pytest.raises(SystemExit):
+        serve_module.serve_execution_args()
+
+    # Worker processes would load the model again for every job.
+    monkeypatch.setattr("sys.argv", ["serve.py", "--workers", "2"])
+    with pytest.raises(SystemExit):
+        serve_module.serve_execution_args()
@@ -0,0 +1,82 @@
+import json
+import threading
+
+import pytest
+
+import stage_metrics as stage_metrics_module
+
+
+@pytest.fixture
+def recorder():
+    recorder = stage_metrics_module.start_stage_metrics()
+    yield recorder
+    stage_metrics_module.stop_stage_metrics()
+
+
+def test_stage_does_nothing_while_metrics_are_disabled():
+    assert stage_metrics_module.active_recorder is None
+
+    with stage_metrics_module.stage("probe", input="talk.mp3") as attributes:
+        attributes["ignored"] = True
+
+    assert stage_metrics_module.stop_stage_metrics() is None
+
+
+def test_stages_nest_per_thread_and_keep_their_attributes(recorder):
+    with stage_metrics_module.stage("transcribe", segments=2):
+        for number in (1, 2):
+            with stage_metrics_module.stage("segment", number=number):
+                with stage_metrics_module.stage("decode") as attributes:
+                    attributes["words"] = number * 10
+
+        # A stage opened on another thread starts its own stack.
+        def prepare_next_input():
+            with stage_metrics_module.stage("prepare_audio"):
+                pass
+
+        background = threading.Thread(target=prepare_next_input)
+        background.start()
+        background.join()
+
+    spans = {(span["path"], span["attributes"].get("number")): span for span in recorder.spans}
+    assert set(spans) == {
+        ("transcribe", None),
+        ("transcribe/segment", 1),
+        ("transcribe/segment", 2),
+        ("transcribe/segment/decode", None),
+        ("prepare_audio", None),
+    }
+    assert [span["attributes"] for span in recorder.spans if span["name"] == "decode"] == [{"words": 10}, {"words": 20}]
+    transcribe = spans[("transcribe", None)]
+    assert transcribe["depth"] == 0
+    assert transcribe["wall_seconds"] >= spans[("transcribe/segment", 1)]["wall_seconds"]
+    assert transcribe["cpu_seconds"] >= 0
+
+
+def test_report_summarizes_stages_and_chrome_trace_lists_complete_events(recorder, tmp_path):
+    for _ in range(3):
+        with stage_metrics_module.stage("segment"):
+            with stage_metrics_module.stage("decode"):
+                pass
+    with pytest.raises(RuntimeError):
+        with stage_metrics_module.stage("srt_commit"):
+            raise RuntimeError("disk full")
+
+    report_path = tmp_path / "metrics.json"
+    trace_path = tmp_path / "trace.json"
+    stage_metrics_module.write_stage_metrics(recorder, str(report_path), str(trace_path))
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["version"] == stage_metrics_module.METRICS_REPORT_VERSION
+    assert [stage["path"] for stage in report["stages"]] == ["segment", "segment/decode"] * 3 + ["srt_commit"]
+    assert report["summary"]["segment/decode"]["count"] == 3
+    assert report["summary"]["segment"]["wall_seconds"] >= report["summary"]["segment/decode"]["wall_seconds"]
+    assert report["wall_seconds"] >= report["summary"]["segment"]["wall_seconds"]
+    if stage_metrics_module.resource is not None:
+        assert report["peak_rss_mb"] > 0
+
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    assert [event["name"] for event in trace["traceEvents"]] == ["segment", "decode"] * 3 + ["srt_commit"]
+    assert {(event["ph"], event["tid"]) for event in trace["traceEvents"]} == {("X", 1)}
+    segment, decode = trace["traceEvents"][:2]
+    assert segment["ts"] <= decode["ts"] and decode["ts"] + decode["dur"] <= segment["ts"] + segment["dur"] + 1
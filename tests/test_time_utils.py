@@ -31,6 +31,11 @@ def test_format_ms_duration(milliseconds, use_separator, expected):
     assert format_ms_duration(milliseconds, use_separator=use_separator) == expected
 
 
+def test_format_ms_duration_can_include_milliseconds():
+    assert format_ms_duration(3723045, include_milliseconds=True) == "010203.045"
+    assert format_ms_duration(3723045, use_separator=True, include_milliseconds=True) == "01:02:03.045"
+
+
 def test_format_ms_duration_rejects_negative_values():
     with pytest.raises(ValueError, match="non-negative"):
         format_ms_duration(-1)
@@ -0,0 +1,123 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from voice_activity import (  # noqa: E402
+    compute_frame_levels,
+    detect_speech_frames,
+    estimate_speech_threshold,
+    find_speech_regions,
+    plan_speech_segments,
+    trim_segments_to_speech,
+)
+
+SAMPLE_RATE = 16000
+FRAME_MS = 20
+
+
+def speech_mask_from_ms(total_ms, speech_ranges_ms):
+    mask = np.zeros(total_ms // FRAME_MS, dtype=bool)
+    for start_ms, end_ms in speech_ranges_ms:
+        mask[start_ms // FRAME_MS:end_ms // FRAME_MS] = True
+    return mask
+
+
+def levels_from_mask(mask):
+    return np.where(mask, -20.0, -70.0)
+
+
+def test_compute_frame_levels_measures_rms_per_frame():
+    samples = np.concatenate([np.zeros(320, dtype=np.int16), np.full(320, 16384, dtype=np.int16), np.full(100, 16384, dtype=np.int16)])
+
+    levels = compute_frame_levels(samples, SAMPLE_RATE, FRAME_MS)
+
+    assert len(levels) == 3
+    assert levels[0] < -100
+    assert levels[1] == pytest.approx(-6.02, abs=0.01)
+    assert levels[2] == pytest.approx(-6.02, abs=0.01)
+
+
+def test_compute_frame_levels_accepts_float_samples():
+    samples = np.full(640, 0.5, dtype=np.float32)
+
+    np.testing.assert_allclose(compute_frame_levels(samples, SAMPLE_RATE, FRAME_MS), [-6.02, -6.02], atol=0.01)
+
+
+def test_estimate_speech_threshold_keeps_quiet_words_in_recordings_without_pauses():
+    levels = np.linspace(-30.0, -10.0, 100)
+
+    assert estimate_speech_threshold(levels) < -30.0
+
+
+def test_detect_speech_frames_fills_short_pauses_and_drops_clicks():
+    levels = np.full(100, -70.0)
+    levels[10:30] = -20.0
+    levels[35:60] = -20.0
+    levels[80:82] = -20.0
+
+    speech_mask = detect_speech_frames(levels, threshold_db=-40.0, frame_ms=FRAME_MS)
+
+    assert speech_mask[10:60].all()
+    assert not speech_mask[60:].any()
+
+
+def test_find_speech_regions_pads_and_merges_regions():
+    speech_mask = speech_mask_from_ms(10000, [(1000, 2000), (2300, 3000), (6000, 7000)])
+
+    assert find_speech_regions(speech_mask, FRAME_MS, 10000, speech_pad_ms=200) == [(800, 3200), (5800, 7200)]
+
+
+def test_plan_speech_segments_skips_long_silences():
+    total_ms = 60000
+    speech_mask = speech_mask_from_ms(total_ms, [(1500, 9000), (9500, 15000), (40000, 47000)])
+
+    segments = plan_speech_segments(speech_mask, levels_from_mask(speech_mask), FRAME_MS, total_ms, 30000)
+
+    assert segments == [(1000, 16000), (39000, 48000)]
+
+
+def test_plan_speech_segments_splits_long_speech_in_pauses_near_target():
+    total_ms = 100000
+    speech_ranges = [(start + 200, start + 2800) for start in range(0, total_ms - 3000, 3000)]
+    speech_mask = speech_mask_from_ms(total_ms, speech_ranges)
+
+    segments = plan_speech_segments(
+        speech_mask, levels_from_mask(speech_mask), FRAME_MS, total_ms, 20000, speech_pad_ms=0
+    )
+
+    assert segments[0][0] == 0
+    for (_, previous_end), (next_start, _) in zip(segments, segments[1:]):
+        assert previous_end == next_start
+        assert not speech_mask[previous_end // FRAME_MS - 1] and not speech_mask[previous_end // FRAME_MS]
+    assert all(10000 <= end - start <= 30000 for start, end in segments[:-1])
+
+
+def test_plan_speech_segments_splits_continuous_speech_at_quietest_boundary():
+    total_ms = 60000
+    speech_mask = np.ones(total_ms // FRAME_MS, dtype=bool)
+    levels = np.full(total_ms // FRAME_MS, -20.0)
+    levels[24000 // FRAME_MS - 1:24000 // FRAME_MS + 1] = -35.0
+
+    segments = plan_speech_segments(speech_mask, levels, FRAME_MS, total_ms, 20000)
+
+    assert segments[0] == (0, 24000)
+
+
+def test_plan_speech_segments_returns_nothing_without_speech():
+    speech_mask = np.zeros(500, dtype=bool)
+
+    assert plan_speech_segments(speech_mask, levels_from_mask(speech_mask), FRAME_MS, 10000, 30000) == []
+
+
+def test_trim_segments_to_speech_keeps_speech_on_the_original_timeline():
+    speech_regions = [(1200, 4800), (5500, 9000), (30500, 33200), (70000, 80000)]
+
+    trimmed = trim_segments_to_speech([(0, 60000), (60000, 65000)], speech_regions)
+
+    assert trimmed == [(1000, 9000), (30000, 34000)]
+
+
+def test_trim_segments_to_speech_clamps_pieces_to_their_segment():
+    speech_regions = [(9500, 12500)]
+
+    assert trim_segments_to_speech([(0, 10000), (10000, 20000)], speech_regions) == [(9000, 10000), (10000, 13000)]
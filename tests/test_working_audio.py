@@ -0,0 +1,101 @@
+import struct
+import wave
+
+import pytest
+
+from working_audio import WAVE_FORMAT_IEEE_FLOAT, WAVE_FORMAT_PCM, WorkingAudio, is_working_audio_format, read_wav_header
+
+
+def write_pcm_wav(file_path, frames, sample_rate=16000, channels=1):
+    with wave.open(str(file_path), "wb") as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(struct.pack(f"<{len(frames)}h", *frames))
+
+
+def write_extensible_float_wav(file_path, frame_count, sample_rate=16000):
+    data = struct.pack(f"<{frame_count}f", *([0.25] * frame_count))
+    sub_format = struct.pack("<H", WAVE_FORMAT_IEEE_FLOAT) + b"\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71"
+    fmt_chunk = struct.pack("<HHIIHH", 0xFFFE, 1, sample_rate, sample_rate * 4, 4, 32) + struct.pack("<HHI", 22, 32, 0) + sub_format
+    list_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+    body = b"WAVE" + b"fmt " + struct.pack("<I", len(fmt_chunk)) + fmt_chunk + list_chunk + b"data" + struct.pack("<I", len(data)) + data
+    file_path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+def test_read_wav_header_reports_pcm_layout(tmp_path):
+    wav_path = tmp_path / "working.wav"
+    write_pcm_wav(wav_path, [0] * 1600)
+
+    header = read_wav_header(str(wav_path))
+
+    assert header.format_tag == WAVE_FORMAT_PCM
+    assert header.channels == 1
+    assert header.sample_rate == 16000
+    assert header.sample_width == 2
+    assert header.data_offset == 44
+    assert header.frame_count == 1600
+    assert is_working_audio_format(header, 16000)
+    assert not is_working_audio_format(header, 44100)
+
+
+def test_read_wav_header_resolves_extensible_format_and_skips_unknown_chunks(tmp_path):
+    wav_path = tmp_path / "enhanced.wav"
+    write_extensible_float_wav(wav_path, 800)
+
+    header = read_wav_header(str(wav_path))
+
+    assert header.format_tag == WAVE_FORMAT_IEEE_FLOAT
+    assert header.sample_width == 4
+    assert header.frame_count == 800
+    assert not is_working_audio_format(header)
+
+
+def test_read_wav_header_clamps_placeholder_data_size(tmp_path):
+    wav_path = tmp_path / "streamed.wav"
+    write_pcm_wav(wav_path, [1, 2, 3, 4])
+    raw = bytearray(wav_path.read_bytes())
+    raw[40:44] = struct.pack("<I", 0xFFFFFFFF)
+    wav_path.write_bytes(bytes(raw))
+
+    assert read_wav_header(str(wav_path)).frame_count == 4
+
+
+def test_read_wav_header_rejects_non_wav_files(tmp_path):
+    not_wav_path = tmp_path / "input.mp3"
+    not_wav_path.write_bytes(b"ID3\x03\x00" + b"\x00" * 32)
+
+    with pytest.raises(ValueError, match="Not a RIFF/WAVE file"):
+        read_wav_header(str(not_wav_path))
+
+
+def test_working_audio_maps_samples_and_reports_duration_from_header(tmp_path):
+    np = pytest.importorskip("numpy")
+    wav_path = tmp_path / "working.wav"
+    write_pcm_wav(wav_path, list(range(-8000, 8000)))
+
+    working_audio = WorkingAudio(str(wav_path))
+
+    assert len(working_audio) == 1000
+    assert isinstance(working_audio.samples, np.memmap)
+    assert working_audio.get_samples(250, 500).tolist() == list(range(-4000, 0))
+    assert len(working_audio.get_samples(900, 5000)) == 1600
+
+
+def test_working_audio_handles_empty_files(tmp_path):
+    pytest.importorskip("numpy")
+    wav_path = tmp_path / "empty.wav"
+    write_pcm_wav(wav_path, [])
+
+    working_audio = WorkingAudio(str(wav_path))
+
+    assert len(working_audio) == 0
+    assert len(working_audio.samples) == 0
+
+
+def test_working_audio_rejects_stereo_files(tmp_path):
+    wav_path = tmp_path / "stereo.wav"
+    write_pcm_wav(wav_path, [0, 0, 0, 0], channels=2)
+
+    with pytest.raises(ValueError, match="16-bit PCM mono"):
+        WorkingAudio(str(wav_path))
@@ -0,0 +1,91 @@
+import os
+
+import pytest
+
+import process_input as process_input_module
+import workspace as workspace_module
+
+
+def write_mounts(tmp_path, *mounts):
+    mounts_file = tmp_path / "mounts"
+    mounts_file.write_text(
+        "".join(f"{device} {mount_point} {filesystem_type} rw 0 0\n" for device, mount_point, filesystem_type in mounts),
+        encoding="utf-8",
+    )
+    return str(mounts_file)
+
+
+def test_find_filesystem_type_uses_the_longest_matching_mount_point(tmp_path):
+    memory_dir = tmp_path / "memory dir"
+    memory_dir.mkdir()
+    mounts_file = write_mounts(
+        tmp_path,
+        ("/dev/sda1", "/", "ext4"),
+        ("tmpfs", str(memory_dir).replace(" ", "\\040"), "tmpfs"),
+        ("tmpfs", f"{memory_dir}-sibling", "tmpfs"),
+    )
+
+    assert workspace_module.find_filesystem_type(str(memory_dir / "run"), mounts_file) == "tmpfs"
+    assert workspace_module.is_tmpfs(str(memory_dir), mounts_file)
+    assert workspace_module.find_filesystem_type(str(tmp_path), mounts_file) == "ext4"
+    assert workspace_module.find_filesystem_type(str(tmp_path), str(tmp_path / "missing")) is None
+
+
+def test_resolve_workspace_root_prefers_configured_root_then_tmpfs_with_room(tmp_path):
+    tmpfs_dir = tmp_path / "shm"
+    tmpfs_dir.mkdir()
+    mounts_file = write_mounts(tmp_path, ("/dev/sda1", "/", "ext4"), ("tmpfs", str(tmpfs_dir), "tmpfs"))
+    disk_mounts_file = write_mounts(tmp_path / "shm", ("/dev/sda1", "/", "ext4"))
+
+    def resolve(**overrides):
+        options = {"default_root": "./tmp/", "tmpfs_dir": str(tmpfs_dir), "mounts_file": mounts_file}
+        options.update(overrides)
+        return workspace_module.resolve_workspace_root(**options)
+
+    assert resolve(configured_root="/data/scratch") == "/data/scratch"
+    assert resolve() == os.path.join(str(tmpfs_dir), workspace_module.TMPFS_WORKSPACE_DIRNAME)
+    assert resolve(prefer_tmpfs=False) == "./tmp/"
+    assert resolve(tmpfs_min_free_bytes=1 << 60) == "./tmp/"
+    assert resolve(mounts_file=disk_mounts_file) == "./tmp/"
+
+
+def test_workspaces_are_unique_and_removed_one_at_a_time(tmp_path):
+    root = tmp_path / "workspaces"
+
+    first_workspace = workspace_module.create_workspace(str(root))
+    second_workspace = workspace_module.create_workspace(str(root))
+    with open(os.path.join(first_workspace, "speech_recognition_result_segment_000000_000010.json"), "w", encoding="utf-8") as file:
+        file.write("{}")
+
+    assert first_workspace != second_workspace
+    assert first_workspace.endswith(os.sep)
+    assert os.path.basename(os.path.normpath(first_workspace)).startswith(f"{workspace_module.WORKSPACE_PREFIX}{os.getpid()}_")
+
+    workspace_module.remove_workspace(first_workspace)
+    workspace_module.remove_workspace(None)
+
+    assert not os.path.exists(first_workspace)
+    assert os.path.isdir(second_workspace)
+
+
+def test_create_workspace_reports_unwritable_roots(tmp_path):
+    root_file = tmp_path / "not-a-directory"
+    root_file.write_text("", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="Could not create a run workspace"):
+        workspace_module.create_workspace(str(root_file))
+
+
+def test_create_run_workspace_uses_the_configured_root(tmp_path, monkeypatch):
+    configured_root = tmp_path / "configured"
+    monkeypatch.setattr(
+        process_input_module,
+        "load_app_config",
+        lambda: {"workspace_settings": {"root": str(configured_root), "prefer_tmpfs": True, "tmpfs_min_free_mb": 0}},
+    )
+
+    configured_workspace = process_input_module.create_run_workspace()
+    explicit_workspace = process_input_module.create_run_workspace(str(tmp_path / "explicit"))
+
+    assert os.path.dirname(os.path.normpath(configured_workspace)) == str(configured_root)
+    assert os.path.dirname(os.path.normpath(explicit_workspace)) == str(tmp_path / "explicit")